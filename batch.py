@@ -0,0 +1,267 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import itertools
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pygame
+import settings
+import main
+import weapon
+import headless
+
+session_keys = ("enemies", "enemy_type", "wave", "swarm", "waves", "map", "render")
+
+def expand_grid(grid: dict) -> list:
+    """
+    Expands a parameter grid into every combination of its values.
+
+    Parameters:
+    - grid: A dict mapping a parameter name to a list of values, or to a single value.
+
+    Returns:
+    - A list of dicts, one per combination.
+    """
+    names = list(grid)
+    values = [value if isinstance(value, list) else [value] for value in grid.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+def apply_weapons(player, params: dict) -> None:
+    """
+    Applies "weapons.<class>.<attribute>" parameters to the player's weapons, giving
+    the player a weapon of that class first if it does not have one.
+
+    Parameters:
+    - player: The player whose weapons are changed.
+    - params: The session parameters.
+    """
+    for name, value in params.items():
+        if not name.startswith("weapons."):
+            continue
+
+        class_name, attribute = name.split(".")[1:]
+        weapon_class = getattr(weapon, class_name)
+
+        owned = [w for w in player.weapons if type(w) is weapon_class]
+        if not owned:
+            owned = [weapon_class()]
+            player.weapons.append(owned[0])
+
+        for w in owned:
+            setattr(w, attribute, value)
+            if attribute == "cooldown":
+                w.max_cooldown = value
+
+def run_session(params: dict, seed: int, ticks: int, delta_time: float) -> dict:
+    """
+    Runs one seeded, fixed-timestep session and measures it.
+
+    "settings.<name>" parameters override settings for the session only,
+    "weapons.<class>.<attribute>" parameters change weapon stats, and the keys in
+    session_keys choose the starting enemies, queued wave and backends.
+
+    Parameters:
+    - params: The session parameters.
+    - seed: The seed for the random module, which also seeds the particle engine.
+    - ticks: The number of ticks to simulate.
+    - delta_time: The fixed delta_time used for every tick, in seconds.
+
+    Returns:
+    - A dict of the parameters, seed and metrics of the session.
+    """
+    overrides = {name.split(".", 1)[1]: value for name, value in params.items() if name.startswith("settings.")}
+    overrides["enemy_swarm"] = params.get("swarm", False)
+    overrides["wave_director"] = params.get("waves", False)
+    overrides["map_path"] = params.get("map")
+    overrides["asset_warmup"] = False
+
+    saved = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    try:
+        random.seed(seed)
+        settings.delta_time = delta_time
+
+        game = main.Game(params.get("enemies", 0), params.get("enemy_type", "flyer follower"))
+        world = game.world
+        world.wave_director.queue_wave(params.get("wave", 0))
+        apply_weapons(world.player, params)
+
+        render = params.get("render", False)
+        sample_every = max(1, round(1 / delta_time))
+
+        frame_times = []
+        health_curve = []
+        peaks = {"enemies": 0, "projectiles": 0, "drops": 0, "particles": 0}
+
+        for tick in range(ticks):
+            start = time.perf_counter()
+
+            game.event_loop()
+            world.update()
+            if render:
+                game.draw()
+
+            frame_times.append(time.perf_counter() - start)
+            settings.delta_time = delta_time
+
+            peaks["enemies"] = max(peaks["enemies"], len(world.enemy_container))
+            peaks["projectiles"] = max(peaks["projectiles"], len(world.friendly_projectiles))
+            peaks["drops"] = max(peaks["drops"], len(world.ground_items))
+            peaks["particles"] = max(peaks["particles"], world.particle_engine.live_count)
+
+            if tick % sample_every == 0:
+                health_curve.append(world.player.health)
+
+        world.player.get_coins()
+
+        return {
+            "params": params,
+            "seed": seed,
+            "ticks": ticks,
+            "frame_time": headless.summarize(frame_times),
+            "peaks": peaks,
+            "kills": world.kills,
+            "coins": world.player.coins,
+            "health": world.player.health,
+            "health_curve": health_curve,
+            "alive": len(world.enemy_container),
+            "spawned": world.wave_director.spawned_total
+        }
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+def run_batch(configs: list, seeds: list, ticks: int, delta_time: float, workers: int = None, progress=None) -> list:
+    """
+    Runs every configuration with every seed in a pool of worker processes.
+
+    Parameters:
+    - configs: A list of session parameter dicts.
+    - seeds: The seeds each configuration is run with.
+    - ticks: The number of ticks each session simulates.
+    - delta_time: The fixed delta_time of every tick, in seconds.
+    - workers: The number of worker processes, or None for one per CPU core.
+    - progress: A function called with (done, total) after each session, or None.
+
+    Returns:
+    - A list of session results, in configuration then seed order.
+    """
+    jobs = [(index, params, seed) for index, params in enumerate(configs) for seed in seeds]
+    results = [None] * len(jobs)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_session, params, seed, ticks, delta_time): position for position, (index, params, seed) in enumerate(jobs)}
+
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(jobs))
+
+    return results
+
+def aggregate(results: list) -> list:
+    """
+    Combines the sessions of each configuration across its seeds.
+
+    Parameters:
+    - results: The session results returned by run_batch.
+
+    Returns:
+    - A list with one dict per configuration holding its parameters, session count,
+      the mean of its scalar metrics, its worst frame time percentiles, its highest
+      entity peaks and its mean health curve.
+    """
+    groups = {}
+    for result in results:
+        key = json.dumps(result["params"], sort_keys=True)
+        groups.setdefault(key, []).append(result)
+
+    report = []
+    for sessions in groups.values():
+        count = len(sessions)
+        curves = [session["health_curve"] for session in sessions]
+        length = min(len(curve) for curve in curves)
+
+        report.append({
+            "params": sessions[0]["params"],
+            "sessions": count,
+            "seeds": [session["seed"] for session in sessions],
+            "frame_time": {key: max(session["frame_time"][key] for session in sessions) for key in ("mean", "p50", "p95", "p99", "max")},
+            "peaks": {key: max(session["peaks"][key] for session in sessions) for key in sessions[0]["peaks"]},
+            "kills": sum(session["kills"] for session in sessions) / count,
+            "coins": sum(session["coins"] for session in sessions) / count,
+            "health": sum(session["health"] for session in sessions) / count,
+            "health_curve": [sum(curve[i] for curve in curves) / count for i in range(length)]
+        })
+
+    return report
+
+def format_row(entry: dict) -> str:
+    """
+    Formats one aggregated configuration as one line of text.
+
+    Parameters:
+    - entry: An entry returned by aggregate.
+
+    Returns:
+    - The formatted line.
+    """
+    params = " ".join(f"{name}={value}" for name, value in entry["params"].items())
+    frame_time = entry["frame_time"]
+    peaks = entry["peaks"]
+    return (f"p50 {frame_time['p50']:7.3f}  p95 {frame_time['p95']:7.3f}  p99 {frame_time['p99']:7.3f}  "
+            f"enemies {peaks['enemies']:5d}  projectiles {peaks['projectiles']:4d}  "
+            f"kills {entry['kills']:7.1f}  coins {entry['coins']:7.1f}  health {entry['health']:5.1f}  {params}")
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the batch command line options.
+
+    Returns:
+    - The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Run a grid of headless Color Survivor sessions across every CPU core and report aggregated metrics.")
+    parser.add_argument("--grid", default=None, help="JSON file mapping parameter names to lists of values")
+    parser.add_argument("--seeds", type=int, default=4, help="number of seeds each configuration is run with")
+    parser.add_argument("--first-seed", type=int, default=0, help="the first seed")
+    parser.add_argument("--ticks", type=int, default=3600, help="number of ticks per session")
+    parser.add_argument("--delta-time", type=float, default=1 / settings.tick_rate, help="fixed delta_time per tick in seconds")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes, one per core by default")
+    parser.add_argument("--out", default=None, help="write the sessions and the aggregated report to this JSON file")
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    if args.grid is not None:
+        with open(args.grid) as file:
+            grid = json.load(file)
+    else:
+        grid = {"wave": [100, 500], "weapons.RangeMultishot.multishot_count": [1, 3, 5], "weapons.MeleeKnife.damage": [0, 5]}
+
+    configs = expand_grid(grid)
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+
+    print(f"{len(configs)} configurations x {len(seeds)} seeds x {args.ticks} ticks on {args.workers or os.cpu_count()} workers")
+
+    start = time.perf_counter()
+    results = run_batch(configs, seeds, args.ticks, args.delta_time, args.workers, lambda done, total: print(f"\r{done}/{total} sessions", end="", flush=True))
+    print(f"\nfinished in {time.perf_counter() - start:.1f} s")
+
+    report = aggregate(results)
+    report.sort(key=lambda entry: entry["frame_time"]["p95"])
+    for entry in report:
+        print(format_row(entry))
+
+    if args.out is not None:
+        with open(args.out, "w") as file:
+            json.dump({"sessions": results, "report": report}, file, indent=1)
+
+    pygame.quit()
@@ -1,20 +1,194 @@
 import pygame
 import settings
+import wall
 
-class PlayerCenterCamera(pygame.sprite.Group):
+class RenderLayer(pygame.sprite.Group):
+    """
+    A group of sprites drawn together by the camera, in an order chosen per layer.
+    Entities register with the layer named by their render_layer attribute, and
+    killing a sprite takes it out of its layer like any other group.
+
+    Orderings:
+    - "depth": Sorted by rect.centery every frame, for sprites that overlap as they move.
+    - "static": Pre-rendered into world-space chunk surfaces that are only rebuilt
+      when the layer changes, so scrolling the view reuses them. Members must not move.
+    - None: Drawn in insertion order with no bookkeeping.
+
+    Attributes:
+    - name (str): The name of the layer.
+    - ordering (str): The layer's ordering, "depth", "static" or None.
+    - draw_order (list): The members in draw order, for "depth" and "static" layers.
+    - pending_adds (list): Sprites added since the last draw that are not yet in draw_order.
+    - order_dirty (bool): Whether sprites were removed since the last draw.
+    - chunk_size (int): The width and height of a static chunk surface in pixels.
+    - chunks (dict): A dict mapping a (chunk x, chunk y) key to the pre-rendered surface
+      of a static layer, or None until the next draw rebuilds it.
+
+    Methods:
+    - add_internal(sprite: pygame.sprite.Sprite, layer=None) -> None:
+        Adds a sprite to the layer and queues it for draw_order.
+    - remove_internal(sprite: pygame.sprite.Sprite) -> None:
+        Removes a sprite from the layer and marks draw_order for pruning.
+    - get_draw_order():
+        Returns the members in draw order.
+    - get_chunks() -> dict:
+        Returns the pre-rendered chunk surfaces of a static layer.
+    """
+
+    def __init__(self, name: str, ordering: str = None) -> None:
+        """
+        Initializes the RenderLayer object.
+
+        Args:
+        - name (str): The name of the layer.
+        - ordering (str): The layer's ordering, "depth", "static" or None.
+        """
+        pygame.sprite.Group.__init__(self)
+
+        self.name = name
+        self.ordering = ordering
+        self.draw_order = []
+        self.pending_adds = []
+        self.order_dirty = False
+        self.chunk_size = settings.ground_tile_size
+        self.chunks = None
+
+    def add_internal(self, sprite: pygame.sprite.Sprite, layer=None) -> None:
+        """
+        Adds a sprite to the layer and queues it for draw_order.
+
+        Args:
+        - sprite (pygame.sprite.Sprite): The sprite being added.
+        - layer: Unused, accepted for compatibility with pygame.sprite.Group.
+        """
+        pygame.sprite.Group.add_internal(self, sprite, layer)
+        if self.ordering is not None:
+            self.pending_adds.append(sprite)
+        self.chunks = None
+
+    def remove_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        """
+        Removes a sprite from the layer and marks draw_order for pruning.
+
+        Args:
+        - sprite (pygame.sprite.Sprite): The sprite being removed.
+        """
+        pygame.sprite.Group.remove_internal(self, sprite)
+        self.order_dirty = True
+        self.chunks = None
+
+    def get_draw_order(self):
+        """
+        Returns the members in draw order, bringing draw_order in line with the
+        layer's members first. Depth layers are re-sorted; the list persists between
+        frames, so it is already nearly sorted and list.sort (an adaptive merge sort)
+        finishes in close to linear time.
+
+        Returns:
+        - An iterable of the layer's sprites.
+        """
+        if self.ordering is None:
+            return self.spritedict
+
+        if self.order_dirty or self.pending_adds:
+            members = self.spritedict
+            order = dict.fromkeys(self.draw_order + self.pending_adds)
+            self.draw_order = [sprite for sprite in order if sprite in members]
+            self.pending_adds = []
+            self.order_dirty = False
+
+        if self.ordering == "depth":
+            self.draw_order.sort(key=lambda sprite: sprite.rect.centery)
+
+        return self.draw_order
+
+    def get_chunks(self) -> dict:
+        """
+        Returns the chunk surfaces of a static layer, rendering every member into the
+        world-space chunks its image overlaps first if the layer changed. Only chunks
+        holding a member are created, so memory follows the area the members cover.
+
+        Returns:
+        - dict: A dict mapping a (chunk x, chunk y) key to its surface.
+        """
+        if self.chunks is None:
+            size = self.chunk_size
+            chunks = {}
+
+            for sprite in self.get_draw_order():
+                image = sprite.image
+                rect = sprite.rect
+                area = image.get_rect(topleft=(rect.x + (rect.width - image.get_width()) // 2, rect.y + (rect.height - image.get_height()) // 2))
+
+                for cx in range(area.left // size, (area.right - 1) // size + 1):
+                    for cy in range(area.top // size, (area.bottom - 1) // size + 1):
+                        chunk = chunks.get((cx, cy))
+                        if chunk is None:
+                            chunk = chunks[(cx, cy)] = pygame.Surface((size, size), pygame.SRCALPHA)
+                        chunk.blit(image, (area.x - cx * size, area.y - cy * size))
+
+            self.chunks = chunks
+
+        return self.chunks
+
+class PlayerCenterCamera():
     """
     A class representing a camera that centers on a target sprite.
 
+    The camera draws its render layers in settings.render_layers order, with the
+    ground and tile map under the "ground" layer and the particle engine in the
+    "particles" layer's place. Sprites are registered with the layer get_layer
+    returns for them; the camera holds no sprites of its own and updates none,
+    the world steps each kind of entity in its own pass.
+
     Attributes:
     - display_surface (pygame.Surface): The surface to display the camera view.
     - half_width (float): Half of the width of the display surface.
     - half_height (float): Half of the height of the display surface.
     - ground_surface (pygame.Surface): The surface representing the ground.
     - ground_rect (pygame.Rect): The rectangle representing the ground surface.
+    - ground_tile_size (int): The width and height of a ground tile in pixels.
+    - ground_tiles (dict): A dict mapping a (tile x, tile y) key to that tile's surface.
+    - chunk_streamer (ChunkStreamer): The tile map streamer drawn on top of the ground, if any.
+    - particle_engine (ParticleEngine): The particle engine drawn on top of the ground, if any.
+    - layers (dict): A dict mapping a layer name to its RenderLayer, in draw order.
+    - particle_split (int): The number of visible sprites drawn before the particles in the last draw.
+    - drawn_count (int): The number of sprites and static chunks that survived culling during the last draw.
+    - previous_topleft (dict): Each sprite's rect.topleft before the last simulation tick.
+    - dirty_cell_size (int): The size of the screen cells dirty regions are snapped to.
+    - dirty_rects (list): The screen rects changed by the last dirty-rect draw.
+    - last_visible (dict): Each sprite drawn last frame mapped to its (image, screen position).
+    - last_particle_cells (set): The screen cells particles were drawn into last frame.
+    - last_view_topleft (tuple): The view position of the last dirty-rect draw, or None to force a full redraw.
+    - last_built_count (int): The chunk streamer's built_count at the last dirty-rect draw.
 
     Methods:
+    - get_layer(sprite: pygame.sprite.Sprite) -> RenderLayer:
+        Returns the render layer a sprite is drawn in.
+    - capture_previous() -> None:
+        Stores every sprite's position before a simulation tick.
+    - get_interpolated_topleft(sprite: pygame.sprite.Sprite) -> tuple:
+        Returns a sprite's topleft interpolated between the last two ticks.
+    - split_ground() -> dict:
+        Cuts the ground surface into fixed-size tiles.
+    - draw_ground(view_rect: pygame.Rect, area: pygame.Rect) -> None:
+        Blits the ground tiles that intersect the view.
     - center_target_camera(target: pygame.sprite.Sprite) -> None:
         Centers the camera on the target sprite.
+    - get_view_rect() -> pygame.Rect:
+        Returns the world-space rectangle currently visible on screen.
+    - get_visible(view_rect: pygame.Rect) -> dict:
+        Culls the sprites against the view in layer order.
+    - blit_sprites(entries: list, start: int, end: int) -> None:
+        Blits a slice of the visible sprites.
+    - draw_scene(view_rect: pygame.Rect, visible: dict) -> None:
+        Draws the whole view.
+    - invalidate() -> None:
+        Forces the next dirty-rect draw to redraw the whole screen.
+    - get_dirty_cells(visible: dict) -> set:
+        Finds the screen cells that changed since the last draw.
+    - draw_dirty(view_rect: pygame.Rect, visible: dict) -> None:
+        Redraws only the changed parts of the screen.
     - camera_draw(player: pygame.sprite.Sprite) -> None:
         Draws the camera view on the display surface.
     """
@@ -26,14 +200,118 @@ class PlayerCenterCamera(pygame.sprite.Group):
         Args:
         - ground_surface (pygame.Surface): The surface representing the ground.
         """
-        pygame.sprite.Group.__init__(self)
-
         self.display_surface = pygame.display.get_surface()
         self.half_width = self.display_surface.get_size()[0] / 2
         self.half_height = self.display_surface.get_size()[1] / 2
 
         self.ground_surface = ground_surface
         self.ground_rect = self.ground_surface.get_rect(topleft=(0, 0))
+        self.ground_tile_size = settings.ground_tile_size
+        self.ground_tiles = self.split_ground()
+
+        self.chunk_streamer = None
+        self.particle_engine = None
+
+        self.layers = {name: RenderLayer(name, ordering) for name, ordering in settings.render_layers}
+        self.particle_split = 0
+        self.drawn_count = 0
+        self.previous_topleft = {}
+
+        self.dirty_cell_size = settings.dirty_cell_size
+        self.dirty_rects = []
+        self.last_visible = {}
+        self.last_particle_cells = set()
+        self.last_view_topleft = None
+        self.last_built_count = 0
+
+    def split_ground(self) -> dict:
+        """
+        Cuts the ground surface into fixed-size tiles so drawing only touches the
+        tiles under the view, however large the world is.
+
+        Returns:
+        - dict: A dict mapping a (tile x, tile y) key to a copy of that part of the ground.
+        """
+        size = self.ground_tile_size
+        tiles = {}
+
+        for ty in range((self.ground_rect.height + size - 1) // size):
+            for tx in range((self.ground_rect.width + size - 1) // size):
+                area = pygame.Rect(tx * size, ty * size, size, size).clip(self.ground_surface.get_rect())
+                tiles[(tx, ty)] = self.ground_surface.subsurface(area).copy()
+
+        return tiles
+
+    def draw_ground(self, view_rect: pygame.Rect, area: pygame.Rect = None) -> None:
+        """
+        Blits the ground tiles that intersect the view.
+
+        Args:
+        - view_rect (pygame.Rect): The world-space rectangle visible on screen.
+        - area (pygame.Rect): A screen rect to limit drawing to, or None for the whole view.
+        """
+        size = self.ground_tile_size
+        left = self.ground_rect.left
+        top = self.ground_rect.top
+
+        region = view_rect if area is None else area.move(view_rect.topleft)
+
+        min_x = (region.left - left) // size
+        min_y = (region.top - top) // size
+        max_x = (region.right - 1 - left) // size
+        max_y = (region.bottom - 1 - top) // size
+
+        tiles = self.ground_tiles
+        visible = []
+        for ty in range(max(0, min_y), max_y + 1):
+            for tx in range(max(0, min_x), max_x + 1):
+                tile = tiles.get((tx, ty))
+                if tile is not None:
+                    visible.append((tile, (left + tx * size - view_rect.x, top + ty * size - view_rect.y)))
+
+        self.display_surface.blits(visible, False)
+
+    def get_layer(self, sprite: pygame.sprite.Sprite) -> RenderLayer:
+        """
+        Returns the render layer a sprite is drawn in.
+
+        Args:
+        - sprite (pygame.sprite.Sprite): The sprite to look up.
+
+        Returns:
+        - RenderLayer: The layer named by the sprite's render_layer attribute, or "actors".
+        """
+        return self.layers[getattr(sprite, "render_layer", "actors")]
+
+    def __len__(self) -> int:
+        return sum(len(layer) for layer in self.layers.values())
+
+    def capture_previous(self) -> None:
+        """
+        Stores the position of every sprite outside the static layers before a
+        simulation tick so drawing can interpolate between it and the position
+        after the tick.
+        """
+        self.previous_topleft = {sprite: sprite.rect.topleft for layer in self.layers.values() if layer.ordering != "static" for sprite in layer.spritedict}
+
+    def get_interpolated_topleft(self, sprite: pygame.sprite.Sprite) -> tuple:
+        """
+        Returns a sprite's topleft interpolated between the last two ticks.
+
+        Args:
+        - sprite (pygame.sprite.Sprite): The sprite to look up.
+
+        Returns:
+        - tuple: The interpolated (x, y) topleft in world space.
+        """
+        x, y = sprite.rect.topleft
+        last = self.previous_topleft.get(sprite)
+        alpha = settings.interpolation
+
+        if last is None or alpha >= 1:
+            return x, y
+
+        return round(last[0] + (x - last[0]) * alpha), round(last[1] + (y - last[1]) * alpha)
 
     def center_target_camera(self, target: pygame.sprite.Sprite) -> None:
         """
@@ -42,21 +320,222 @@ class PlayerCenterCamera(pygame.sprite.Group):
         Args:
         - target (pygame.sprite.Sprite): The target sprite to center the camera on.
         """
-        settings.global_offset.x = target.rect.centerx - self.half_width
-        settings.global_offset.y = target.rect.centery - self.half_height
+        x, y = self.get_interpolated_topleft(target)
+        settings.global_offset.x = x + target.rect.width // 2 - self.half_width
+        settings.global_offset.y = y + target.rect.height // 2 - self.half_height
+
+    def get_view_rect(self) -> pygame.Rect:
+        """
+        Returns the world-space rectangle currently visible on screen.
+
+        Returns:
+        - pygame.Rect: The view rectangle at settings.global_offset.
+        """
+        return pygame.Rect(settings.global_offset.x, settings.global_offset.y, self.half_width * 2, self.half_height * 2)
+
+    def get_visible(self, view_rect: pygame.Rect) -> dict:
+        """
+        Culls the camera's sprites against the view layer by layer, each layer in
+        its own order, and records where the particles are drawn in particle_split.
+        Images larger than their rect, such as sprite sheet frames, are centred on the rect.
+        Static layers contribute their chunk surfaces under the view instead of sprites.
+
+        Args:
+        - view_rect (pygame.Rect): The world-space rectangle visible on screen.
+
+        Returns:
+        - dict: A dict mapping each visible sprite, or (layer name, chunk x, chunk y) key
+          of a static chunk, to its (image, screen position), in draw order.
+        """
+        collides = view_rect.colliderect
+        offset_x = view_rect.x
+        offset_y = view_rect.y
+
+        interpolated = self.get_interpolated_topleft
+
+        visible = {}
+        for layer in self.layers.values():
+            if layer.name == "particles":
+                self.particle_split = len(visible)
+
+            if layer.ordering == "static":
+                chunks = layer.get_chunks()
+                if chunks:
+                    size = layer.chunk_size
+                    for cy in range(view_rect.top // size, (view_rect.bottom - 1) // size + 1):
+                        for cx in range(view_rect.left // size, (view_rect.right - 1) // size + 1):
+                            chunk = chunks.get((cx, cy))
+                            if chunk is not None:
+                                visible[(layer.name, cx, cy)] = (chunk, (cx * size - offset_x, cy * size - offset_y))
+                continue
+
+            for sprite in layer.get_draw_order():
+                if collides(sprite.rect):
+                    x, y = interpolated(sprite)
+                    image = sprite.image
+                    rect = sprite.rect
+                    visible[sprite] = (image, (x - offset_x + (rect.width - image.get_width()) // 2, y - offset_y + (rect.height - image.get_height()) // 2))
+
+        return visible
+
+    def blit_sprites(self, entries: list, start: int, end: int) -> None:
+        """
+        Blits a slice of the visible sprites.
+
+        Args:
+        - entries (list): The (image, screen position) values of the visible sprites, in draw order.
+        - start (int): The index of the first entry to blit.
+        - end (int): The index after the last entry to blit.
+        """
+        self.display_surface.blits(entries[start:end], False)
+
+    def draw_scene(self, view_rect: pygame.Rect, visible: dict) -> None:
+        """
+        Draws the ground and tile map, then the visible sprites layer by layer with
+        the particles in the particle layer's place.
+
+        Args:
+        - view_rect (pygame.Rect): The world-space rectangle visible on screen.
+        - visible (dict): The visible sprites returned by get_visible.
+        """
+        self.draw_ground(view_rect)
+
+        if self.chunk_streamer is not None:
+            self.chunk_streamer.draw(self.display_surface, view_rect)
+
+        entries = list(visible.values())
+        self.blit_sprites(entries, 0, self.particle_split)
+
+        if self.particle_engine is not None:
+            self.particle_engine.draw(self.display_surface, settings.global_offset, settings.interpolation)
+
+        self.blit_sprites(entries, self.particle_split, len(entries))
+
+    def invalidate(self) -> None:
+        """
+        Forces the next dirty-rect draw to redraw and update the whole screen.
+        """
+        self.last_view_topleft = None
+
+    def get_dirty_cells(self, visible: dict) -> set:
+        """
+        Finds the screen cells that changed since the last draw: the old and new
+        rects of every sprite that moved, changed image, appeared or disappeared,
+        and every cell holding a particle last frame or this frame.
+
+        Args:
+        - visible (dict): The visible sprites returned by get_visible.
+
+        Returns:
+        - set: A set of (cell x, cell y) keys.
+        """
+        changed = []
+        last = self.last_visible
+
+        for sprite, (image, pos) in visible.items():
+            previous = last.get(sprite)
+            if previous is None or previous[0] is not image or previous[1] != pos:
+                changed.append(image.get_rect(topleft=pos))
+                if previous is not None:
+                    changed.append(previous[0].get_rect(topleft=previous[1]))
+
+        for sprite, (image, pos) in last.items():
+            if sprite not in visible:
+                changed.append(image.get_rect(topleft=pos))
+
+        size = self.dirty_cell_size
+        screen_rect = self.display_surface.get_rect()
+        cells = set(self.last_particle_cells)
+
+        for rect in changed:
+            rect = rect.clip(screen_rect)
+            if rect.width and rect.height:
+                for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                    for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                        cells.add((cx, cy))
+
+        return cells
+
+    def draw_dirty(self, view_rect: pygame.Rect, visible: dict) -> None:
+        """
+        Redraws only the parts of the screen that changed since the last draw and
+        stores them in dirty_rects. Falls back to a full redraw when the view moved,
+        a tile map chunk was built or invalidate() was called.
+
+        Args:
+        - view_rect (pygame.Rect): The world-space rectangle visible on screen.
+        - visible (dict): The visible sprites returned by get_visible.
+        """
+        surface = self.display_surface
+        screen_rect = surface.get_rect()
+        size = self.dirty_cell_size
+
+        particle_cells = set()
+        if self.particle_engine is not None:
+            particle_cells = self.particle_engine.get_screen_cells(screen_rect.size, settings.global_offset, settings.interpolation, size)
+
+        built_count = self.chunk_streamer.built_count if self.chunk_streamer is not None else 0
+
+        if self.last_view_topleft != view_rect.topleft or built_count != self.last_built_count:
+            surface.fill(settings.color.black)
+            self.draw_scene(view_rect, visible)
+            self.dirty_rects = [screen_rect]
+        else:
+            cells = self.get_dirty_cells(visible)
+            cells.update(particle_cells)
+
+            self.dirty_rects = [pygame.Rect(cx * size, cy * size, width * size, height * size).clip(screen_rect) for cx, cy, width, height in wall.merge_tiles(cells)]
+
+            for rect in self.dirty_rects:
+                surface.set_clip(rect)
+                surface.fill(settings.color.black)
+                self.draw_ground(view_rect, rect)
+                if self.chunk_streamer is not None:
+                    self.chunk_streamer.draw(surface, view_rect)
+            surface.set_clip(None)
+
+            split = self.particle_split
+            entries = list(visible.values())
+            sprite_rects = [image.get_rect(topleft=pos) for image, pos in entries]
+            overlaps = [sorted(rect.collidelistall(sprite_rects)) for rect in self.dirty_rects]
+
+            for rect, indices in zip(self.dirty_rects, overlaps):
+                surface.set_clip(rect)
+                surface.blits([entries[index] for index in indices if index < split], False)
+            surface.set_clip(None)
+
+            if self.particle_engine is not None:
+                self.particle_engine.draw(surface, settings.global_offset, settings.interpolation)
+
+            for rect, indices in zip(self.dirty_rects, overlaps):
+                surface.set_clip(rect)
+                surface.blits([entries[index] for index in indices if index >= split], False)
+            surface.set_clip(None)
+
+        self.last_visible = visible
+        self.last_particle_cells = particle_cells
+        self.last_view_topleft = view_rect.topleft
+        self.last_built_count = built_count
 
     def camera_draw(self, player: pygame.sprite.Sprite) -> None:
         """
-        Draws the camera view on the display surface.
+        Draws the camera view on the display surface. With settings.dirty_rects
+        enabled only the changed parts of the screen are redrawn.
 
         Args:
         - player (pygame.sprite.Sprite): The player sprite to center the camera on.
         """
         self.center_target_camera(player)
 
-        ground_offset = self.ground_rect.topleft - settings.global_offset
-        self.display_surface.blit(self.ground_surface, ground_offset)
+        view_rect = self.get_view_rect()
+
+        if self.chunk_streamer is not None:
+            self.chunk_streamer.update(view_rect)
+
+        visible = self.get_visible(view_rect)
+        self.drawn_count = len(visible)
 
-        for sprite in sorted(self.sprites(), key=lambda sprite: sprite.rect.centery):
-            offset_pos = sprite.rect.topleft - settings.global_offset
-            self.display_surface.blit(sprite.image, offset_pos)
\ No newline at end of file
+        if settings.dirty_rects:
+            self.draw_dirty(view_rect, visible)
+        else:
+            self.draw_scene(view_rect, visible)
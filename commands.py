@@ -0,0 +1,105 @@
+from itertools import groupby
+
+class CommandBuffer():
+    """
+    Records group changes made while the world is iterating its groups and applies
+    them together when the world flushes the buffer.
+
+    Commands are applied in the order they were recorded. Consecutive commands of
+    the same kind on the same groups are applied as one batched group call.
+
+    Attributes:
+    - commands: A list of (kind, groups, sprite) tuples waiting to be applied.
+    - killed: A set of sprites with a pending kill.
+
+    Methods:
+    - add(sprite: pygame.sprite.Sprite, *groups) -> None: Queues adding a sprite to groups.
+    - remove(sprite: pygame.sprite.Sprite, *groups) -> None: Queues removing a sprite from groups.
+    - move(sprite: pygame.sprite.Sprite, source, destination) -> None: Queues moving a sprite between groups.
+    - kill(sprite: pygame.sprite.Sprite) -> None: Queues killing a sprite.
+    - is_killed(sprite: pygame.sprite.Sprite) -> bool: Returns whether a sprite has a pending kill.
+    - flush() -> None: Applies every queued command.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the CommandBuffer object.
+        """
+        self.commands = []
+        self.killed = set()
+
+    def add(self, sprite, *groups) -> None:
+        """
+        Queues adding a sprite to groups.
+
+        Parameters:
+        - sprite: The sprite to add.
+        - groups: The groups to add it to.
+        """
+        self.commands.append(("add", groups, sprite))
+
+    def remove(self, sprite, *groups) -> None:
+        """
+        Queues removing a sprite from groups.
+
+        Parameters:
+        - sprite: The sprite to remove.
+        - groups: The groups to remove it from.
+        """
+        self.commands.append(("remove", groups, sprite))
+
+    def move(self, sprite, source, destination) -> None:
+        """
+        Queues moving a sprite from one group to another.
+
+        Parameters:
+        - sprite: The sprite to move.
+        - source: The group to remove it from.
+        - destination: The group to add it to.
+        """
+        self.commands.append(("remove", (source,), sprite))
+        self.commands.append(("add", (destination,), sprite))
+
+    def kill(self, sprite) -> None:
+        """
+        Queues killing a sprite. A sprite killed more than once before the flush is only killed once.
+
+        Parameters:
+        - sprite: The sprite to kill.
+        """
+        if sprite not in self.killed:
+            self.killed.add(sprite)
+            self.commands.append(("kill", (), sprite))
+
+    def is_killed(self, sprite) -> bool:
+        """
+        Returns whether a sprite has a pending kill.
+
+        Parameters:
+        - sprite: The sprite to check.
+
+        Returns:
+        - True if the sprite will be killed by the next flush.
+        """
+        return sprite in self.killed
+
+    def flush(self) -> None:
+        """
+        Applies every queued command in order and empties the buffer.
+        """
+        commands = self.commands
+        self.commands = []
+        self.killed = set()
+
+        for (kind, groups), run in groupby(commands, lambda command: command[:2]):
+            sprites = [command[2] for command in run]
+
+            if kind == "kill":
+                for sprite in sprites:
+                    sprite.kill()
+            else:
+                for group in groups:
+                    if kind == "add":
+                        group.add(*sprites)
+                    else:
+                        group.remove(*sprites)
@@ -1,22 +1,137 @@
 import pygame
+import resources
+import time
+from collections import deque
 
 from settings import *
 
+class FrameProfiler():
+    """
+    A class that records rolling timings for named phases of a frame.
+
+    Timing is only taken while the profiler is enabled. While disabled, run() calls
+    straight through to the measured function, so the instrumentation costs one
+    attribute check per phase.
+
+    Attributes:
+    - enabled: A boolean indicating whether timings are being recorded.
+    - history: The number of samples kept for each phase and for the frame graph.
+    - timings: A dict mapping a phase name to a deque of its recent durations in seconds.
+    - frame_times: A deque of recent frame times in milliseconds.
+
+    Methods:
+    - run(name: str, function, *args) -> Any: Calls a function and records how long it took.
+    - record(name: str, seconds: float) -> None: Records a duration for a phase.
+    - record_frame(milliseconds: float) -> None: Records a frame time for the graph.
+    - average(name: str) -> float: Returns the rolling average of a phase in milliseconds.
+    - reset() -> None: Clears every recorded sample.
+    """
+
+    def __init__(self, history: int = 240) -> None:
+        """
+        Initializes the FrameProfiler object.
+
+        Parameters:
+        - history: The number of samples kept for each phase and for the frame graph.
+        """
+        self.enabled = False
+        self.history = history
+        self.timings = {}
+        self.frame_times = deque(maxlen=history)
+
+    def run(self, name: str, function, *args):
+        """
+        Calls a function and, while enabled, records how long it took.
+
+        Parameters:
+        - name: The name of the phase being measured.
+        - function: The function to call.
+        - args: The arguments passed to the function.
+
+        Returns:
+        - The function's return value.
+        """
+        if not self.enabled:
+            return function(*args)
+
+        start = time.perf_counter()
+        result = function(*args)
+        self.record(name, time.perf_counter() - start)
+
+        return result
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Records a duration for a phase.
+
+        Parameters:
+        - name: The name of the phase.
+        - seconds: The duration in seconds.
+        """
+        samples = self.timings.get(name)
+        if samples is None:
+            samples = self.timings[name] = deque(maxlen=self.history)
+        samples.append(seconds)
+
+    def record_frame(self, milliseconds: float) -> None:
+        """
+        Records a frame time for the graph.
+
+        Parameters:
+        - milliseconds: The frame time in milliseconds.
+        """
+        self.frame_times.append(milliseconds)
+
+    def average(self, name: str) -> float:
+        """
+        Returns the rolling average of a phase.
+
+        Parameters:
+        - name: The name of the phase.
+
+        Returns:
+        - The average duration in milliseconds, or 0 if the phase has no samples.
+        """
+        samples = self.timings.get(name)
+        if not samples:
+            return 0
+
+        return sum(samples) / len(samples) * 1000
+
+    def reset(self) -> None:
+        """
+        Clears every recorded sample.
+        """
+        self.timings = {}
+        self.frame_times.clear()
+
+profiler = FrameProfiler()
+
 class DebugInterface():
     """
     A class that represents the debug interface for the game.
 
+    The interface is a profiling overlay showing the FPS, rolling timings for each
+    phase recorded by the profiler, live entity counts and a scrolling frame time graph.
+    While it is hidden, the profiler is disabled and nothing is rendered.
+
     Attributes:
     - font: A pygame.font.Font object representing the font used for rendering text.
     - fps_text: A pygame.Surface object representing the rendered FPS text.
+    - stat_texts: A list of pygame.Surface objects for the phase timings and entity counts.
     - display_surface: A pygame.Surface object representing the game display surface.
     - active: A boolean indicating whether the debug interface is active or not.
+    - refresh_interval: The number of frames between re-rendering the overlay text.
+    - frames_until_refresh: The number of frames left before the overlay text is re-rendered.
+    - graph_rect: A pygame.Rect where the frame time graph is drawn.
 
     Methods:
     - get_fps_text(clock: pygame.time.Clock) -> pygame.Surface: Returns the rendered FPS text.
+    - get_stat_texts(world) -> list: Returns the rendered phase timing and entity count lines.
     - toggle_active() -> None: Toggles the active state of the debug interface.
     - draw() -> None: Draws the debug interface on the display surface.
-    - update(clock: pygame.time.Clock) -> None: Updates the debug interface.
+    - draw_graph() -> None: Draws the frame time graph.
+    - update(clock: pygame.time.Clock, world) -> None: Updates the debug interface.
 
     """
 
@@ -25,11 +140,16 @@ class DebugInterface():
         Initializes the DebugInterface object.
 
         """
-        self.font = pygame.font.SysFont("Courier", 16)
+        self.font = resources.get_manager().get_font("debug")
         self.fps_text = None
+        self.stat_texts = []
         self.display_surface = pygame.display.get_surface()
         self.active = False
 
+        self.refresh_interval = 15
+        self.frames_until_refresh = 0
+        self.graph_rect = pygame.Rect(SCREEN_WIDTH - 250, 10, 240, 80)
+
     def get_fps_text(self, clock: pygame.time.Clock) -> pygame.Surface:
         """
         Returns the rendered FPS text.
@@ -44,7 +164,41 @@ class DebugInterface():
         string = "FPS: " + str(int(clock.get_fps()))
         text = self.font.render(string, True, color.white)
         return text
-    
+
+    def get_stat_texts(self, world) -> list:
+        """
+        Returns the rendered phase timing and entity count lines.
+
+        Parameters:
+        - world: The World object to count entities in.
+
+        Returns:
+        - texts: A list of pygame.Surface objects, one per line.
+
+        """
+        lines = []
+
+        for name in profiler.timings:
+            lines.append(f"{name:<22}{profiler.average(name):7.3f} ms")
+
+        lines.append("")
+        lines.append(f"{'enemies':<22}{world.wave_director.get_alive_count():7d}")
+        lines.append(f"{'spawn rate /s':<22}{world.wave_director.get_spawn_rate():7d}")
+        lines.append(f"{'spawn queue':<22}{len(world.wave_director.queue):7d}")
+        lines.append(f"{'projectiles':<22}{len(world.friendly_projectiles):7d}")
+        lines.append(f"{'particles':<22}{world.particle_engine.live_count:7d}")
+        lines.append(f"{'drops':<22}{len(world.ground_items):7d}")
+        lines.append(f"{'coin stacks':<22}{len(world.drop_stacks):7d}")
+        lines.append(f"{'camera sprites':<22}{len(world.world_camera):7d}")
+        lines.append(f"{'camera drawn':<22}{world.world_camera.drawn_count:7d}")
+        lines.append(f"{'camera sorted':<22}{len(world.world_camera.layers['actors']):7d}")
+        lines.append(f"{'pair tests':<22}{world.spatial_hash.last_pair_tests:7d}")
+
+        for entity_class, entity_pool in world.pools.items():
+            lines.append(f"{'pool ' + entity_class.__name__:<22}{entity_pool.hits:7d} hit {entity_pool.misses:5d} miss")
+
+        return [self.font.render(line, True, color.white) for line in lines]
+
     def toggle_active(self) -> None:
         """
         Toggles the active state of the debug interface.
@@ -54,20 +208,68 @@ class DebugInterface():
             self.active = False
         else:
             self.active = True
+            profiler.reset()
+            self.frames_until_refresh = 0
+
+        profiler.enabled = self.active
 
     def draw(self) -> None:
         """
         Draws the debug interface on the display surface.
 
         """
-        self.display_surface.blit(self.fps_text, (SCREEN_WIDTH - self.fps_text.get_width() - 10, 10))
+        if self.fps_text is None:
+            return
+
+        self.display_surface.blit(self.fps_text, (self.graph_rect.left - self.fps_text.get_width() - 10, 10))
+
+        y = self.graph_rect.bottom + 10
+        for text in self.stat_texts:
+            self.display_surface.blit(text, (self.graph_rect.left - 120, y))
+            y += text.get_height()
+
+        self.draw_graph()
+
+    def draw_graph(self) -> None:
+        """
+        Draws the frame time graph, scrolling left as new frames are recorded.
+        The green line marks the frame budget for settings.fps_limit.
 
-    def update(self, clock: pygame.time.Clock) -> None:
         """
-        Updates the debug interface.
+        rect = self.graph_rect
+        pygame.draw.rect(self.display_surface, color.black, rect)
+        pygame.draw.rect(self.display_surface, color.white, rect, 1)
+
+        budget = 1000 / fps_limit
+        scale = rect.height / (budget * 3)
+        budget_y = rect.bottom - budget * scale
+        pygame.draw.line(self.display_surface, color.green, (rect.left, budget_y), (rect.right - 1, budget_y))
+
+        frame_times = profiler.frame_times
+        if len(frame_times) < 2:
+            return
+
+        step = rect.width / (profiler.history - 1)
+        start_x = rect.right - 1 - (len(frame_times) - 1) * step
+        points = [(start_x + i * step, max(rect.top, rect.bottom - 1 - milliseconds * scale)) for i, milliseconds in enumerate(frame_times)]
+        pygame.draw.lines(self.display_surface, color.red, False, points)
+
+    def update(self, clock: pygame.time.Clock, world) -> None:
+        """
+        Updates the debug interface. Does nothing while the interface is hidden.
 
         Parameters:
         - clock: A pygame.time.Clock object representing the game clock.
+        - world: The World object to count entities in.
 
         """
-        self.fps_text = self.get_fps_text(clock)
\ No newline at end of file
+        if not self.active:
+            return
+
+        profiler.record_frame(clock.get_time())
+
+        self.frames_until_refresh -= 1
+        if self.frames_until_refresh <= 0:
+            self.frames_until_refresh = self.refresh_interval
+            self.fps_text = self.get_fps_text(clock)
+            self.stat_texts = self.get_stat_texts(world)
@@ -1,12 +1,21 @@
 import pygame
 import settings
-import images
+import resources
+import spritesheet
+import pool
 
-class BaseDrop(pygame.sprite.Sprite):
+class BaseDrop(pool.Poolable, pygame.sprite.Sprite):
     """
     Base class for drops in the game.
+
+    Drops are pooled: a killed drop returns to its World pool and reset() moves it
+    to its new position when it is reused.
     """
 
+    pool_args = (0, 0)
+    stackable = False
+    render_layer = "drops"
+
     def __init__(self, x: int, y: int) -> None:
         """
         Initialize a BaseDrop object.
@@ -17,28 +26,28 @@ class BaseDrop(pygame.sprite.Sprite):
         """
         pygame.sprite.Sprite.__init__(self)
 
-        self.pos = pygame.math.Vector2(x, y)
-
-        self.image = pygame.Surface([5, 5])
-        self.image.fill((0, 255, 0))
-        self.image.set_colorkey((0, 255, 0))
+        self.image = spritesheet.get_blank(5, (0, 255, 0))
         self.rect = self.image.get_rect()
-        self.rect.center = self.pos
 
-    def update(self) -> None:
+        BaseDrop.reset(self, x, y)
+
+    def reset(self, x: int, y: int) -> None:
         """
-        Update the drop's state.
+        Put the drop back in its spawn state at a new position.
+
+        Args:
+            x (int): The x-coordinate of the drop's position.
+            y (int): The y-coordinate of the drop's position.
         """
-        if self.rect.colliderect(settings.world_reference.player.rect):
-            self.pickup()
+        self.pos = pygame.math.Vector2(x, y)
+        self.rect.center = self.pos
 
     def pickup(self) -> None:
         """
         Handle the pickup of the drop.
         """
-        settings.world_reference.ground_items.remove(self)
-        settings.world_reference.player.inventory.add(self)
-        settings.world_reference.world_camera.remove(self)
+        settings.world_reference.remove_drop(self)
+        settings.world_reference.commands.add(self, settings.world_reference.player.inventory)
 
 class HealthDrop(BaseDrop):
     """
@@ -55,7 +64,7 @@ class HealthDrop(BaseDrop):
         """
         super().__init__(x, y)
         
-        self.image = images.images["health"]
+        self.image = resources.get_manager().get_image("health")
 
         self.health = 5
 
@@ -65,12 +74,16 @@ class HealthDrop(BaseDrop):
         """
         super().pickup()
         settings.world_reference.player.health += self.health
+        settings.world_reference.commands.kill(self)
 
 class CoinDrop(BaseDrop):
     """
-    Class for coin drops in the game.
+    Class for coin drops in the game. Coins dropped close together merge into one
+    stack whose value is the number of coins in it.
     """
 
+    stackable = True
+
     def __init__(self, x: int, y: int) -> None:
         """
         Initialize a CoinDrop object.
@@ -81,8 +94,19 @@ class CoinDrop(BaseDrop):
         """
         super().__init__(x, y)
         
-        self.image = images.images["coin"]
+        self.image = resources.get_manager().get_image("coin")
+
+        self.value = 1
+
+    def reset(self, x: int, y: int) -> None:
+        """
+        Put the coin back in its spawn state at a new position.
 
+        Args:
+            x (int): The x-coordinate of the drop's position.
+            y (int): The y-coordinate of the drop's position.
+        """
+        super().reset(x, y)
         self.value = 1
 
     def pickup(self) -> None:
@@ -1,13 +1,23 @@
 import pygame
 import settings
 import drops
+import spritesheet
 import random
+import pool
 
-class BaseEnemy(pygame.sprite.Sprite):
+class BaseEnemy(pool.Poolable, pygame.sprite.Sprite):
     """
     Base class for enemies in the game.
+
+    Enemies are pooled: a killed enemy returns to its World pool and reset()
+    puts it back in its spawn state when it is reused.
     """
 
+    base_speed = 100
+    max_health = 5
+    drop_types = ()
+    pool_args = (0, 0)
+
     def __init__(self, x: int, y: int, size: int) -> None:
         """
         Initialize the BaseEnemy object.
@@ -22,22 +32,50 @@ class BaseEnemy(pygame.sprite.Sprite):
         """
         pygame.sprite.Sprite.__init__(self)
 
+        self.drop_table = []
+        self.drop_chance = 1
+
+        self.animation = None
+        if settings.enemy_sheet is not None:
+            self.animation = spritesheet.Animation(spritesheet.get_character_animations(settings.enemy_sheet), "run")
+            self.image = self.animation.image
+        else:
+            self.image = spritesheet.get_blank(size, settings.color.red)
+        self.rect = pygame.Rect(0, 0, size, size)
+
+        BaseEnemy.reset(self, x, y)
+
+    def reset(self, x: int, y: int) -> None:
+        """
+        Put the enemy back in its spawn state at a new position.
+
+        Args:
+            x (int): The x-coordinate of the enemy's position.
+            y (int): The y-coordinate of the enemy's position.
+
+        Returns:
+            None
+        """
         self.pos = pygame.math.Vector2(x, y)
         self.vel = pygame.math.Vector2()
-        self.speed = 100
-        self.health = 5
+        self.speed = self.base_speed
+        self.health = self.max_health
 
         self.particle_system = None
-        self.drop_table = []
-        self.drop_chance = 1
+        self.drop_table[:] = self.drop_types
 
-        self.image = pygame.Surface([size, size])
-        self.image.fill(settings.color.red)
-        self.image.set_colorkey(settings.color.red)
-        self.rect = self.image.get_rect()
         self.rect.center = self.pos
 
     def update(self) -> None:
+        """
+        Does nothing. The world steps enemies in its enemy pass, so they are
+        integrated once per tick.
+
+        Returns:
+            None
+        """
+
+    def step(self) -> None:
         """
         Update the enemy's position and check for death.
 
@@ -50,25 +88,47 @@ class BaseEnemy(pygame.sprite.Sprite):
         if self.particle_system is not None:
             self.particle_system.update(self.pos.x, self.pos.y)
 
+        if self.animation is not None:
+            self.animate()
+
         if self.health <= 0:
             self.die()
 
+    def animate(self) -> None:
+        """
+        Advance the run animation, facing the direction of movement.
+
+        Returns:
+            None
+        """
+        self.animation.play("run", self.vel.x < 0)
+        self.animation.update(settings.delta_time)
+        self.image = self.animation.image
+
     def die(self) -> None:
         """
-        Handle the enemy's death, including dropping items.
+        Handle the enemy's death, including dropping items. The enemy is only
+        removed when the world flushes its command buffer, so a second call before
+        then does nothing.
 
         Returns:
             None
         """
+        if settings.world_reference.commands.is_killed(self):
+            return
+
+        settings.world_reference.kills += 1
+
         drop_draw = random.randint(1, 1)
 
         if drop_draw == self.drop_chance:
             drop = random.choice(self.drop_table)
-            instance = drop(self.pos.x, self.pos.y)
-            settings.world_reference.ground_items.add(instance)
-            settings.world_reference.world_camera.add(instance)
+            settings.world_reference.spawn_drop(drop, self.pos.x, self.pos.y)
 
-        self.kill()
+        if self.particle_system is not None:
+            self.particle_system.release()
+
+        settings.world_reference.commands.kill(self)
 
 
 class FollowEnemy(BaseEnemy):
@@ -76,6 +136,10 @@ class FollowEnemy(BaseEnemy):
     Enemy class that follows the player.
     """
 
+    base_speed = 70
+    max_health = 5
+    drop_types = (drops.HealthDrop, drops.CoinDrop)
+
     def __init__(self, x: int, y: int) -> None:
         """
         Initialize the FollowEnemy object.
@@ -91,20 +155,20 @@ class FollowEnemy(BaseEnemy):
 
         self.tag = "follower"
 
-        self.speed = 70
-        self.health = 5
-
-        self.drop_table.append(drops.HealthDrop)
-        self.drop_table.append(drops.CoinDrop)
-
     def follow_player(self) -> None:
         """
-        Make the enemy follow the player.
+        Make the enemy follow the player, taking the world's flow field around walls
+        when there is no straight route.
 
         Returns:
             None
         """
-        self.vel.x, self.vel.y = settings.get_vectors(self, settings.world_reference.player)
+        direction = settings.world_reference.flow_field.get_direction(self.pos.x, self.pos.y)
+
+        if direction is None:
+            self.vel.x, self.vel.y = settings.get_vectors(self, settings.world_reference.player)
+        else:
+            self.vel.x, self.vel.y = direction[0] * self.speed, direction[1] * self.speed
 
 
 class FlyerEnemy(BaseEnemy):
@@ -112,6 +176,10 @@ class FlyerEnemy(BaseEnemy):
     Enemy class that flies and follows the player.
     """
 
+    base_speed = 100
+    max_health = 3
+    drop_types = (drops.HealthDrop, drops.CoinDrop)
+
     def __init__(self, x: int, y: int) -> None:
         """
         Initialize the FlyerEnemy object.
@@ -127,12 +195,6 @@ class FlyerEnemy(BaseEnemy):
 
         self.tag = "flyer follower"
 
-        self.speed = 100
-        self.health = 3
-
-        self.drop_table.append(drops.HealthDrop)
-        self.drop_table.append(drops.CoinDrop)
-
     def follow_player(self) -> None:
         """
         Make the enemy follow the player.
@@ -0,0 +1,203 @@
+import numpy as np
+import settings
+
+class FlowField():
+    """
+    A shared pathfinding field that every ground enemy follows toward the player.
+
+    The field covers a square window of wall grid cells centred on the player's
+    cell. When the player enters a new cell, a breadth-first wavefront spreads out
+    from that cell over the free cells, one vectorized step per ring, and each cell
+    then points at its cheapest neighbour. Diagonal steps are only taken when both
+    orthogonal neighbours are free, so enemies do not cut wall corners.
+
+    Cells whose path distance equals their Manhattan distance have an unobstructed
+    route and are left to steer straight at the player, so the field only bends
+    enemies that actually have to go around a wall.
+
+    Attributes:
+    - wall_grid: The WallGrid whose blocked cells the field routes around.
+    - radius: The number of cells the window reaches out from the player's cell.
+    - size: The width and height of the window in cells.
+    - origin: The (cell x, cell y) of the window's top-left cell, or None before the first update.
+    - player_cell: The cell the field was last computed from.
+    - distance: A (size, size) float array of path lengths to the player's cell, inf where unreachable.
+    - direction: A (size, size, 2) float array of unit directions toward the player.
+    - routed: A (size, size) bool array of cells whose enemies should follow the field.
+    - recomputes: The number of times the field has been rebuilt.
+
+    Methods:
+    - get_blocked(origin: tuple) -> np.ndarray: Returns the blocked cells of a window.
+    - update(x: float, y: float) -> None: Rebuilds the field if the player changed cell.
+    - get_direction(x: float, y: float) -> tuple: Returns the direction to follow from a position.
+    - get_directions(pos: np.ndarray) -> tuple: Returns the directions to follow from many positions.
+    """
+
+    offsets = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+    def __init__(self, wall_grid, radius: int = None) -> None:
+        """
+        Initializes the FlowField object.
+
+        Parameters:
+        - wall_grid: The WallGrid whose blocked cells the field routes around.
+        - radius: The number of cells the window reaches out from the player's cell, settings.flow_field_radius by default.
+        """
+        if radius is None:
+            radius = settings.flow_field_radius
+
+        self.wall_grid = wall_grid
+        self.radius = radius
+        self.size = radius * 2 + 1
+
+        self.origin = None
+        self.player_cell = None
+        self.distance = np.full((self.size, self.size), np.inf)
+        self.direction = np.zeros((self.size, self.size, 2))
+        self.routed = np.zeros((self.size, self.size), dtype=bool)
+        self.recomputes = 0
+
+        self.unit_offsets = np.array([np.array(offset) / np.hypot(*offset) for offset in self.offsets])
+        self.step_costs = np.array([np.hypot(*offset) for offset in self.offsets])
+
+    def get_blocked(self, origin: tuple) -> np.ndarray:
+        """
+        Returns the blocked cells of a window.
+
+        Parameters:
+        - origin: The (cell x, cell y) of the window's top-left cell.
+
+        Returns:
+        - A (size, size) bool array, True where a wall covers the cell.
+        """
+        blocked = np.zeros((self.size, self.size), dtype=bool)
+        ox, oy = origin
+
+        cells = self.wall_grid.cells
+
+        if len(cells) > self.size * self.size:
+            for x in range(self.size):
+                for y in range(self.size):
+                    blocked[x, y] = (ox + x, oy + y) in cells
+        else:
+            for cx, cy in cells:
+                x = cx - ox
+                y = cy - oy
+                if 0 <= x < self.size and 0 <= y < self.size:
+                    blocked[x, y] = True
+
+        return blocked
+
+    def update(self, x: float, y: float) -> None:
+        """
+        Rebuilds the field if the player moved into a different cell since the last build.
+
+        Parameters:
+        - x: The player's x-coordinate in pixels.
+        - y: The player's y-coordinate in pixels.
+        """
+        cell = self.wall_grid.get_cell(x, y)
+        if cell == self.player_cell:
+            return
+
+        self.player_cell = cell
+        self.recomputes += 1
+
+        if not self.wall_grid.cells:
+            self.origin = None
+            return
+
+        size = self.size
+        r = self.radius
+        self.origin = (cell[0] - r, cell[1] - r)
+
+        free = ~self.get_blocked(self.origin)
+        free[r, r] = True
+
+        distance = np.full((size, size), np.inf)
+        distance[r, r] = 0
+        unvisited = free.copy()
+        unvisited[r, r] = False
+
+        frontier = np.zeros((size, size), dtype=bool)
+        frontier[r, r] = True
+        step = 0
+
+        while frontier.any():
+            step += 1
+            grown = np.zeros((size, size), dtype=bool)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            grown &= unvisited
+
+            distance[grown] = step
+            unvisited &= ~grown
+            frontier = grown
+
+        padded = np.full((size + 2, size + 2), np.inf)
+        padded[1:-1, 1:-1] = distance
+
+        def neighbour(dx: int, dy: int) -> np.ndarray:
+            return padded[1 + dx:size + 1 + dx, 1 + dy:size + 1 + dy]
+
+        scores = np.empty((len(self.offsets), size, size))
+        for i, (dx, dy) in enumerate(self.offsets):
+            scores[i] = neighbour(dx, dy) + self.step_costs[i]
+            if dx and dy:
+                corner = np.isinf(neighbour(dx, 0)) | np.isinf(neighbour(0, dy))
+                scores[i][corner] = np.inf
+
+        best = np.argmin(scores, axis=0)
+        self.direction = self.unit_offsets[best]
+
+        span = np.arange(size) - r
+        manhattan = np.abs(span)[:, None] + np.abs(span)[None, :]
+        self.distance = distance
+        self.routed = np.isfinite(distance) & (distance > manhattan)
+
+    def get_direction(self, x: float, y: float) -> tuple:
+        """
+        Returns the direction an enemy at a position should move in.
+
+        Parameters:
+        - x: The enemy's x-coordinate in pixels.
+        - y: The enemy's y-coordinate in pixels.
+
+        Returns:
+        - A unit (x, y) tuple, or None if the enemy should steer straight at the player.
+        """
+        if self.origin is None:
+            return None
+
+        cx, cy = self.wall_grid.get_cell(x, y)
+        cx -= self.origin[0]
+        cy -= self.origin[1]
+
+        if not (0 <= cx < self.size and 0 <= cy < self.size) or not self.routed[cx, cy]:
+            return None
+
+        direction = self.direction[cx, cy]
+        return float(direction[0]), float(direction[1])
+
+    def get_directions(self, pos: np.ndarray) -> tuple:
+        """
+        Returns the directions many enemies should move in, in one vectorized lookup.
+
+        Parameters:
+        - pos: An (n, 2) float array of enemy positions in pixels.
+
+        Returns:
+        - A tuple of an (n, 2) array of unit directions and an (n,) bool array, True where the direction should be followed.
+        """
+        n = len(pos)
+        if self.origin is None or n == 0:
+            return np.zeros((n, 2)), np.zeros(n, dtype=bool)
+
+        cells = np.floor(pos / self.wall_grid.cell_size).astype(np.intp) - np.array(self.origin)
+        inside = (cells >= 0).all(axis=1) & (cells < self.size).all(axis=1)
+        cells[~inside] = 0
+
+        routed = inside & self.routed[cells[:, 0], cells[:, 1]]
+        return self.direction[cells[:, 0], cells[:, 1]], routed
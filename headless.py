@@ -0,0 +1,168 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import time
+import pygame
+import settings
+import main
+import resources
+
+def percentile(values: list, percent: float) -> float:
+    """
+    Calculate a percentile of a list of values using nearest-rank.
+
+    Parameters:
+    - values: The values to look at.
+    - percent: The percentile to calculate, from 0 to 100.
+
+    Returns:
+    - The value at that percentile, or 0 for an empty list.
+    """
+    if not values:
+        return 0
+
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(times: list) -> dict:
+    """
+    Summarize a list of frame times.
+
+    Parameters:
+    - times: The frame times in seconds.
+
+    Returns:
+    - A dict with the mean, min, p50, p95, p99 and max frame time in milliseconds.
+    """
+    if not times:
+        return {"mean": 0, "min": 0, "p50": 0, "p95": 0, "p99": 0, "max": 0}
+
+    return {
+        "mean": sum(times) / len(times) * 1000,
+        "min": min(times) * 1000,
+        "p50": percentile(times, 50) * 1000,
+        "p95": percentile(times, 95) * 1000,
+        "p99": percentile(times, 99) * 1000,
+        "max": max(times) * 1000
+    }
+
+def format_summary(name: str, summary: dict) -> str:
+    """
+    Format a frame time summary as one line of text.
+
+    Parameters:
+    - name: The label printed in front of the numbers.
+    - summary: A summary returned by summarize.
+
+    Returns:
+    - The formatted line.
+    """
+    fields = "  ".join(f"{key} {value:7.3f}" for key, value in summary.items())
+    return f"{name:<7}{fields}  (ms)"
+
+def run(frames: int,
+        enemy_count: int,
+        enemy_type: str,
+        seed: int,
+        render: bool,
+        delta_time: float,
+        wave: int = 0
+        ) -> dict:
+    """
+    Run a seeded, fixed-timestep session of the game without a window or frame limiter.
+
+    Parameters:
+    - frames: The number of frames to simulate.
+    - enemy_count: The number of enemies the world starts with.
+    - enemy_type: The type of enemies the world starts with.
+    - seed: The seed for the random module, which also seeds the particle engine.
+    - render: Whether to draw the world every frame.
+    - delta_time: The fixed delta_time used for every frame, in seconds.
+    - wave: The number of enemies queued with the wave director before the first frame.
+
+    Returns:
+    - A dict with the game, the startup time and the per-frame total, update and draw times in seconds.
+    """
+    random.seed(seed)
+    settings.delta_time = delta_time
+
+    start = time.perf_counter()
+    game = main.Game(enemy_count, enemy_type)
+    startup = time.perf_counter() - start
+    game.world.wave_director.queue_wave(wave)
+
+    total_times = []
+    update_times = []
+    draw_times = []
+
+    for frame in range(frames):
+        start = time.perf_counter()
+
+        game.event_loop()
+        game.world.update()
+        updated = time.perf_counter()
+
+        if render:
+            game.draw()
+            if settings.dirty_rects:
+                pygame.display.update(game.world.world_camera.dirty_rects)
+            else:
+                pygame.display.update()
+        drawn = time.perf_counter()
+
+        settings.delta_time = delta_time
+
+        update_times.append(updated - start)
+        draw_times.append(drawn - updated)
+        total_times.append(drawn - start)
+
+        if not game.running:
+            break
+
+    return {"game": game, "startup": startup, "total": total_times, "update": update_times, "draw": draw_times}
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the headless command line options.
+
+    Returns:
+    - The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Run Color Survivor headless with a fixed delta_time and print frame timings.")
+    parser.add_argument("--frames", type=int, default=1000, help="number of frames to simulate")
+    parser.add_argument("--enemies", type=int, default=10, help="number of enemies at startup")
+    parser.add_argument("--enemy-type", default="flyer follower", choices=["follower", "flyer follower"], help="type of enemies at startup")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random number generators")
+    parser.add_argument("--delta-time", type=float, default=1 / settings.fps_limit, help="fixed delta_time per frame in seconds")
+    parser.add_argument("--no-render", action="store_true", help="skip World.draw and only simulate")
+    parser.add_argument("--swarm", action="store_true", help="use the NumPy enemy swarm backend")
+    parser.add_argument("--map", default=None, help="path of a Tiled map to load")
+    parser.add_argument("--waves", action="store_true", help="spawn enemies over time from settings.wave_curve")
+    parser.add_argument("--wave", type=int, default=0, help="queue a wave of this many enemies on the first frame")
+    parser.add_argument("--dirty-rects", action="store_true", help="redraw and update only the changed parts of the screen")
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    settings.enemy_swarm = args.swarm
+    settings.map_path = args.map
+    settings.dirty_rects = args.dirty_rects
+    settings.wave_director = args.waves
+
+    result = run(args.frames, args.enemies, args.enemy_type, args.seed, not args.no_render, args.delta_time, args.wave)
+    world = result["game"].world
+
+    print(f"frames {len(result['total'])}  enemies {args.enemies} {args.enemy_type}  seed {args.seed}  render {'off' if args.no_render else 'on'}")
+    print(f"startup {result['startup'] * 1000:.1f} ms  {resources.get_manager().report()}")
+    print(format_summary("total", summarize(result["total"])))
+    print(format_summary("update", summarize(result["update"])))
+    print(format_summary("draw", summarize(result["draw"])))
+    print("pools  " + "  ".join(f"{entity_class.__name__} {entity_pool.hits}/{entity_pool.misses}" for entity_class, entity_pool in world.pools.items()) + "  (hit/miss)")
+    print(f"alive {len(world.enemy_container)}  kills {world.kills}  projectiles {len(world.friendly_projectiles)}  drops {len(world.ground_items)}  coins {world.player.coins}  health {world.player.health}  spawned {world.wave_director.spawned_total}")
+
+    pygame.quit()
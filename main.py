@@ -1,6 +1,7 @@
 import pygame
 import settings
 import debug
+import resources
 import world
 
 pygame.init()
@@ -10,41 +11,61 @@ class Game():
     The main game class that controls the game loop and manages game objects.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, enemy_count: int = 10, enemy_type: str = "flyer follower") -> None:
         """
         Initializes the Game object.
 
-        Creates the game window, sets up the debug interface, and loads the game world.
+        Starts warming assets on a background thread when settings.asset_warmup is set,
+        creates the game window, sets up the debug interface, and loads the game world.
+
+        Parameters:
+        - enemy_count: The number of enemies the world starts with.
+        - enemy_type: The type of enemies the world starts with.
         """
+        if settings.asset_warmup:
+            resources.get_manager().warmup()
+
         self.screen = pygame.display.set_mode([settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT])
         pygame.display.set_caption(settings.SCREEN_TITLE)
 
         self.running = True
         self.clock = pygame.time.Clock()
+        self.accumulator = 0
+        self.recorder = None
         settings.events = pygame.event.get()
+        settings.keys = pygame.key.get_pressed()
 
         self.debug_interface = debug.DebugInterface()
-        self.world = world.World("assets/backgrounds/test_map.png")
+        self.world = world.World("assets/backgrounds/test_map.png", enemy_count, enemy_type, settings.map_path)
 
     def start(self) -> None:
         """
         Starts the game loop.
 
-        Continuously updates, draws, and handles events until the game is exited.
+        Continuously handles events, updates, draws and presents until the game is exited.
         """
         while self.running:
             self.event_loop()
-            self.draw()
             self.update()
+            self.draw()
+            self.present()
 
     def event_loop(self) -> None:
         """
-        Handles game events.
-
-        Checks for quit events and key presses to control game behavior.
+        Polls this frame's events and keyboard state into settings.events and
+        settings.keys, then handles the events.
         """
         settings.events = pygame.event.get()
+        settings.keys = pygame.key.get_pressed()
+
+        self.handle_events()
 
+    def handle_events(self) -> None:
+        """
+        Handles the events in settings.events.
+
+        Checks for quit events and key presses to control game behavior.
+        """
         for event in settings.events:
             if event.type == pygame.QUIT:
                 self.running = False
@@ -52,18 +73,26 @@ class Game():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_q:
                     self.running = False
+                if event.key == pygame.K_BACKSPACE:
+                    self.world.rewind(settings.tick_rate)
                 if event.key == pygame.K_TAB:
                     self.debug_interface.toggle_active()
+                    self.world.world_camera.invalidate()
 
     def draw(self) -> None:
         """
         Draws game objects on the screen.
 
         Clears the screen, draws the game world, and optionally draws the debug interface.
+        In dirty-rect mode the camera clears only what it redraws, and the whole
+        screen is redrawn while the debug interface covers it.
         """
-        self.screen.fill(settings.color.black)
+        if not settings.dirty_rects:
+            self.screen.fill(settings.color.black)
+        elif self.debug_interface.active:
+            self.world.world_camera.invalidate()
 
-        self.world.draw()
+        debug.profiler.run("camera draw", self.world.draw)
 
         if self.debug_interface.active:
             self.debug_interface.draw()
@@ -72,13 +101,45 @@ class Game():
         """
         Updates game objects.
 
-        Updates the game world and the debug interface, and updates the display.
+        Runs as many fixed-length world ticks as the accumulated frame time allows,
+        then updates the debug interface. Positions are captured before the last tick
+        so the camera can interpolate between the last two ticks when drawing. If the
+        backlog grows past settings.max_ticks_per_frame the extra time is dropped, so
+        a slow frame slows the game down instead of making it jump. While a recorder
+        is attached the frame's input and tick count are recorded for replay.
         """
-        self.world.update()
+        step = 1 / settings.tick_rate
+        ticks = int(self.accumulator / step)
+
+        if ticks > settings.max_ticks_per_frame:
+            ticks = settings.max_ticks_per_frame
+            self.accumulator = ticks * step
+
+        if self.recorder is not None:
+            self.recorder.record_frame(settings.events, settings.keys, ticks, step)
+
+        for tick in range(ticks):
+            if tick == ticks - 1:
+                self.world.world_camera.capture_previous()
+
+            settings.delta_time = step
+            self.world.update()
+            self.accumulator -= step
 
-        self.debug_interface.update(self.clock)            
-        pygame.display.update()
-        settings.delta_time = self.clock.tick(settings.fps_limit) / 1000
+        settings.interpolation = self.accumulator / step
+
+        self.debug_interface.update(self.clock, self.world)
+
+    def present(self) -> None:
+        """
+        Updates the display and adds the elapsed frame time to the accumulator.
+        In dirty-rect mode only the rects the camera redrew are pushed.
+        """
+        if settings.dirty_rects and not self.debug_interface.active:
+            debug.profiler.run("display update", pygame.display.update, self.world.world_camera.dirty_rects)
+        else:
+            debug.profiler.run("display update", pygame.display.update)
+        self.accumulator += self.clock.tick(settings.fps_limit) / 1000
 
 if __name__ == '__main__':
     game = Game()
@@ -1,96 +1,434 @@
 import pygame
+import numpy as np
 import random
 import settings
 
-class Particle(pygame.sprite.Sprite):
+class ParticleEngine():
     """
-    Represents a particle in the game.
+    Stores and simulates every live particle in the world.
+
+    Particles from every emitter share one preallocated buffer of NumPy arrays.
+    Emitters queue batches that are spawned together on the next update into free
+    slots, and the whole buffer is updated in one vectorized step and drawn straight
+    into the display surface in one batched pass. Each emitter keeps at most its
+    share of the capacity alive, so the buffer never has to drop live particles.
 
     Attributes:
-    - pos: A Vector2 representing the position of the particle.
-    - vel: A Vector2 representing the velocity of the particle.
-    - lifetime: An integer representing the remaining lifetime of the particle.
-    - color: A pygame.Color object representing the color of the particle.
-    - image: A pygame.Surface object representing the image of the particle.
-    - rect: A pygame.Rect object representing the bounding rectangle of the particle.
+    - capacity: The number of particle slots in the buffer.
+    - pos: A (capacity, 2) float array of particle positions.
+    - vel: A (capacity, 2) float array of particle velocities.
+    - lifetime: A (capacity,) int array of remaining lifetimes, 0 for free slots.
+    - size: A (capacity,) int array of particle sizes.
+    - color: A (capacity, 3) uint8 array of particle colors.
+    - emitter: A (capacity,) int array holding the id of the emitter that spawned each particle.
+    - live_counts: An int array with the number of live particles per emitter id.
+    - live_count: The total number of live particles.
+    - free_emitters: A list of released emitter ids waiting to be reused.
+    - active_emitters: A set of the emitter ids currently registered.
+    - pending: A list of particle batches queued by emit and spawned by flush.
+    - pending_batches: A list of arrays of particle batches queued by emit_batch and spawned by flush.
+    - rng: The NumPy random generator used for spawning, seeded from the random module.
+
+    Methods:
+    - register() -> int: Reserves an emitter id.
+    - release(emitter_id: int) -> None: Frees an emitter id, ignoring ids that are already free.
+    - get_emitter_budget() -> int: Returns how many live particles each emitter may keep.
+    - get_live_counts(emitter_ids: np.ndarray) -> np.ndarray: Returns the live particle counts of many emitters.
+    - emit(...) -> None: Queues a batch of particles for an emitter.
+    - emit_batch(...) -> None: Queues one batch of particles for each of many emitters.
+    - flush() -> None: Spawns every queued batch into free slots in one vectorized pass.
+    - update() -> None: Moves and ages every live particle.
+    - get_screen_positions(size: tuple, offset: pygame.math.Vector2, interpolation: float) -> tuple: Finds where visible particles land on screen.
+    - get_screen_cells(size: tuple, offset: pygame.math.Vector2, interpolation: float, cell_size: int) -> set: Finds the screen cells visible particles touch.
+    - draw(surface: pygame.Surface, offset: pygame.math.Vector2, interpolation: float) -> None: Draws every live particle.
     """
 
-    def __init__(self,
-                 x: int,
-                 y: int,
-                 width: int,
-                 height: int,
-                 color: pygame.Color,
-                 min_life: int,
-                 max_life: int) -> None:
+    def __init__(self, capacity: int = None) -> None:
         """
-        Initializes a new instance of the Particle class.
+        Initializes the ParticleEngine object.
 
         Parameters:
-        - x: An integer representing the x-coordinate of the particle's position.
-        - y: An integer representing the y-coordinate of the particle's position.
-        - width: An integer representing the width of the particle's image.
-        - height: An integer representing the height of the particle's image.
-        - color: A pygame.Color object representing the color of the particle.
-        - min_life: An integer representing the minimum lifetime of the particle.
-        - max_life: An integer representing the maximum lifetime of the particle.
+        - capacity: The number of particle slots to preallocate, settings.particle_capacity by default.
+        """
+        if capacity is None:
+            capacity = settings.particle_capacity
+
+        self.capacity = capacity
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.emitter = np.zeros(capacity, dtype=np.int32)
+
+        # Emitter id 0 is reserved for particles whose emitter has been released.
+        self.free_emitters = []
+        self.active_emitters = set()
+        self.next_emitter = 1
+        self.live_counts = np.zeros(1, dtype=np.int64)
+        self.live_count = 0
+        self.pending = []
+        self.pending_batches = []
+
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def register(self) -> int:
         """
+        Reserves an emitter id.
 
-        pygame.sprite.Sprite.__init__(self)
+        Returns:
+        - The new emitter id.
+        """
+        if self.free_emitters:
+            emitter_id = self.free_emitters.pop()
+        else:
+            emitter_id = self.next_emitter
+            self.next_emitter += 1
 
-        self.pos = pygame.math.Vector2(x, y)
-        self.vel = pygame.math.Vector2()
+        self.active_emitters.add(emitter_id)
+        return emitter_id
 
-        self.lifetime = random.randint(min_life, max_life)
+    def release(self, emitter_id: int) -> None:
+        """
+        Frees an emitter id. Its live particles keep flying until they expire.
+        Releasing an id that is not registered does nothing, so an id is never
+        handed out to two emitters.
 
-        self.color = color
-        self.image = pygame.Surface([width, height])
-        self.image.fill(self.color)
-        self.rect = self.image.get_rect()
-        self.rect.center = self.pos
+        Parameters:
+        - emitter_id: The emitter id to free.
+        """
+        if emitter_id not in self.active_emitters:
+            return
+        self.active_emitters.remove(emitter_id)
+
+        self.emitter[self.emitter == emitter_id] = 0
+        if emitter_id < len(self.live_counts):
+            self.live_counts[emitter_id] = 0
+        self.free_emitters.append(emitter_id)
+
+    def get_live_count(self, emitter_id: int) -> int:
+        """
+        Returns the number of live particles spawned by an emitter.
+
+        Parameters:
+        - emitter_id: The emitter id to look up.
+
+        Returns:
+        - The number of live particles.
+        """
+        if emitter_id < len(self.live_counts):
+            return int(self.live_counts[emitter_id])
+        return 0
+
+    def get_live_counts(self, emitter_ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the number of live particles spawned by each of many emitters.
+
+        Parameters:
+        - emitter_ids: An int array of emitter ids.
+
+        Returns:
+        - An int array of live particle counts.
+        """
+        counts = np.zeros(len(emitter_ids), dtype=np.int64)
+        known = emitter_ids < len(self.live_counts)
+        counts[known] = self.live_counts[emitter_ids[known]]
+        return counts
+
+    def get_emitter_budget(self) -> int:
+        """
+        Returns how many live particles each emitter may keep: an equal share of
+        the capacity between the registered emitters.
+
+        Returns:
+        - The number of particles.
+        """
+        return self.capacity // max(1, len(self.active_emitters))
+
+    def emit(self,
+             emitter_id: int,
+             x: int,
+             y: int,
+             count: int,
+             color: pygame.Color,
+             min_particle_size: int,
+             max_particle_size: int,
+             particle_offset: int,
+             min_life: int,
+             max_life: int,
+             min_x_vel: float,
+             max_x_vel: float,
+             min_y_vel: float,
+             max_y_vel: float
+             ) -> None:
+        """
+        Queues a batch of particles to be spawned on the next flush.
+
+        Parameters:
+        - emitter_id: The id of the emitter spawning the particles.
+        - x: The x-coordinate of the spawn position.
+        - y: The y-coordinate of the spawn position.
+        - count: The number of particles to create.
+        - color: The color of the particles.
+        - min_particle_size: The minimum size of the particles.
+        - max_particle_size: The maximum size of the particles.
+        - particle_offset: The maximum offset from the spawn position.
+        - min_life: The minimum lifetime of the particles.
+        - max_life: The maximum lifetime of the particles.
+        - min_x_vel: The minimum x-axis velocity of the particles.
+        - max_x_vel: The maximum x-axis velocity of the particles.
+        - min_y_vel: The minimum y-axis velocity of the particles.
+        - max_y_vel: The maximum y-axis velocity of the particles.
+        """
+        if count <= 0:
+            return
+
+        self.pending.append((emitter_id, count, color[0], color[1], color[2],
+                             int(x - particle_offset), int(x + particle_offset), int(y - particle_offset), int(y + particle_offset),
+                             min_particle_size, max_particle_size, min_life, max_life,
+                             min_x_vel, max_x_vel, min_y_vel, max_y_vel))
+
+        if emitter_id >= len(self.live_counts):
+            self.live_counts = np.resize(self.live_counts, emitter_id + 1)
+            self.live_counts[emitter_id] = 0
+        self.live_counts[emitter_id] += count
+
+    def emit_batch(self,
+                   emitter_ids: np.ndarray,
+                   x: np.ndarray,
+                   y: np.ndarray,
+                   counts: np.ndarray,
+                   colors: np.ndarray,
+                   min_particle_size: int,
+                   max_particle_size: int,
+                   particle_offset: int,
+                   min_life: int,
+                   max_life: int,
+                   min_x_vel: float,
+                   max_x_vel: float,
+                   min_y_vel: float,
+                   max_y_vel: float
+                   ) -> None:
+        """
+        Queues one batch of particles for each of many emitters, the array form of
+        emit. Every batch shares the size, lifetime and velocity ranges.
+
+        Parameters:
+        - emitter_ids: An int array of distinct emitter ids.
+        - x: A float array of spawn x-coordinates.
+        - y: A float array of spawn y-coordinates.
+        - counts: An int array of the number of particles to create per emitter.
+        - colors: An (n, 3) array of particle colors per emitter.
+        - min_particle_size: The minimum size of the particles.
+        - max_particle_size: The maximum size of the particles.
+        - particle_offset: The maximum offset from the spawn position.
+        - min_life: The minimum lifetime of the particles.
+        - max_life: The maximum lifetime of the particles.
+        - min_x_vel: The minimum x-axis velocity of the particles.
+        - max_x_vel: The maximum x-axis velocity of the particles.
+        - min_y_vel: The minimum y-axis velocity of the particles.
+        - max_y_vel: The maximum y-axis velocity of the particles.
+        """
+        keep = counts > 0
+        if not keep.any():
+            return
+
+        emitter_ids = emitter_ids[keep]
+        counts = counts[keep]
+
+        batches = np.empty((len(emitter_ids), 17), dtype=np.float64)
+        batches[:, 0] = emitter_ids
+        batches[:, 1] = counts
+        batches[:, 2:5] = colors[keep]
+        batches[:, 5] = np.trunc(x[keep] - particle_offset)
+        batches[:, 6] = np.trunc(x[keep] + particle_offset)
+        batches[:, 7] = np.trunc(y[keep] - particle_offset)
+        batches[:, 8] = np.trunc(y[keep] + particle_offset)
+        batches[:, 9:17] = (min_particle_size, max_particle_size, min_life, max_life, min_x_vel, max_x_vel, min_y_vel, max_y_vel)
+        self.pending_batches.append(batches)
+
+        highest = int(emitter_ids.max())
+        if highest >= len(self.live_counts):
+            grown = np.zeros(highest + 1, dtype=np.int64)
+            grown[:len(self.live_counts)] = self.live_counts
+            self.live_counts = grown
+        self.live_counts[emitter_ids] += counts
+
+    def flush(self) -> None:
+        """
+        Spawns every queued batch into free slots in one vectorized pass. Live
+        particles are never overwritten: once the buffer is full, the batches
+        queued last are cut short.
+        """
+        if not self.pending and not self.pending_batches:
+            return
+
+        blocks = self.pending_batches
+        if self.pending:
+            blocks = [np.array(self.pending, dtype=np.float64)] + blocks
+        batches = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+        self.pending = []
+        self.pending_batches = []
+
+        free = np.flatnonzero(self.lifetime == 0)
+        counts = batches[:, 1].astype(np.int64)
+        if counts.sum() > len(free):
+            counts = np.diff(np.minimum(np.cumsum(counts), len(free)), prepend=0)
+
+        params = np.repeat(batches, counts, axis=0)
+        slots = free[:len(params)]
+        rng = self.rng
+
+        self.emitter[slots] = params[:, 0]
+        self.color[slots] = params[:, 2:5]
+        self.pos[slots, 0] = rng.integers(params[:, 5], params[:, 6] + 1)
+        self.pos[slots, 1] = rng.integers(params[:, 7], params[:, 8] + 1)
+        self.size[slots] = rng.integers(params[:, 9], params[:, 10] + 1)
+        self.lifetime[slots] = rng.integers(params[:, 11], params[:, 12] + 1)
+        self.vel[slots, 0] = rng.uniform(params[:, 13], params[:, 14])
+        self.vel[slots, 1] = rng.uniform(params[:, 15], params[:, 16])
 
     def update(self) -> None:
         """
-        Updates the particle's position and lifetime.
+        Spawns queued particles, then moves every live particle by its velocity and
+        ages it by one frame.
+        """
+        self.flush()
+
+        live = self.lifetime > 0
+
+        self.pos[live] += self.vel[live] * settings.delta_time
+        self.lifetime[live] -= 1
+
+        live = self.lifetime > 0
+        self.live_count = int(np.count_nonzero(live))
+        self.live_counts = np.bincount(self.emitter[live], minlength=self.next_emitter)
+
+    def get_screen_positions(self, size: tuple, offset: pygame.math.Vector2, interpolation: float = 1) -> tuple:
         """
+        Calculates where every live particle lands on a surface, skipping particles
+        that are not fully on it.
 
-        self.pos += self.vel * settings.delta_time
-        self.rect.center = self.pos
+        Parameters:
+        - size: The (width, height) of the surface.
+        - offset: The camera offset subtracted from each particle's position.
+        - interpolation: How far between the last two ticks to draw, from 0 to 1.
 
-        self.lifetime -= 1
-        if self.lifetime <= 0:
-            self.kill()
+        Returns:
+        - A tuple of the visible particle indices and their left, top and size arrays, or None if none are visible.
+        """
+        live = np.flatnonzero(self.lifetime > 0)
+        if len(live) == 0:
+            return None
 
-class ParticleSystem(pygame.sprite.Sprite):
+        particle_size = self.size[live]
+        pos = self.pos[live]
+        if interpolation < 1:
+            pos = pos - self.vel[live] * (settings.delta_time * (1 - interpolation))
+
+        left = np.rint(pos[:, 0] - particle_size / 2 - offset.x).astype(np.intp)
+        top = np.rint(pos[:, 1] - particle_size / 2 - offset.y).astype(np.intp)
+
+        width, height = size
+        visible = (left >= 0) & (top >= 0) & (left + particle_size <= width) & (top + particle_size <= height)
+        if not visible.any():
+            return None
+
+        return live[visible], left[visible], top[visible], particle_size[visible]
+
+    def get_screen_cells(self, size: tuple, offset: pygame.math.Vector2, interpolation: float, cell_size: int) -> set:
+        """
+        Finds the screen grid cells that visible particles touch.
+
+        Parameters:
+        - size: The (width, height) of the surface.
+        - offset: The camera offset subtracted from each particle's position.
+        - interpolation: How far between the last two ticks to draw, from 0 to 1.
+        - cell_size: The width and height of a grid cell in pixels.
+
+        Returns:
+        - A set of (cell x, cell y) keys.
+        """
+        positions = self.get_screen_positions(size, offset, interpolation)
+        if positions is None:
+            return set()
+
+        live, left, top, particle_size = positions
+        right = left + particle_size - 1
+        bottom = top + particle_size - 1
+
+        x = np.concatenate((left, right, left, right)) // cell_size
+        y = np.concatenate((top, top, bottom, bottom)) // cell_size
+        keys = np.unique(x * 65536 + y)
+
+        return {(key // 65536, key % 65536) for key in keys.tolist()}
+
+    def draw(self, surface: pygame.Surface, offset: pygame.math.Vector2, interpolation: float = 1) -> None:
+        """
+        Draws every live particle into a 32-bit surface in one batched pass.
+
+        Particles are grouped by size and each pixel offset of the square is written
+        for the whole group at once. Particles not fully on the surface are skipped.
+
+        Parameters:
+        - surface: The surface to draw to.
+        - offset: The camera offset subtracted from each particle's position.
+        - interpolation: How far between the last two ticks to draw, from 0 to 1.
+        """
+        positions = self.get_screen_positions(surface.get_size(), offset, interpolation)
+        if positions is None:
+            return
+
+        live, left, top, size = positions
+        color = self.color[live].astype(np.uint32)
+
+        shifts = surface.get_shifts()
+        losses = surface.get_losses()
+        mapped = surface.get_masks()[3]
+        for channel in range(3):
+            mapped = mapped | ((color[:, channel] >> losses[channel]) << shifts[channel])
+
+        pixels = pygame.surfarray.pixels2d(surface)
+        for particle_size in np.unique(size).tolist():
+            group = size == particle_size
+            x = left[group]
+            y = top[group]
+            group_color = mapped[group]
+
+            for dy in range(particle_size):
+                for dx in range(particle_size):
+                    pixels[x + dx, y + dy] = group_color
+        del pixels
+
+class ParticleSystem():
     """
-    Represents a particle system in the game.
+    Represents a particle emitter in the game.
+
+    The emitter owns no particles itself, it spawns them into the world's ParticleEngine
+    under its own emitter id and keeps the engine topped up to max_particles, or to
+    its share of the engine's capacity when there are too many emitters for that.
 
     Attributes:
     - pos: A Vector2 representing the position of the particle system.
-    - image: A pygame.Surface object representing the image of the particle system.
-    - rect: A pygame.Rect object representing the bounding rectangle of the particle system.
-    - particle_container: A pygame.sprite.Group object containing all the particles in the system.
-    - master_particle_container: A reference to the main particle container in the game.
+    - engine: The ParticleEngine the particles are spawned into.
+    - emitter_id: The id this emitter's particles are tagged with in the engine.
     - particle_color: A pygame.Color object representing the color of the particles in the system.
     - max_particles: An integer representing the maximum number of particles in the system.
     """
 
+    max_particles = 100
+
     def __init__(self) -> None:
         """
         Initializes a new instance of the ParticleSystem class.
         """
 
-        pygame.sprite.Sprite.__init__(self)
-
         self.pos = pygame.math.Vector2(0, 0)
-        self.image = pygame.Surface([0, 0])
-        self.rect = self.image.get_rect()
-        self.rect.center = self.pos
 
-        self.particle_container = pygame.sprite.Group()
-        self.master_particle_container = settings.world_reference.world_camera
+        self.engine = settings.world_reference.particle_engine
+        self.emitter_id = self.engine.register()
         self.particle_color = settings.color.black
-        self.max_particles = 100
 
     def create_particles(self,
                          x: int,
@@ -107,7 +445,7 @@ class ParticleSystem(pygame.sprite.Sprite):
                          max_y_vel: float
                          ) -> None:
         """
-        Creates particles and adds them to the particle system.
+        Creates particles in the particle engine for this system.
 
         Parameters:
         - x: An integer representing the x-coordinate of the spawn position.
@@ -124,19 +462,33 @@ class ParticleSystem(pygame.sprite.Sprite):
         - max_y_vel: A float representing the maximum y-axis velocity of the particles.
         """
 
-        for p in range(count):
-            particle_size = random.randint(min_particle_size, max_particle_size)
-            x_range = (int(x - particle_offset), int(x + particle_offset))
-            y_range = (int(y - particle_offset), int(y + particle_offset))
-            spawn_pos = pygame.math.Vector2(random.randint(x_range[0], x_range[1]), random.randint(y_range[0], y_range[1]))
-            p = Particle(spawn_pos.x, spawn_pos.y, particle_size, particle_size, self.particle_color, min_life, max_life)
+        self.engine.emit(self.emitter_id, x, y, count, self.particle_color, min_particle_size, max_particle_size,
+                         particle_offset, min_life, max_life, min_x_vel, max_x_vel, min_y_vel, max_y_vel)
+
+    def get_particle_count(self) -> int:
+        """
+        Returns the number of live particles spawned by this system.
+
+        Returns:
+        - The number of live particles.
+        """
+        return self.engine.get_live_count(self.emitter_id)
+
+    def get_missing_count(self) -> int:
+        """
+        Returns how many particles this system should spawn to get back to
+        max_particles, or to its share of the engine if that is smaller.
 
-            p.vel.x = random.uniform(min_x_vel, max_x_vel)
-            p.vel.y = random.uniform(min_y_vel, max_y_vel)
+        Returns:
+        - The number of particles to spawn.
+        """
+        return min(self.max_particles, self.engine.get_emitter_budget()) - self.get_particle_count()
 
-            self.master_particle_container.add(p)
-            self.particle_container.add(p)
-            settings.world_reference.particle_group.add(p)
+    def release(self) -> None:
+        """
+        Stops the system, leaving its live particles to expire on their own.
+        """
+        self.engine.release(self.emitter_id)
 
 class PlayerParticleSystem(ParticleSystem):
     """
@@ -154,7 +506,7 @@ class PlayerParticleSystem(ParticleSystem):
 
         self.spawn_pos = pygame.math.Vector2(int(settings.SCREEN_WIDTH / 2), int(settings.SCREEN_HEIGHT / 2))
         self.particle_color = settings.color.random_gray(min_value=120)
-        self.create_particles(self.spawn_pos.x, self.spawn_pos.y, self.max_particles, 3, 5, 15, 20, 45, -40, 40, -40, 40)
+        self.create_particles(self.spawn_pos.x, self.spawn_pos.y, self.get_missing_count(), 3, 5, 15, 20, 45, -40, 40, -40, 40)
 
     def update(self,
                x: int,
@@ -170,7 +522,7 @@ class PlayerParticleSystem(ParticleSystem):
 
         new_pos = pygame.math.Vector2(int(x), int(y))
         self.particle_color = settings.color.random_gray(min_value=120)
-        new_count = self.max_particles - len(self.particle_container)
+        new_count = self.get_missing_count()
         self.create_particles(new_pos.x, new_pos.y, new_count, 3, 5, 15, 20, 45, -40, 40, -40, 40)
 
 class EnemyParticleSystem(ParticleSystem):
@@ -178,8 +530,14 @@ class EnemyParticleSystem(ParticleSystem):
     Represents a particle system for an enemy in the game.
 
     Inherits from the ParticleSystem class.
+
+    Attributes:
+    - particle_args: The size, offset, lifetime and velocity ranges of the particles spawned.
     """
 
+    max_particles = 50
+    particle_args = (3, 5, 8, 20, 45, -40, 40, -40, 40)
+
     def __init__(self,
                  init_x: int,
                  init_y: int
@@ -194,11 +552,9 @@ class EnemyParticleSystem(ParticleSystem):
 
         super().__init__()
 
-        self.max_particles = 50
-
         self.spawn_pos = pygame.math.Vector2(init_x, init_y)
         self.particle_color = settings.color.random_custom("r", min_value = 120)
-        self.create_particles(self.spawn_pos.x, self.spawn_pos.y, self.max_particles, 3, 5, 8, 20, 45, -40, 40, -40, 40)
+        self.create_particles(self.spawn_pos.x, self.spawn_pos.y, self.get_missing_count(), *self.particle_args)
 
     def update(self,
                x: int,
@@ -214,5 +570,30 @@ class EnemyParticleSystem(ParticleSystem):
 
         new_pos = pygame.math.Vector2(int(x), int(y))
         self.particle_color = settings.color.random_custom("r", min_value = 120)
-        new_count = self.max_particles - len(self.particle_container)
-        self.create_particles(new_pos.x, new_pos.y, new_count, 3, 5, 8, 20, 45, -40, 40, -40, 40)
\ No newline at end of file
+        new_count = self.get_missing_count()
+        self.create_particles(new_pos.x, new_pos.y, new_count, *self.particle_args)
+
+    @classmethod
+    def update_many(cls,
+                    engine: ParticleEngine,
+                    emitter_ids: np.ndarray,
+                    x: np.ndarray,
+                    y: np.ndarray
+                    ) -> None:
+        """
+        Updates many enemy particle systems at once, the batched form of update for
+        owners that keep their positions in arrays. Colors are drawn from the
+        engine's generator instead of the random module.
+
+        Parameters:
+        - engine: The ParticleEngine the systems emit into.
+        - emitter_ids: An int array of the systems' distinct emitter ids.
+        - x: A float array of the owners' x-coordinates.
+        - y: A float array of the owners' y-coordinates.
+        """
+        counts = min(cls.max_particles, engine.get_emitter_budget()) - engine.get_live_counts(emitter_ids)
+
+        colors = np.zeros((len(emitter_ids), 3))
+        colors[:, 0] = engine.rng.integers(120, 256, len(emitter_ids))
+
+        engine.emit_batch(emitter_ids, np.trunc(x), np.trunc(y), counts, colors, *cls.particle_args)
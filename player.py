@@ -1,6 +1,7 @@
 import pygame
 import settings
 import drops
+import spritesheet
 
 class Player(pygame.sprite.Sprite):
     """
@@ -16,6 +17,7 @@ class Player(pygame.sprite.Sprite):
         weapons (list): List of weapons the player has.
         inventory (pygame.sprite.Group): The inventory of the player.
         coins (int): The number of coins the player has.
+        animation (Animation): The player's sprite sheet animation, or None when drawn by particles only.
         image (pygame.Surface): The image representing the player.
         rect (pygame.Rect): The rectangle representing the player's position and size.
     """
@@ -40,10 +42,13 @@ class Player(pygame.sprite.Sprite):
         self.inventory = pygame.sprite.Group()
         self.coins = 0
 
-        self.image = pygame.Surface([self.size, self.size])
-        self.image.fill(settings.color.white)
-        self.image.set_colorkey(settings.color.white)
-        self.rect = self.image.get_rect()
+        self.animation = None
+        if settings.player_sheet is not None:
+            self.animation = spritesheet.Animation(spritesheet.get_character_animations(settings.player_sheet))
+            self.image = self.animation.image
+        else:
+            self.image = spritesheet.get_blank(self.size, settings.color.white)
+        self.rect = pygame.Rect(0, 0, self.size, self.size)
         self.rect.center = self.pos
 
     def update(self) -> None:
@@ -55,6 +60,9 @@ class Player(pygame.sprite.Sprite):
 
         self.move()
         self.get_coins()
+
+        if self.animation is not None:
+            self.animate()
         
         if self.particle_system is not None:
             self.particle_system.update(self.pos.x, self.pos.y)
@@ -65,11 +73,20 @@ class Player(pygame.sprite.Sprite):
         if self.health > self.max_health:
             self.health = self.max_health
 
+    def animate(self) -> None:
+        """
+        Plays the run or idle animation, facing the direction of movement.
+        """
+        flipped = self.vel.x < 0 or (self.vel.x == 0 and self.animation.flipped)
+        self.animation.play("run" if self.vel else "idle", flipped)
+        self.animation.update(settings.delta_time)
+        self.image = self.animation.image
+
     def move(self) -> None:
         """
         Handles the player's movement based on keyboard input.
         """
-        keys = pygame.key.get_pressed()
+        keys = settings.keys
 
         if keys[pygame.K_a]:
             self.vel.x = -self.speed
@@ -88,13 +105,15 @@ class Player(pygame.sprite.Sprite):
     def get_coins(self) -> int:
         """
         Collects coins from the inventory and updates the player's coin count.
+        Collected coins are removed when the world flushes its command buffer.
         
         Returns:
             int: The updated coin count.
         """
+        commands = settings.world_reference.commands
         for item in self.inventory:
-            if isinstance(item, drops.CoinDrop):
+            if isinstance(item, drops.CoinDrop) and not commands.is_killed(item):
                 self.coins += item.value
-                item.kill()
+                commands.kill(item)
         
         return self.coins
@@ -0,0 +1,99 @@
+class Poolable():
+    """
+    Mixin for sprites that return to an EntityPool when they are killed.
+
+    The class must define reset() taking the same arguments as its constructor,
+    which puts every per-instance field back to its spawn state.
+
+    Attributes:
+    - pool: The EntityPool the entity returns to, or None if it is not pooled.
+    - pool_args: The constructor arguments used to preallocate placeholder entities, or None if the class cannot be preallocated.
+    """
+
+    pool = None
+    pool_args = None
+
+    def kill(self) -> None:
+        """
+        Removes the entity from every group and returns it to its pool.
+        """
+        was_alive = self.alive()
+        super().kill()
+
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+class EntityPool():
+    """
+    Keeps dead entities of one class around so spawning reuses their Sprites and Surfaces.
+
+    Attributes:
+    - entity_class: The class the pool creates.
+    - free: Entities waiting to be reused.
+    - hits: The number of acquires served from the free list.
+    - misses: The number of acquires that had to create a new entity.
+    - preallocated: The number of entities created ahead of time.
+
+    Methods:
+    - preallocate(count: int, *args) -> None: Creates entities ahead of time.
+    - acquire(*args) -> Poolable: Returns a reset entity, creating one only if none are free.
+    - release(entity: Poolable) -> None: Returns a dead entity to the pool.
+    """
+
+    def __init__(self, entity_class: type) -> None:
+        """
+        Initializes the EntityPool object.
+
+        Parameters:
+        - entity_class: The class the pool creates.
+        """
+        self.entity_class = entity_class
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.preallocated = 0
+
+    def preallocate(self, count: int, *args) -> None:
+        """
+        Creates entities ahead of time so the first spawns do not allocate.
+
+        Parameters:
+        - count: The number of entities to create.
+        - args: The constructor arguments used for the placeholder entities.
+        """
+        for i in range(count):
+            entity = self.entity_class(*args)
+            entity.pool = self
+            self.free.append(entity)
+
+        self.preallocated += count
+
+    def acquire(self, *args) -> Poolable:
+        """
+        Returns an entity reset with the given arguments, reusing a dead one when available.
+
+        Parameters:
+        - args: The arguments passed to the constructor or to reset().
+
+        Returns:
+        - The entity, not yet added to any group.
+        """
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            self.hits += 1
+        else:
+            entity = self.entity_class(*args)
+            entity.pool = self
+            self.misses += 1
+
+        return entity
+
+    def release(self, entity: Poolable) -> None:
+        """
+        Returns a dead entity to the pool.
+
+        Parameters:
+        - entity: The entity to return.
+        """
+        self.free.append(entity)
@@ -1,7 +1,11 @@
 import pygame
 import settings
+import pool
+
+class Projectile(pool.Poolable, pygame.sprite.Sprite):
+    pool_args = (0, 0, 1, 0, 5, 0, 0, pygame.Color(0, 0, 0), 0)
+    render_layer = "projectiles"
 
-class Projectile(pygame.sprite.Sprite):
     def __init__(self,
                  x: int,
                  y: int,
@@ -10,7 +14,8 @@ class Projectile(pygame.sprite.Sprite):
                  size: int,
                  speed: float,
                  damage: int,
-                 color: pygame.Color
+                 color: pygame.Color,
+                 max_range: float
                  ) -> None:
         """
         Initialize a Projectile object.
@@ -24,23 +29,63 @@ class Projectile(pygame.sprite.Sprite):
             speed (float): The speed at which the projectile moves.
             damage (int): The amount of damage the projectile inflicts.
             color (pygame.Color): The color of the projectile.
+            max_range (float): The distance the projectile travels before expiring.
 
         Returns:
             None
         """
-        
+
         pygame.sprite.Sprite.__init__(self)
 
+        self.image = None
+
+        self.reset(x, y, target_x, target_y, size, speed, damage, color, max_range)
+
+    def reset(self,
+              x: int,
+              y: int,
+              target_x: int,
+              target_y: int,
+              size: int,
+              speed: float,
+              damage: int,
+              color: pygame.Color,
+              max_range: float
+              ) -> None:
+        """
+        Reset the projectile for a new shot, reusing its image when the size matches.
+
+        Args:
+            x (int): The x-coordinate of the projectile's starting position.
+            y (int): The y-coordinate of the projectile's starting position.
+            target_x (int): The x-coordinate of the projectile's target position.
+            target_y (int): The y-coordinate of the projectile's target position.
+            size (int): The size of the projectile.
+            speed (float): The speed at which the projectile moves.
+            damage (int): The amount of damage the projectile inflicts.
+            color (pygame.Color): The color of the projectile.
+            max_range (float): The distance the projectile travels before expiring.
+
+        Returns:
+            None
+        """
         self.pos = pygame.math.Vector2(x, y)
         self.vel = pygame.math.Vector2()
         self.target_pos = pygame.math.Vector2(target_x, target_y)
 
         self.speed = speed
         self.damage = damage
-        self.color = color
 
-        self.image = pygame.Surface([size, size])
-        self.image.fill(self.color)
+        self.max_range = max_range
+        self.travelled = 0
+        self.ttl = settings.projectile_ttl
+
+        if self.image is None or self.image.get_width() != size:
+            self.image = pygame.Surface([size, size])
+            self.color = None
+        if self.color != color:
+            self.color = color
+            self.image.fill(self.color)
         #self.image.set_colorkey(self.color)
         self.rect = self.image.get_rect()
         self.rect.center = self.pos
@@ -49,10 +94,26 @@ class Projectile(pygame.sprite.Sprite):
 
     def update(self) -> None:
         """
-        Update the position of the projectile.
+        Does nothing. The world steps projectiles in its projectile pass, so they
+        move once per tick.
+
+        Returns:
+            None
+        """
+
+    def step(self) -> None:
+        """
+        Update the position of the projectile and expire it once it has travelled its
+        range, outlived its time-to-live or left the world bounds.
 
         Returns:
             None
         """
         self.pos += self.vel * settings.delta_time
-        self.rect.center = self.pos
\ No newline at end of file
+        self.rect.center = self.pos
+
+        self.travelled += self.speed * settings.delta_time
+        self.ttl -= settings.delta_time
+
+        if self.travelled >= self.max_range or self.ttl <= 0 or not settings.world_reference.world_bounds.colliderect(self.rect):
+            settings.world_reference.commands.kill(self)
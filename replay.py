@@ -0,0 +1,379 @@
+import os
+import sys
+
+# Replays run headless; only recording opens a real window.
+if sys.argv[1:2] != ["record"]:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import struct
+import time
+import pygame
+import settings
+import main
+import headless
+
+magic = b"CSRP"
+version = 1
+
+header_format = "<4sBqI"
+run_format = "<IBBH"
+
+keys_changed = 1
+delta_changed = 2
+
+config_names = ("enemy_swarm", "map_path", "wave_director", "tick_rate")
+
+def encode_keys(keys) -> bytes:
+    """
+    Packs a keyboard state into one bit per scancode.
+
+    Parameters:
+    - keys: The sequence of pressed flags returned by pygame.key.get_pressed.
+
+    Returns:
+    - The packed bytes, lowest scancode in the lowest bit of the first byte.
+    """
+    packed = bytearray((len(keys) + 7) // 8)
+    for scancode, pressed in enumerate(keys):
+        if pressed:
+            packed[scancode >> 3] |= 1 << (scancode & 7)
+    return bytes(packed)
+
+def decode_keys(packed: bytes, key_count: int) -> pygame.key.ScancodeWrapper:
+    """
+    Unpacks a keyboard state packed by encode_keys.
+
+    Parameters:
+    - packed: The packed bytes.
+    - key_count: The number of scancodes in the state.
+
+    Returns:
+    - A keyboard state that can be indexed by key constants like pygame.key.get_pressed.
+    """
+    return pygame.key.ScancodeWrapper(bool(packed[scancode >> 3] & (1 << (scancode & 7))) for scancode in range(key_count))
+
+def encode_event(event: pygame.event.Event) -> bytes:
+    """
+    Encodes an event as its type and the JSON of its attributes. Attributes that
+    cannot be written as JSON, such as window references, are left out.
+
+    Parameters:
+    - event: The event to encode.
+
+    Returns:
+    - The encoded event.
+    """
+    attributes = {name: value for name, value in event.dict.items() if isinstance(value, (bool, int, float, str, type(None)))}
+    data = json.dumps(attributes, separators=(",", ":")).encode()
+    return struct.pack("<IH", event.type, len(data)) + data
+
+def get_fingerprint(world) -> dict:
+    """
+    Summarizes the state of a world, so a replay can be checked against its recording.
+
+    Parameters:
+    - world: The world to summarize.
+
+    Returns:
+    - A dict of the player position and health, coins, kills, spawns and live entity counts.
+    """
+    return {
+        "player": [round(world.player.pos.x, 3), round(world.player.pos.y, 3)],
+        "health": world.player.health,
+        "coins": world.player.coins,
+        "kills": world.kills,
+        "spawned": world.wave_director.spawned_total,
+        "enemies": len(world.enemy_container),
+        "projectiles": len(world.friendly_projectiles),
+        "drops": len(world.ground_items)
+    }
+
+class InputRecorder():
+    """
+    Records the input of a game session so it can be replayed deterministically.
+
+    Every frame stores the events, the keyboard state, the number of world ticks
+    and their delta_time. Consecutive frames with no events, the same keyboard
+    state, tick count and delta_time are stored as one run, and a run only stores
+    the keyboard state (one bit per scancode) and delta_time when they changed
+    since the previous run.
+
+    Attributes:
+    - path: The path the recording is written to.
+    - seed: The seed of the random module for the session.
+    - config: The game settings and start parameters the session was created with.
+    - runs: A list of [count, events, keys, ticks, delta_time] runs.
+    - frame_count: The number of frames recorded.
+
+    Methods:
+    - record_frame(events: list, keys, ticks: int, delta_time: float) -> None: Records one frame.
+    - save(world) -> int: Writes the recording and returns its size in bytes.
+    """
+
+    def __init__(self, path: str, seed: int, config: dict) -> None:
+        """
+        Initializes the InputRecorder object.
+
+        Parameters:
+        - path: The path the recording is written to.
+        - seed: The seed of the random module for the session.
+        - config: The game settings and start parameters the session was created with.
+        """
+        self.path = path
+        self.seed = seed
+        self.config = config
+        self.runs = []
+        self.frame_count = 0
+
+    def record_frame(self, events: list, keys, ticks: int, delta_time: float) -> None:
+        """
+        Records one frame, extending the last run when nothing changed.
+
+        Parameters:
+        - events: The frame's events.
+        - keys: The frame's keyboard state.
+        - ticks: The number of world ticks run in the frame.
+        - delta_time: The delta_time of each tick.
+        """
+        keys = encode_keys(keys)
+        events = [encode_event(event) for event in events]
+        self.frame_count += 1
+
+        if self.runs and not events:
+            last = self.runs[-1]
+            if not last[1] and last[2] == keys and last[3] == ticks and last[4] == delta_time:
+                last[0] += 1
+                return
+
+        self.runs.append([1, events, keys, ticks, delta_time])
+
+    def save(self, world) -> int:
+        """
+        Writes the recording, ending it with a fingerprint of the world's final state.
+
+        Parameters:
+        - world: The world the session ended with.
+
+        Returns:
+        - The size of the recording in bytes.
+        """
+        config = json.dumps(self.config).encode()
+        key_count = len(self.runs[0][2]) * 8 if self.runs else 0
+
+        data = bytearray(struct.pack(header_format, magic, version, self.seed, len(config)))
+        data += config
+        data += struct.pack("<HI", key_count, len(self.runs))
+
+        last_keys = None
+        last_delta = None
+        for count, events, keys, ticks, delta_time in self.runs:
+            flags = (keys_changed if keys != last_keys else 0) | (delta_changed if delta_time != last_delta else 0)
+            data += struct.pack(run_format, count, flags, ticks, len(events))
+            if flags & keys_changed:
+                data += keys
+            if flags & delta_changed:
+                data += struct.pack("<d", delta_time)
+            for event in events:
+                data += event
+            last_keys = keys
+            last_delta = delta_time
+
+        fingerprint = json.dumps(get_fingerprint(world)).encode()
+        data += struct.pack("<I", len(fingerprint)) + fingerprint
+
+        with open(self.path, "wb") as file:
+            file.write(data)
+
+        return len(data)
+
+def load(path: str) -> dict:
+    """
+    Reads a recording written by InputRecorder.
+
+    Parameters:
+    - path: The path of the recording.
+
+    Returns:
+    - A dict with the seed, config, frame count, recorded fingerprint and a list of
+      (count, events, keys, ticks, delta_time) runs with decoded events and keys.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    file_magic, file_version, seed, config_length = struct.unpack_from(header_format, data)
+    if file_magic != magic or file_version != version:
+        raise ValueError(f"{path} is not a version {version} recording")
+
+    offset = struct.calcsize(header_format)
+    config = json.loads(data[offset:offset + config_length])
+    offset += config_length
+
+    key_count, run_count = struct.unpack_from("<HI", data, offset)
+    offset += 6
+    key_size = (key_count + 7) // 8
+
+    runs = []
+    keys = None
+    delta_time = None
+    for run in range(run_count):
+        count, flags, ticks, event_count = struct.unpack_from(run_format, data, offset)
+        offset += struct.calcsize(run_format)
+
+        if flags & keys_changed:
+            keys = decode_keys(data[offset:offset + key_size], key_count)
+            offset += key_size
+        if flags & delta_changed:
+            delta_time, = struct.unpack_from("<d", data, offset)
+            offset += 8
+
+        events = []
+        for index in range(event_count):
+            event_type, length = struct.unpack_from("<IH", data, offset)
+            offset += 6
+            events.append(pygame.event.Event(event_type, json.loads(data[offset:offset + length])))
+            offset += length
+
+        runs.append((count, events, keys, ticks, delta_time))
+
+    length, = struct.unpack_from("<I", data, offset)
+    fingerprint = json.loads(data[offset + 4:offset + 4 + length])
+
+    return {"seed": seed, "config": config, "frames": sum(run[0] for run in runs), "fingerprint": fingerprint, "runs": runs}
+
+def start_game(seed: int, config: dict) -> main.Game:
+    """
+    Seeds the random module, applies a recording's settings and creates the game.
+
+    Parameters:
+    - seed: The seed of the random module.
+    - config: The game settings and start parameters of the recording.
+
+    Returns:
+    - The new game.
+    """
+    for name in config_names:
+        setattr(settings, name, config[name])
+
+    random.seed(seed)
+    return main.Game(config["enemy_count"], config["enemy_type"])
+
+def record(path: str, seed: int = None, enemy_count: int = 10, enemy_type: str = "flyer follower") -> None:
+    """
+    Plays the game in a window while recording its input.
+
+    Parameters:
+    - path: The path the recording is written to.
+    - seed: The seed of the random module, or None to pick one.
+    - enemy_count: The number of enemies the world starts with.
+    - enemy_type: The type of enemies the world starts with.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    config = {name: getattr(settings, name) for name in config_names}
+    config["enemy_count"] = enemy_count
+    config["enemy_type"] = enemy_type
+
+    game = start_game(seed, config)
+    game.recorder = InputRecorder(path, seed, config)
+    game.start()
+
+    size = game.recorder.save(game.world)
+    print(f"recorded {game.recorder.frame_count} frames in {len(game.recorder.runs)} runs, {size} bytes, seed {seed}")
+
+def play(path: str, render: bool = False) -> dict:
+    """
+    Replays a recording as fast as possible, feeding the recorded events, keyboard
+    state and ticks to the game instead of polling them.
+
+    Parameters:
+    - path: The path of the recording.
+    - render: Whether to draw the world every frame.
+
+    Returns:
+    - A dict with the game, the loaded recording and the per-frame total, update and draw times in seconds.
+    """
+    recording = load(path)
+    game = start_game(recording["seed"], recording["config"])
+    world = game.world
+
+    total_times = []
+    update_times = []
+    draw_times = []
+
+    for count, events, keys, ticks, delta_time in recording["runs"]:
+        for frame in range(count):
+            start = time.perf_counter()
+
+            pygame.event.pump()
+            settings.events = events
+            settings.keys = keys
+            game.handle_events()
+
+            for tick in range(ticks):
+                if render and tick == ticks - 1:
+                    world.world_camera.capture_previous()
+                settings.delta_time = delta_time
+                world.update()
+            updated = time.perf_counter()
+
+            if render:
+                game.draw()
+                pygame.display.update()
+            drawn = time.perf_counter()
+
+            update_times.append(updated - start)
+            draw_times.append(drawn - updated)
+            total_times.append(drawn - start)
+
+    return {"game": game, "recording": recording, "total": total_times, "update": update_times, "draw": draw_times}
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the replay command line options.
+
+    Returns:
+    - The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Record a Color Survivor session's input, or replay a recording headless as a benchmark.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="play in a window and record the input")
+    record_parser.add_argument("path", help="the recording to write")
+    record_parser.add_argument("--seed", type=int, default=None, help="seed for the random number generators")
+    record_parser.add_argument("--enemies", type=int, default=10, help="number of enemies at startup")
+    record_parser.add_argument("--enemy-type", default="flyer follower", choices=["follower", "flyer follower"], help="type of enemies at startup")
+    record_parser.add_argument("--swarm", action="store_true", help="use the NumPy enemy swarm backend")
+    record_parser.add_argument("--map", default=None, help="path of a Tiled map to load")
+    record_parser.add_argument("--waves", action="store_true", help="spawn enemies over time from settings.wave_curve")
+
+    play_parser = commands.add_parser("play", help="replay a recording headless at maximum speed")
+    play_parser.add_argument("path", help="the recording to replay")
+    play_parser.add_argument("--render", action="store_true", help="draw the world every frame")
+
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    if args.command == "record":
+        settings.enemy_swarm = args.swarm
+        settings.map_path = args.map
+        settings.wave_director = args.waves
+        record(args.path, args.seed, args.enemies, args.enemy_type)
+    else:
+        result = play(args.path, args.render)
+        recording = result["recording"]
+        fingerprint = get_fingerprint(result["game"].world)
+
+        print(f"frames {recording['frames']}  runs {len(recording['runs'])}  seed {recording['seed']}  render {'on' if args.render else 'off'}")
+        print(headless.format_summary("total", headless.summarize(result["total"])))
+        print(headless.format_summary("update", headless.summarize(result["update"])))
+        print(headless.format_summary("draw", headless.summarize(result["draw"])))
+        print(f"fingerprint {'matches' if fingerprint == recording['fingerprint'] else 'differs from'} the recording  {json.dumps(fingerprint)}")
+
+    pygame.quit()
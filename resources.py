@@ -0,0 +1,337 @@
+import hashlib
+import io
+import json
+import os
+import struct
+import threading
+import time
+import pygame
+import settings
+
+cache_header = struct.Struct("<qq20sII")
+
+class AssetManager():
+    """
+    Loads the game's images, sprite sheets, maps and fonts from a manifest.
+
+    Nothing is decoded until it is first asked for. Decoded pixels are written to
+    an on-disk cache, one file per source path, so later launches read the raw RGBA
+    bytes instead of decoding the PNG again. A cache file is current while the
+    source's modification time and size match the ones stored with it; only when
+    they differ is the source hashed and compared with the stored hash. warmup() can decode every
+    image on a background thread while the game starts; the main thread only
+    converts surfaces to display format when they are first used.
+
+    Attributes:
+    - manifest_path: The path of the manifest file.
+    - manifest: The parsed manifest, with "images", "sheets", "maps" and "fonts" sections.
+    - cache_dir: The directory decoded pixel data is cached in, or None to disable the cache.
+    - raw: A dict mapping a file path to its decoded, unconverted surface.
+    - surfaces: A dict mapping a file path to its display-format surface.
+    - fonts: A dict mapping a font name to its loaded font.
+    - lock: The lock guarding decoding and raw between the main and warmup threads.
+    - warmup_thread: The background warmup thread, or None.
+    - cache_hits: The number of images read from the disk cache.
+    - cache_misses: The number of images decoded from their source file.
+    - load_time: The total time spent loading images, in seconds.
+
+    Methods:
+    - get_path(section: str, name: str) -> str: Returns the path of a manifest entry.
+    - get_cache_path(path: str) -> str: Returns the cache file for a source file.
+    - read_cache(path: str, cache_path: str, stat: os.stat_result) -> pygame.Surface: Returns the cached pixels of a source file if they are current.
+    - decode(path: str) -> pygame.Surface: Decodes an image, through the disk cache when possible.
+    - load_raw(path: str) -> pygame.Surface: Returns the decoded surface of an image, decoding it once.
+    - load_surface(path: str) -> pygame.Surface: Returns the display-format surface of an image.
+    - get_image(name: str) -> pygame.Surface: Returns a manifest image.
+    - get_sheet(name: str) -> tuple: Returns a manifest sheet's surface and frame size.
+    - get_map_path(name: str) -> str: Resolves a manifest map name to its path.
+    - get_font(name: str) -> pygame.font.Font: Returns a manifest font.
+    - warmup(background: bool) -> None: Decodes every manifest image ahead of use.
+    - report() -> str: Returns a one-line summary of image loading.
+    """
+
+    def __init__(self, manifest_path: str = None, cache_dir: str = None) -> None:
+        """
+        Initializes the AssetManager object.
+
+        Parameters:
+        - manifest_path: The path of the manifest file, settings.asset_manifest by default.
+        - cache_dir: The directory decoded pixel data is cached in, settings.asset_cache_dir
+          by default. The cache is disabled when settings.asset_cache_dir is None.
+        """
+        if manifest_path is None:
+            manifest_path = settings.asset_manifest
+        if cache_dir is None:
+            cache_dir = settings.asset_cache_dir
+
+        self.manifest_path = manifest_path
+        with open(manifest_path) as file:
+            self.manifest = json.load(file)
+
+        self.cache_dir = cache_dir
+        self.raw = {}
+        self.surfaces = {}
+        self.fonts = {}
+
+        self.lock = threading.Lock()
+        self.warmup_thread = None
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.load_time = 0
+
+    def get_path(self, section: str, name: str) -> str:
+        """
+        Returns the path of a manifest entry.
+
+        Parameters:
+        - section: The manifest section, such as "images" or "sheets".
+        - name: The name of the entry.
+
+        Returns:
+        - The path of the entry's file.
+        """
+        entry = self.manifest[section][name]
+        return entry if isinstance(entry, str) else entry["path"]
+
+    def get_cache_path(self, path: str) -> str:
+        """
+        Returns the cache file for a source file, named after a hash of its path.
+
+        Parameters:
+        - path: The path of the source file.
+
+        Returns:
+        - The path of the cache file.
+        """
+        digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".rgba")
+
+    def read_cache(self, path: str, cache_path: str, stat: os.stat_result) -> pygame.Surface:
+        """
+        Returns the cached pixels of a source file if they are current. The source is
+        only hashed when its modification time or size differ from the stored ones,
+        and the stored ones are updated when the hash still matches.
+
+        Parameters:
+        - path: The path of the source file.
+        - cache_path: The path of its cache file.
+        - stat: The source file's os.stat result.
+
+        Returns:
+        - The decoded surface, or None if there is no current cache file.
+        """
+        if not os.path.exists(cache_path):
+            return None
+
+        with open(cache_path, "rb") as file:
+            data = file.read()
+        mtime, size, digest, width, height = cache_header.unpack_from(data)
+
+        if (mtime, size) != (stat.st_mtime_ns, stat.st_size):
+            with open(path, "rb") as file:
+                if hashlib.sha1(file.read()).digest() != digest:
+                    return None
+            with open(cache_path, "r+b") as file:
+                file.write(cache_header.pack(stat.st_mtime_ns, stat.st_size, digest, width, height))
+
+        return pygame.image.frombuffer(data[cache_header.size:], (width, height), "RGBA")
+
+    def decode(self, path: str) -> pygame.Surface:
+        """
+        Decodes an image, reading the raw pixel cache when it exists and writing it when it does not.
+
+        Parameters:
+        - path: The path of the image.
+
+        Returns:
+        - The decoded surface, not yet converted to display format.
+        """
+        if self.cache_dir is None:
+            self.cache_misses += 1
+            return pygame.image.load(path)
+
+        cache_path = self.get_cache_path(path)
+        stat = os.stat(path)
+
+        surface = self.read_cache(path, cache_path, stat)
+        if surface is not None:
+            self.cache_hits += 1
+            return surface
+
+        with open(path, "rb") as file:
+            source = file.read()
+        surface = pygame.image.load(io.BytesIO(source), path)
+        self.cache_misses += 1
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(cache_header.pack(stat.st_mtime_ns, stat.st_size, hashlib.sha1(source).digest(), *surface.get_size()))
+            file.write(pygame.image.tobytes(surface, "RGBA"))
+        os.replace(temp_path, cache_path)
+
+        return surface
+
+    def load_raw(self, path: str) -> pygame.Surface:
+        """
+        Returns the decoded surface of an image, decoding it only once across threads.
+
+        Parameters:
+        - path: The path of the image.
+
+        Returns:
+        - The decoded surface.
+        """
+        with self.lock:
+            surface = self.raw.get(path)
+            if surface is None:
+                start = time.perf_counter()
+                surface = self.raw[path] = self.decode(path)
+                self.load_time += time.perf_counter() - start
+            return surface
+
+    def load_surface(self, path: str) -> pygame.Surface:
+        """
+        Returns the display-format surface of an image, loading and converting it on first use.
+
+        Parameters:
+        - path: The path of the image.
+
+        Returns:
+        - The converted surface.
+        """
+        surface = self.surfaces.get(path)
+        if surface is None:
+            surface = self.load_raw(path)
+            if pygame.display.get_surface() is not None:
+                start = time.perf_counter()
+                surface = surface.convert_alpha()
+                self.load_time += time.perf_counter() - start
+            self.surfaces[path] = surface
+        return surface
+
+    def get_image(self, name: str) -> pygame.Surface:
+        """
+        Returns a manifest image.
+
+        Parameters:
+        - name: The name of the image in the manifest.
+
+        Returns:
+        - The converted surface.
+        """
+        return self.load_surface(self.get_path("images", name))
+
+    def get_sheet(self, name: str) -> tuple:
+        """
+        Returns a manifest sheet.
+
+        Parameters:
+        - name: The name of the sheet in the manifest.
+
+        Returns:
+        - A tuple of the converted sheet surface, frame width and frame height.
+        """
+        entry = self.manifest["sheets"][name]
+        return self.load_surface(entry["path"]), entry["frame_width"], entry["frame_height"]
+
+    def get_map_path(self, name: str) -> str:
+        """
+        Resolves a manifest map name to its path. Names not in the manifest are treated as paths.
+
+        Parameters:
+        - name: The name or path of the map.
+
+        Returns:
+        - The path of the map file.
+        """
+        entry = self.manifest["maps"].get(name)
+        return entry if entry is not None else name
+
+    def get_font(self, name: str) -> pygame.font.Font:
+        """
+        Returns a manifest font, loading it on first use. Entries with a "path" load
+        a font file, entries with a "name" load a system font.
+
+        Parameters:
+        - name: The name of the font in the manifest.
+
+        Returns:
+        - The font.
+        """
+        font = self.fonts.get(name)
+        if font is None:
+            entry = self.manifest["fonts"][name]
+            if "path" in entry:
+                font = pygame.font.Font(entry["path"], entry["size"])
+            else:
+                font = pygame.font.SysFont(entry["name"], entry["size"])
+            self.fonts[name] = font
+        return font
+
+    def warmup(self, background: bool = True) -> None:
+        """
+        Decodes every manifest image and sheet ahead of use.
+
+        Parameters:
+        - background: Whether to decode on a daemon thread instead of blocking.
+        """
+        paths = [self.get_path("images", name) for name in self.manifest["images"]]
+        paths += [self.get_path("sheets", name) for name in self.manifest["sheets"]]
+
+        def load_all() -> None:
+            for path in paths:
+                self.load_raw(path)
+
+        if background:
+            self.warmup_thread = threading.Thread(target=load_all, name="asset warmup", daemon=True)
+            self.warmup_thread.start()
+        else:
+            load_all()
+
+    def report(self) -> str:
+        """
+        Returns a one-line summary of image loading.
+
+        Returns:
+        - The summary.
+        """
+        return f"assets {len(self.raw)} loaded  cache hits {self.cache_hits}  misses {self.cache_misses}  load {self.load_time * 1000:.1f} ms"
+
+manager = None
+
+def get_manager() -> AssetManager:
+    """
+    Returns the shared AssetManager, creating it on first use and again whenever
+    settings.asset_manifest or settings.asset_cache_dir changed, so overrides of
+    those settings reach it.
+
+    Returns:
+    - The AssetManager.
+    """
+    global manager
+
+    if manager is None or manager.manifest_path != settings.asset_manifest or manager.cache_dir != settings.asset_cache_dir:
+        manager = AssetManager()
+
+    return manager
+
+if __name__ == '__main__':
+    import tempfile
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode([settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label in ("cold", "warm"):
+            timed = AssetManager(settings.asset_manifest, cache_dir)
+            start = time.perf_counter()
+            for name in timed.manifest["images"]:
+                timed.get_image(name)
+            for name in timed.manifest["sheets"]:
+                timed.get_sheet(name)
+            print(f"{label}  {(time.perf_counter() - start) * 1000:7.1f} ms  {timed.report()}")
+
+    pygame.quit()
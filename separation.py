@@ -0,0 +1,103 @@
+import numpy as np
+import settings
+
+neighbour_offsets = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+
+def get_separation(pos: np.ndarray,
+                   radius: float = None,
+                   max_neighbours: int = None
+                   ) -> np.ndarray:
+    """
+    Computes a crowd-separation steering vector for every agent in one batched pass.
+
+    Agents are bucketed into a grid of radius-sized cells by sorting their packed
+    cell keys. For each of the nine cell offsets, searchsorted over the occupied
+    cells finds each cell's neighbour run, and at most max_neighbours agents from
+    it are paired with each agent, so a crowd packed into one cell still costs
+    linear time. The window into a crowded cell starts at the agent's rank in its
+    own cell, so neighbouring agents sample different members of the crowd. Each neighbour
+    closer than radius pushes the agent directly away with a strength falling
+    linearly from 1 at contact to 0 at radius. Agents on exactly the same spot are
+    pushed apart along x by their sorted order, so no randomness is used.
+
+    Parameters:
+    - pos: An (n, 2) float array of agent positions.
+    - radius: The distance within which agents push each other apart, settings.separation_radius by default.
+    - max_neighbours: The most agents paired with an agent from any one cell, settings.separation_neighbours by default.
+
+    Returns:
+    - An (n, 2) float array of summed repulsion vectors, clamped to a length of 1.
+    """
+    if radius is None:
+        radius = settings.separation_radius
+    if max_neighbours is None:
+        max_neighbours = settings.separation_neighbours
+
+    n = len(pos)
+    forces = np.zeros((n, 2))
+    if n < 2:
+        return forces
+
+    cells = np.floor(pos / radius).astype(np.int64)
+    keys = cells[:, 0] * 65536 + cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    sorted_pos = pos[order]
+
+    cell_start = np.flatnonzero(np.diff(sorted_keys, prepend=sorted_keys[0] - 1))
+    cell_count = np.diff(np.append(cell_start, n))
+    cell_keys = sorted_keys[cell_start]
+    agent_cell = np.repeat(np.arange(len(cell_keys)), cell_count)
+
+    index = np.arange(n)
+    rank = index - cell_start[agent_cell]
+
+    agents = []
+    others = []
+    for dx, dy in neighbour_offsets:
+        target = cell_keys + (dx * 65536 + dy)
+        found = np.minimum(np.searchsorted(cell_keys, target), len(cell_keys) - 1)
+        hit = cell_keys[found] == target
+
+        start = np.where(hit, cell_start[found], 0)[agent_cell]
+        size = np.where(hit, cell_count[found], 0)[agent_cell]
+        counts = np.minimum(size, max_neighbours)
+
+        total = counts.sum()
+        if total == 0:
+            continue
+
+        agent = np.repeat(index, counts)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        size = size[agent]
+        slot = rank[agent] % size + np.arange(total) - first
+        slot -= size * (slot >= size)
+
+        agents.append(agent)
+        others.append(start[agent] + slot)
+
+    agent = np.concatenate(agents)
+    other = np.concatenate(others)
+
+    x = sorted_pos[:, 0]
+    y = sorted_pos[:, 1]
+    dx = x[agent] - x[other]
+    dy = y[agent] - y[other]
+    squared = dx * dx + dy * dy
+
+    near = (squared < radius * radius) & (agent != other)
+    agent, other, dx, dy, squared = agent[near], other[near], dx[near], dy[near], squared[near]
+
+    overlap = squared == 0
+    dx[overlap] = np.where(agent[overlap] < other[overlap], -1.0, 1.0)
+    squared[overlap] = 1
+
+    distance = np.sqrt(squared)
+    scale = (1 - distance / radius) / distance
+    forces[order, 0] = np.bincount(agent, weights=dx * scale, minlength=n)
+    forces[order, 1] = np.bincount(agent, weights=dy * scale, minlength=n)
+
+    length = np.hypot(forces[:, 0], forces[:, 1])
+    forces /= np.maximum(length, 1)[:, None]
+
+    return forces
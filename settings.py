@@ -136,8 +136,51 @@ def get_distance(origin_pos, target_pos) -> float:
 color = ColorLibrary()
 
 events = None
+keys = None
 world_reference = None
 
 global_offset = pygame.math.Vector2()
 delta_time = 0
-fps_limit = 120
\ No newline at end of file
+fps_limit = 120
+tick_rate = 120
+max_ticks_per_frame = 5
+interpolation = 1
+spatial_cell_size = 64
+enemy_swarm = False
+swarm_capacity = 1024
+particle_capacity = 16384
+projectile_ttl = 5
+world_bounds_margin = 1000
+map_path = None
+map_chunk_size = 16
+chunk_cache_size = 24
+chunk_stream_margin = 256
+chunk_evict_margin = 1024
+chunk_builds_per_frame = 2
+wall_cell_size = 50
+map_wall_layer = "Walls"
+ground_tile_size = 256
+dirty_rects = False
+dirty_cell_size = 64
+flow_field_radius = 40
+targeting_cell_size = 128
+player_sheet = None
+enemy_sheet = None
+asset_manifest = "assets/manifest.json"
+asset_cache_dir = ".asset_cache"
+asset_warmup = True
+wave_director = False
+wave_curve = [(0, 2), (60, 10), (180, 40), (300, 100)]
+wave_enemy_weights = {"follower": 1, "flyer follower": 1}
+wave_spawns_per_tick = 20
+wave_max_alive = 3000
+wave_spawn_margin = 64
+wave_spawn_spread = 256
+pool_capacities = {"FollowEnemy": 256, "FlyerEnemy": 256, "HealthDrop": 64, "CoinDrop": 256, "Projectile": 128}
+drop_stack_size = 48
+pickup_radius = 48
+render_layers = [("ground", None), ("static", "static"), ("drops", None), ("particles", None), ("actors", "depth"), ("projectiles", None), ("ui", None)]
+rewind_frames = 0
+separation_radius = 32
+separation_neighbours = 32
+separation_strength = 3.0
\ No newline at end of file
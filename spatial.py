@@ -0,0 +1,208 @@
+import pygame
+import numpy as np
+import settings
+
+class SpatialHash():
+    """
+    A uniform grid used as the collision broadphase for the world.
+
+    Sprites are bucketed by the cells their rect overlaps. Each named layer
+    (enemies, walls, drops, ...) keeps its own buckets so passes only query
+    the kind of sprite they care about.
+
+    Attributes:
+    - cell_size: The width and height of a grid cell in pixels.
+    - layers: A dict mapping a layer name to its dict of cell -> list of sprites.
+    - pair_tests: The number of candidate pairs returned by queries so far this frame.
+    - last_pair_tests: The number of candidate pairs returned by queries during the previous frame.
+
+    Methods:
+    - begin_frame() -> None: Resets the per-frame pair test counter.
+    - clear(layer: str) -> None: Removes every sprite from a layer.
+    - insert(layer: str, sprite: pygame.sprite.Sprite) -> None: Adds a sprite to a layer.
+    - remove(layer: str, sprite: pygame.sprite.Sprite) -> None: Removes a static sprite from a layer.
+    - rebuild(layer: str, sprites) -> None: Clears a layer and inserts every sprite given.
+    - rebuild_rects(layer: str, sprites: list, rects: np.ndarray) -> None: Rebuilds a layer from an array of rects in one pass.
+    - query(layer: str, rect: pygame.Rect) -> list: Returns the sprites sharing a cell with rect.
+    - collide(layer: str, rect: pygame.Rect) -> list: Returns the sprites whose rect collides with rect.
+    """
+
+    def __init__(self, cell_size: int = None) -> None:
+        """
+        Initializes the SpatialHash object.
+
+        Parameters:
+        - cell_size: The width and height of a grid cell in pixels, settings.spatial_cell_size by default.
+        """
+        if cell_size is None:
+            cell_size = settings.spatial_cell_size
+
+        self.cell_size = cell_size
+        self.layers = {}
+
+        self.pair_tests = 0
+        self.last_pair_tests = 0
+
+    def begin_frame(self) -> None:
+        """
+        Stores the previous frame's pair test count and resets the counter.
+        """
+        self.last_pair_tests = self.pair_tests
+        self.pair_tests = 0
+
+    def cell_range(self, rect: pygame.Rect) -> tuple:
+        """
+        Calculates the range of cells a rect overlaps.
+
+        Parameters:
+        - rect: The rect to look up.
+
+        Returns:
+        - A tuple of (min_x, min_y, max_x, max_y) cell coordinates, inclusive.
+        """
+        size = self.cell_size
+        return (rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def clear(self, layer: str) -> None:
+        """
+        Removes every sprite from a layer.
+
+        Parameters:
+        - layer: The name of the layer to clear.
+        """
+        self.layers[layer] = {}
+
+    def insert(self, layer: str, sprite: pygame.sprite.Sprite) -> None:
+        """
+        Adds a sprite to every cell its rect overlaps.
+
+        Parameters:
+        - layer: The name of the layer to add the sprite to.
+        - sprite: The sprite to add.
+        """
+        cells = self.layers.setdefault(layer, {})
+        min_x, min_y, max_x, max_y = self.cell_range(sprite.rect)
+
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [sprite]
+                else:
+                    bucket.append(sprite)
+
+    def remove(self, layer: str, sprite: pygame.sprite.Sprite) -> None:
+        """
+        Removes a sprite from every cell its rect overlaps. The rect must not have
+        moved since the sprite was inserted.
+
+        Parameters:
+        - layer: The name of the layer to remove the sprite from.
+        - sprite: The sprite to remove.
+        """
+        cells = self.layers.get(layer)
+        if not cells:
+            return
+
+        min_x, min_y, max_x, max_y = self.cell_range(sprite.rect)
+
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None and sprite in bucket:
+                    bucket.remove(sprite)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def rebuild(self, layer: str, sprites) -> None:
+        """
+        Clears a layer and inserts every sprite given.
+
+        Parameters:
+        - layer: The name of the layer to rebuild.
+        - sprites: An iterable of sprites to insert.
+        """
+        self.clear(layer)
+        for sprite in sprites:
+            self.insert(layer, sprite)
+
+    def rebuild_rects(self, layer: str, sprites: list, rects: np.ndarray) -> None:
+        """
+        Clears a layer and inserts every sprite given, bucketing them from an array
+        of their rects in one vectorized pass instead of reading each sprite's rect.
+        Each bucket keeps the sprites in the order given, like rebuild.
+
+        Parameters:
+        - layer: The name of the layer to rebuild.
+        - sprites: A list of sprites to insert.
+        - rects: An (n, 4) int array of the sprites' (left, top, width, height) rects.
+        """
+        if len(sprites) == 0:
+            self.clear(layer)
+            return
+
+        size = self.cell_size
+        min_x = rects[:, 0] // size
+        min_y = rects[:, 1] // size
+        span_x = (rects[:, 0] + rects[:, 2] - 1) // size - min_x + 1
+        span_y = (rects[:, 1] + rects[:, 3] - 1) // size - min_y + 1
+
+        # One entry per (sprite, cell) pair, sprites that straddle cells repeated.
+        spans = span_x * span_y
+        index = np.repeat(np.arange(len(sprites)), spans)
+        step = np.arange(len(index)) - np.repeat(np.cumsum(spans) - spans, spans)
+        cell_x = min_x[index] + step % span_x[index]
+        cell_y = min_y[index] + step // span_x[index]
+
+        keys = cell_x * 65536 + cell_y
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        starts = np.flatnonzero(np.diff(keys, prepend=keys[0] - 1))
+        ends = np.append(starts[1:], len(keys))
+
+        members = [sprites[i] for i in index[order].tolist()]
+        cell_keys = zip(cell_x[order][starts].tolist(), cell_y[order][starts].tolist())
+        self.layers[layer] = {key: members[start:end] for key, start, end in zip(cell_keys, starts.tolist(), ends.tolist())}
+
+    def query(self, layer: str, rect: pygame.Rect) -> list:
+        """
+        Returns the sprites that share at least one cell with a rect. Every candidate
+        found counts as one tested pair, since the caller goes on to test it.
+
+        Parameters:
+        - layer: The name of the layer to search.
+        - rect: The rect to search around.
+
+        Returns:
+        - A list of unique candidate sprites, in insertion order.
+        """
+        cells = self.layers.get(layer)
+        if not cells:
+            return []
+
+        min_x, min_y, max_x, max_y = self.cell_range(rect)
+        found = {}
+
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    for sprite in bucket:
+                        found[sprite] = None
+
+        self.pair_tests += len(found)
+        return list(found)
+
+    def collide(self, layer: str, rect: pygame.Rect) -> list:
+        """
+        Returns the sprites in a layer whose rect collides with a rect.
+
+        Parameters:
+        - layer: The name of the layer to search.
+        - rect: The rect to test against.
+
+        Returns:
+        - A list of colliding sprites.
+        """
+        candidates = self.query(layer, rect)
+        return [sprite for sprite in candidates if rect.colliderect(sprite.rect)]
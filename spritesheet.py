@@ -0,0 +1,201 @@
+import pygame
+import resources
+
+character_animations = {
+    "idle": (0, 1, 1),
+    "talk": (1, 2, 4),
+    "reload": (2, 5, 10),
+    "run": (3, 4, 10),
+    "shoot": (4, 4, 12),
+    "death": (5, 7, 12)
+}
+
+sheets = {}
+animation_sets = {}
+blanks = {}
+
+class SpriteSheet():
+    """
+    A sprite sheet image, converted to display format once by the asset manager.
+
+    Frames are subsurfaces of the converted sheet, so slicing shares the sheet's
+    pixels instead of copying them.
+
+    Attributes:
+    - name: The name of the sheet in the asset manifest.
+    - image: The converted sheet surface.
+    - frame_width: The width of a frame cell in pixels.
+    - frame_height: The height of a frame cell in pixels.
+
+    Methods:
+    - get_frame(column: int, row: int) -> pygame.Surface: Returns one frame cell.
+    - get_frames(row: int, count: int) -> tuple: Returns the first count frames of a row.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initializes the SpriteSheet object.
+
+        Parameters:
+        - name: The name of the sheet in the asset manifest.
+        """
+        self.name = name
+        self.image, self.frame_width, self.frame_height = resources.get_manager().get_sheet(name)
+
+    def get_frame(self, column: int, row: int) -> pygame.Surface:
+        """
+        Returns one frame cell as a subsurface of the sheet.
+
+        Parameters:
+        - column: The column of the cell.
+        - row: The row of the cell.
+
+        Returns:
+        - The frame surface.
+        """
+        return self.image.subsurface((column * self.frame_width, row * self.frame_height, self.frame_width, self.frame_height))
+
+    def get_frames(self, row: int, count: int) -> tuple:
+        """
+        Returns the first count frames of a row.
+
+        Parameters:
+        - row: The row of the cells.
+        - count: The number of frames.
+
+        Returns:
+        - A tuple of frame surfaces.
+        """
+        return tuple(self.get_frame(column, row) for column in range(count))
+
+def get_sheet(name: str) -> SpriteSheet:
+    """
+    Returns a manifest sheet, slicing it on first use.
+
+    Parameters:
+    - name: The name of the sheet in the asset manifest.
+
+    Returns:
+    - The shared SpriteSheet.
+    """
+    sheet = sheets.get(name)
+    if sheet is None:
+        sheet = sheets[name] = SpriteSheet(name)
+    return sheet
+
+def get_character_animations(color: str, variant: int = 0) -> dict:
+    """
+    Returns the animations of one character on a players sheet, slicing them on
+    first use. Every entity using the same character shares the returned frames.
+
+    Parameters:
+    - color: The sheet color, for example "blue" for "players blue.png".
+    - variant: 0 for the character in the top half of the sheet, 1 for the bottom half.
+
+    Returns:
+    - A dict mapping an animation name to a (frames, flipped frames, fps) tuple.
+    """
+    key = (color, variant)
+    animations = animation_sets.get(key)
+    if animations is not None:
+        return animations
+
+    sheet = get_sheet(f"players {color}")
+    row_offset = variant * (len(character_animations) + 1)
+
+    animations = {}
+    for name, (row, count, fps) in character_animations.items():
+        frames = sheet.get_frames(row + row_offset, count)
+        flipped = tuple(pygame.transform.flip(frame, True, False) for frame in frames)
+        animations[name] = (frames, flipped, fps)
+
+    animation_sets[key] = animations
+    return animations
+
+def get_blank(size: int, colorkey: pygame.Color) -> pygame.Surface:
+    """
+    Returns a shared, fully transparent square surface for entities drawn only by
+    their particles.
+
+    Parameters:
+    - size: The width and height of the surface.
+    - colorkey: The fill color, which is also the color key.
+
+    Returns:
+    - The shared surface.
+    """
+    key = (size, tuple(colorkey))
+    surface = blanks.get(key)
+    if surface is None:
+        surface = blanks[key] = pygame.Surface([size, size])
+        surface.fill(colorkey)
+        surface.set_colorkey(colorkey)
+    return surface
+
+class Animation():
+    """
+    Plays an entity's animations by time, using frames shared between entities.
+
+    Switching or advancing only changes indices and references, so playing an
+    animation never allocates.
+
+    Attributes:
+    - animations: A dict mapping an animation name to a (frames, flipped frames, fps) tuple.
+    - name: The name of the animation playing.
+    - flipped: Whether the horizontally flipped frames are used.
+    - index: The current frame index.
+    - elapsed: The time spent on the current frame in seconds.
+    - image: The current frame surface.
+
+    Methods:
+    - play(name: str, flipped: bool) -> None: Switches animation, restarting it if it changed.
+    - update(delta_time: float) -> None: Advances the frame index by time.
+    """
+
+    def __init__(self, animations: dict, name: str = "idle") -> None:
+        """
+        Initializes the Animation object.
+
+        Parameters:
+        - animations: A dict returned by get_character_animations.
+        - name: The animation to start with.
+        """
+        self.animations = animations
+        self.name = name
+        self.flipped = False
+        self.index = 0
+        self.elapsed = 0
+        self.image = animations[name][0][0]
+
+    def play(self, name: str, flipped: bool = False) -> None:
+        """
+        Switches to an animation, restarting it if it is not already playing.
+
+        Parameters:
+        - name: The animation to play.
+        - flipped: Whether to use the horizontally flipped frames.
+        """
+        if name != self.name:
+            self.name = name
+            self.index = 0
+            self.elapsed = 0
+
+        self.flipped = flipped
+        self.image = self.animations[name][1 if flipped else 0][self.index]
+
+    def update(self, delta_time: float) -> None:
+        """
+        Advances the frame index by time, looping at the end of the animation.
+
+        Parameters:
+        - delta_time: The time since the last update in seconds.
+        """
+        frames, flipped_frames, fps = self.animations[self.name]
+        self.elapsed += delta_time
+
+        frame_time = 1 / fps
+        while self.elapsed >= frame_time:
+            self.elapsed -= frame_time
+            self.index = (self.index + 1) % len(frames)
+
+        self.image = (flipped_frames if self.flipped else frames)[self.index]
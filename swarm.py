@@ -0,0 +1,417 @@
+import pygame
+import numpy as np
+import settings
+import enemy
+import particle
+import separation
+
+class SwarmEnemy():
+    """
+    Mixin that turns an enemy class into a thin view over a slot in an EnemySwarm.
+
+    The swarm owns the enemy's position, velocity, speed and health. The view keeps
+    only what rendering and the collision passes need (image, rect, tag, drop table)
+    and forwards pos, vel, speed and health to the swarm arrays. Because the
+    properties return copies, callers must assign back (e.pos += offset) rather than
+    mutate a component in place (e.pos.x += offset).
+
+    The rect is centred on the swarm position and the animation frame is picked
+    from the swarm arrays whenever they are read, so the swarm never touches the
+    views of enemies nobody looks at. The particle system's emitter id is mirrored
+    into the swarm so the swarm can emit for every enemy in one batch.
+
+    Attributes:
+    - swarm: The EnemySwarm that owns this enemy's state.
+    - index: The slot of this enemy in the swarm arrays, or None once removed.
+    - swarm_type: The integer type code stored in the swarm for this class.
+    - pool_args: None, views need a swarm slot so they are pooled but never preallocated.
+    """
+
+    swarm_type = 0
+    pool_args = None
+
+    def __init__(self, swarm: "EnemySwarm", index: int, x: int, y: int) -> None:
+        """
+        Initializes the SwarmEnemy view.
+
+        Parameters:
+        - swarm: The EnemySwarm that owns this enemy's state.
+        - index: The slot of this enemy in the swarm arrays.
+        - x: The x-coordinate of the enemy's position.
+        - y: The y-coordinate of the enemy's position.
+        """
+        self.swarm = swarm
+        self.index = index
+        self.detached = None
+
+        super().__init__(x, y)
+
+    def reset(self, swarm: "EnemySwarm", index: int, x: int, y: int) -> None:
+        """
+        Attaches a pooled view to a new swarm slot and resets the enemy's state.
+
+        Parameters:
+        - swarm: The EnemySwarm that owns this enemy's state.
+        - index: The slot of this enemy in the swarm arrays.
+        - x: The x-coordinate of the enemy's position.
+        - y: The y-coordinate of the enemy's position.
+        """
+        self.swarm = swarm
+        self.index = index
+        self.detached = None
+
+        super().reset(x, y)
+
+    @property
+    def pos(self) -> pygame.math.Vector2:
+        """
+        The enemy's position, read from the swarm.
+        """
+        if self.index is None:
+            return pygame.math.Vector2(self.detached[0])
+        row = self.swarm.pos[self.index]
+        return pygame.math.Vector2(float(row[0]), float(row[1]))
+
+    @pos.setter
+    def pos(self, value) -> None:
+        """
+        Writes the enemy's position to the swarm.
+        """
+        if self.index is not None:
+            self.swarm.pos[self.index] = (value[0], value[1])
+
+    @property
+    def vel(self) -> pygame.math.Vector2:
+        """
+        The enemy's velocity, read from the swarm.
+        """
+        if self.index is None:
+            return pygame.math.Vector2(self.detached[1])
+        row = self.swarm.vel[self.index]
+        return pygame.math.Vector2(float(row[0]), float(row[1]))
+
+    @vel.setter
+    def vel(self, value) -> None:
+        """
+        Writes the enemy's velocity to the swarm.
+        """
+        if self.index is not None:
+            self.swarm.vel[self.index] = (value[0], value[1])
+
+    @property
+    def speed(self) -> float:
+        """
+        The enemy's speed, read from the swarm.
+        """
+        if self.index is None:
+            return self.detached[2]
+        return float(self.swarm.speed[self.index])
+
+    @speed.setter
+    def speed(self, value: float) -> None:
+        """
+        Writes the enemy's speed to the swarm.
+        """
+        if self.index is not None:
+            self.swarm.speed[self.index] = value
+
+    @property
+    def health(self) -> float:
+        """
+        The enemy's health, read from the swarm.
+        """
+        if self.index is None:
+            return self.detached[3]
+        return float(self.swarm.health[self.index])
+
+    @health.setter
+    def health(self, value: float) -> None:
+        """
+        Writes the enemy's health to the swarm.
+        """
+        if self.index is not None:
+            self.swarm.health[self.index] = value
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """
+        The enemy's rect, centred on its swarm position when it is read.
+        """
+        rect = self._rect
+        if self.index is not None:
+            row = self.swarm.pos[self.index]
+            rect.center = (row[0], row[1])
+        return rect
+
+    @rect.setter
+    def rect(self, value: pygame.Rect) -> None:
+        """
+        Replaces the enemy's rect.
+        """
+        self._rect = value
+
+    @property
+    def image(self) -> pygame.Surface:
+        """
+        The enemy's image. Animated enemies show the run frame for the time the swarm
+        has kept them alive, facing the way they move.
+        """
+        animation = self.animation
+        if animation is None or self.index is None:
+            return self._image
+
+        frames, flipped_frames, fps = animation.animations["run"]
+        frame = int(self.swarm.elapsed[self.index] * fps) % len(frames)
+        return (flipped_frames if self.swarm.vel[self.index, 0] < 0 else frames)[frame]
+
+    @image.setter
+    def image(self, value: pygame.Surface) -> None:
+        """
+        Replaces the image shown when the enemy is not animated.
+        """
+        self._image = value
+
+    @property
+    def particle_system(self) -> particle.EnemyParticleSystem:
+        """
+        The enemy's particle system, or None.
+        """
+        return self._particle_system
+
+    @particle_system.setter
+    def particle_system(self, value: particle.EnemyParticleSystem) -> None:
+        """
+        Replaces the enemy's particle system and mirrors its emitter id into the swarm.
+        """
+        self._particle_system = value
+        if self.index is not None:
+            self.swarm.emitter[self.index] = value.emitter_id if value is not None else 0
+
+    def update(self) -> None:
+        """
+        Does nothing, the swarm integrates every enemy in one pass.
+        """
+
+    def follow_player(self) -> None:
+        """
+        Does nothing, the swarm steers every enemy in one pass.
+        """
+
+    def kill(self) -> None:
+        """
+        Releases the enemy's swarm slot and removes it from every group.
+        """
+        if self.index is not None:
+            self.swarm.remove(self)
+        super().kill()
+
+class SwarmFollowEnemy(SwarmEnemy, enemy.FollowEnemy):
+    """
+    FollowEnemy whose state lives in an EnemySwarm.
+    """
+
+    swarm_type = 0
+
+class SwarmFlyerEnemy(SwarmEnemy, enemy.FlyerEnemy):
+    """
+    FlyerEnemy whose state lives in an EnemySwarm.
+    """
+
+    swarm_type = 1
+
+class EnemySwarm():
+    """
+    A structure-of-arrays store for every enemy in the world.
+
+    Position, velocity, speed, health and type live in contiguous NumPy arrays so
+    steering, integration, particle emission and death checks each run as one pass
+    over the live slots, and rects are computed for every enemy at once by
+    get_rects. Live enemies are always packed into slots [0, count).
+
+    Attributes:
+    - capacity: The number of slots currently allocated.
+    - count: The number of live enemies.
+    - pos: A (capacity, 2) float array of enemy positions.
+    - vel: A (capacity, 2) float array of enemy velocities.
+    - speed: A (capacity,) float array of enemy speeds.
+    - health: A (capacity,) float array of enemy health.
+    - etype: A (capacity,) int array of enemy type codes.
+    - emitter: A (capacity,) int array of particle emitter ids, 0 for enemies without a particle system.
+    - elapsed: A (capacity,) float array of the seconds each enemy has been alive, which drives its animation.
+    - size: A (capacity, 2) int array of enemy rect widths and heights.
+    - views: A list of the SwarmEnemy view for each live slot.
+    - enemy_types: A dict mapping an enemy type string to its SwarmEnemy class.
+
+    Methods:
+    - spawn(x: int, y: int, etype: str) -> SwarmEnemy: Adds an enemy to the swarm.
+    - remove(view: SwarmEnemy) -> None: Frees an enemy's slot.
+    - get_rects() -> np.ndarray: Returns the rect of every live enemy.
+    - update(target: pygame.sprite.Sprite, flow_field) -> None: Steers, integrates and culls every enemy.
+    """
+
+    enemy_types = {
+        "follower": SwarmFollowEnemy,
+        "flyer follower": SwarmFlyerEnemy
+    }
+
+    def __init__(self, capacity: int = None) -> None:
+        """
+        Initializes the EnemySwarm object.
+
+        Parameters:
+        - capacity: The number of slots to preallocate, settings.swarm_capacity by default.
+        """
+        if capacity is None:
+            capacity = settings.swarm_capacity
+
+        self.capacity = capacity
+        self.count = 0
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.health = np.zeros(capacity, dtype=np.float64)
+        self.etype = np.zeros(capacity, dtype=np.int32)
+        self.emitter = np.zeros(capacity, dtype=np.int64)
+        self.elapsed = np.zeros(capacity, dtype=np.float64)
+        self.size = np.zeros((capacity, 2), dtype=np.int64)
+
+        self.views = []
+
+    def grow(self) -> None:
+        """
+        Doubles the capacity of every swarm array.
+        """
+        self.capacity *= 2
+
+        for name in ("pos", "vel", "speed", "health", "etype", "emitter", "elapsed", "size"):
+            old = getattr(self, name)
+            new = np.zeros((self.capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, x: int, y: int, etype: str) -> SwarmEnemy:
+        """
+        Adds an enemy to the swarm.
+
+        Parameters:
+        - x: The x-coordinate of the enemy's position.
+        - y: The y-coordinate of the enemy's position.
+        - etype: The type of enemy to create.
+
+        Returns:
+        - The SwarmEnemy view for the new enemy.
+        """
+        if self.count == self.capacity:
+            self.grow()
+
+        index = self.count
+        self.count += 1
+
+        view_class = self.enemy_types[etype]
+        self.etype[index] = view_class.swarm_type
+        self.emitter[index] = 0
+        self.elapsed[index] = 0
+        self.views.append(None)
+
+        view = settings.world_reference.get_pool(view_class).acquire(self, index, x, y)
+        self.views[index] = view
+        self.size[index] = view._rect.size
+
+        return view
+
+    def remove(self, view: SwarmEnemy) -> None:
+        """
+        Frees an enemy's slot by moving the last live enemy into it.
+
+        The removed view keeps a detached copy of its final state so it can still be
+        read after it has been killed.
+
+        Parameters:
+        - view: The SwarmEnemy view to remove.
+        """
+        index = view.index
+        last = self.count - 1
+
+        view.detached = (tuple(self.pos[index]), tuple(self.vel[index]), float(self.speed[index]), float(self.health[index]))
+        view._rect.center = view.detached[0]
+        view.index = None
+
+        if index != last:
+            self.pos[index] = self.pos[last]
+            self.vel[index] = self.vel[last]
+            self.speed[index] = self.speed[last]
+            self.health[index] = self.health[last]
+            self.etype[index] = self.etype[last]
+            self.emitter[index] = self.emitter[last]
+            self.elapsed[index] = self.elapsed[last]
+            self.size[index] = self.size[last]
+
+            moved = self.views[last]
+            moved.index = index
+            self.views[index] = moved
+
+        self.views.pop()
+        self.count = last
+
+    def get_rects(self) -> np.ndarray:
+        """
+        Returns the rect of every live enemy, centred on its position the way pygame
+        rounds a float center, without reading the views.
+
+        Returns:
+        - A (count, 4) int array of (left, top, width, height) rects, in slot order.
+        """
+        n = self.count
+        pos = self.pos[:n]
+        size = self.size[:n]
+
+        rects = np.empty((n, 4), dtype=np.int64)
+        rects[:, :2] = np.trunc(pos + np.copysign(0.5, pos)).astype(np.int64) - size // 2
+        rects[:, 2:] = size
+        return rects
+
+    def update(self, target: pygame.sprite.Sprite, flow_field=None) -> None:
+        """
+        Steers every enemy toward the target, integrates by delta_time, tops up every
+        particle system in one batch and kills dead enemies. Ground enemies in cells
+        the flow field routes around a wall follow the field instead. Crowd separation
+        is blended into the velocities before they are integrated. Rects and
+        animation frames are not synced here, the views derive them when read.
+
+        Parameters:
+        - target: The sprite every enemy follows.
+        - flow_field: The FlowField ground enemies follow, or None.
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+
+        distance = np.array((target.pos.x, target.pos.y)) - pos
+        normal = np.hypot(distance[:, 0], distance[:, 1])
+        scale = np.divide(self.speed[:n], normal, out=np.zeros(n), where=normal > 0)
+        np.multiply(distance, scale[:, None], out=vel)
+
+        if flow_field is not None:
+            direction, routed = flow_field.get_directions(pos)
+            routed &= self.etype[:n] == SwarmFollowEnemy.swarm_type
+            vel[routed] = direction[routed] * self.speed[:n][routed, None]
+
+        if settings.separation_strength:
+            forces = separation.get_separation(pos, settings.separation_radius, settings.separation_neighbours)
+            vel += forces * (self.speed[:n, None] * settings.separation_strength)
+
+        pos += vel * settings.delta_time
+        self.elapsed[:n] += settings.delta_time
+
+        emitting = np.flatnonzero(self.emitter[:n])
+        if len(emitting):
+            particle.EnemyParticleSystem.update_many(settings.world_reference.particle_engine, self.emitter[emitting], pos[emitting, 0], pos[emitting, 1])
+
+        dead = np.flatnonzero(self.health[:n] <= 0)
+        if len(dead):
+            for view in [self.views[i] for i in dead]:
+                view.die()
@@ -0,0 +1,226 @@
+import heapq
+import math
+import pygame
+import settings
+
+class TargetingService():
+    """
+    A per-frame index of enemies that weapons query for targets.
+
+    The index is built lazily by the first query of a frame, bucketing each enemy
+    by the cell its centre falls in, and every query result is memoized until the
+    next begin_frame, so several weapons asking the same question share one answer.
+
+    Attributes:
+    - cell_size: The width and height of a grid cell in pixels.
+    - enemies: The group of enemies indexed this frame.
+    - cells: A dict mapping a (cell x, cell y) key to a list of (x, y, enemy) entries.
+    - built: Whether the index has been built this frame.
+    - max_half_size: Half the largest enemy width or height, used to widen rect queries.
+    - memo: A dict mapping a query key to its result for this frame.
+    - queries: The number of queries answered so far.
+    - memo_hits: The number of queries answered from the memo.
+
+    Methods:
+    - begin_frame(enemies) -> None: Invalidates the index and memo for a new frame.
+    - build() -> None: Buckets every enemy by cell.
+    - lookup(key: tuple) -> list: Returns a memoized result, building the index if needed.
+    - nearest(x: float, y: float, count: int, max_range: float) -> list: Returns the nearest enemies within range.
+    - overlap_rect(rect: pygame.Rect) -> list: Returns the enemies whose rect collides with rect.
+    - overlap_arc(x: float, y: float, radius: float, angle: float, spread: float) -> list: Returns the enemies inside an arc.
+    """
+
+    def __init__(self, cell_size: int = None) -> None:
+        """
+        Initializes the TargetingService object.
+
+        Parameters:
+        - cell_size: The width and height of a grid cell in pixels, settings.targeting_cell_size by default.
+        """
+        if cell_size is None:
+            cell_size = settings.targeting_cell_size
+
+        self.cell_size = cell_size
+        self.enemies = ()
+        self.cells = {}
+        self.built = False
+        self.max_half_size = 0
+
+        self.memo = {}
+        self.queries = 0
+        self.memo_hits = 0
+
+    def begin_frame(self, enemies) -> None:
+        """
+        Invalidates the index and memo for a new frame.
+
+        Parameters:
+        - enemies: The enemies to index on the next query.
+        """
+        self.enemies = enemies
+        self.built = False
+        self.memo = {}
+
+    def build(self) -> None:
+        """
+        Buckets every enemy by the cell its centre falls in.
+        """
+        size = self.cell_size
+        cells = {}
+        max_half_size = 0
+
+        for e in self.enemies:
+            x, y = e.rect.center
+            cells.setdefault((x // size, y // size), []).append((x, y, e))
+            max_half_size = max(max_half_size, e.rect.width, e.rect.height)
+
+        self.cells = cells
+        self.max_half_size = (max_half_size + 1) // 2
+        self.built = True
+
+    def lookup(self, key: tuple):
+        """
+        Returns the memoized result of a query, building the index if needed.
+
+        Parameters:
+        - key: The query key.
+
+        Returns:
+        - The memoized result, or None if the query has not been answered this frame.
+        """
+        self.queries += 1
+
+        if not self.built:
+            self.build()
+
+        result = self.memo.get(key)
+        if result is not None:
+            self.memo_hits += 1
+
+        return result
+
+    def nearest(self, x: float, y: float, count: int, max_range: float) -> list:
+        """
+        Returns up to count enemies closer than max_range, nearest first.
+
+        Cells are searched in rings around the query point, stopping once the next
+        ring cannot hold anything nearer than the current count-th best.
+
+        Parameters:
+        - x: The x-coordinate of the query point.
+        - y: The y-coordinate of the query point.
+        - count: The number of enemies wanted.
+        - max_range: Enemies at or beyond this distance are ignored.
+
+        Returns:
+        - A list of enemies, nearest first.
+        """
+        key = ("nearest", x, y, count, max_range)
+        result = self.lookup(key)
+        if result is not None:
+            return result
+
+        size = self.cell_size
+        cells = self.cells
+        cx = int(x // size)
+        cy = int(y // size)
+        range_squared = max_range * max_range
+
+        found = []
+        for ring in range(int(math.ceil(max_range / size)) + 1):
+            if len(found) >= count:
+                worst = heapq.nsmallest(count, found)[-1][0]
+                reach = (ring - 1) * size
+                if reach * reach > worst:
+                    break
+
+            if ring == 0:
+                ring_cells = [(cx, cy)]
+            else:
+                ring_cells = [(cx + dx, cy - ring) for dx in range(-ring, ring + 1)]
+                ring_cells += [(cx + dx, cy + ring) for dx in range(-ring, ring + 1)]
+                ring_cells += [(cx - ring, cy + dy) for dy in range(-ring + 1, ring)]
+                ring_cells += [(cx + ring, cy + dy) for dy in range(-ring + 1, ring)]
+
+            for cell in ring_cells:
+                entries = cells.get(cell)
+                if entries is None:
+                    continue
+
+                for ex, ey, e in entries:
+                    distance = (ex - x) ** 2 + (ey - y) ** 2
+                    if distance < range_squared:
+                        found.append((distance, len(found), e))
+
+        result = [e for distance, order, e in heapq.nsmallest(count, found)]
+        self.memo[key] = result
+        return result
+
+    def overlap_rect(self, rect: pygame.Rect) -> list:
+        """
+        Returns the enemies whose rect collides with rect.
+
+        Parameters:
+        - rect: The rect to test.
+
+        Returns:
+        - A list of enemies.
+        """
+        key = ("rect", rect.x, rect.y, rect.width, rect.height)
+        result = self.lookup(key)
+        if result is not None:
+            return result
+
+        size = self.cell_size
+        cells = self.cells
+        search = rect.inflate(self.max_half_size * 2, self.max_half_size * 2)
+
+        result = []
+        for cx in range(search.left // size, (search.right - 1) // size + 1):
+            for cy in range(search.top // size, (search.bottom - 1) // size + 1):
+                for ex, ey, e in cells.get((cx, cy), ()):
+                    if rect.colliderect(e.rect):
+                        result.append(e)
+
+        self.memo[key] = result
+        return result
+
+    def overlap_arc(self, x: float, y: float, radius: float, angle: float, spread: float) -> list:
+        """
+        Returns the enemies whose centre lies inside an arc.
+
+        Parameters:
+        - x: The x-coordinate of the arc's centre.
+        - y: The y-coordinate of the arc's centre.
+        - radius: The radius of the arc in pixels.
+        - angle: The direction the arc faces, in degrees clockwise from east.
+        - spread: The full width of the arc in degrees.
+
+        Returns:
+        - A list of enemies.
+        """
+        key = ("arc", x, y, radius, angle, spread)
+        result = self.lookup(key)
+        if result is not None:
+            return result
+
+        size = self.cell_size
+        cells = self.cells
+        radius_squared = radius * radius
+        half_spread = spread / 2
+
+        result = []
+        for cx in range(int((x - radius) // size), int((x + radius) // size) + 1):
+            for cy in range(int((y - radius) // size), int((y + radius) // size) + 1):
+                for ex, ey, e in cells.get((cx, cy), ()):
+                    dx = ex - x
+                    dy = ey - y
+                    if dx * dx + dy * dy > radius_squared:
+                        continue
+
+                    offset = (math.degrees(math.atan2(dy, dx)) - angle + 180) % 360 - 180
+                    if abs(offset) <= half_spread:
+                        result.append(e)
+
+        self.memo[key] = result
+        return result
@@ -0,0 +1,35 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+os.chdir(root)
+
+import random
+import pytest
+import settings
+import main
+
+@pytest.fixture
+def make_game(monkeypatch):
+    """
+    Returns a function that creates a seeded game with no starting enemies, no
+    waves and an unarmed player. Settings changed by the test are restored after it.
+    """
+    monkeypatch.setattr(settings, "asset_warmup", False)
+    monkeypatch.setattr(settings, "wave_director", False)
+    monkeypatch.setattr(settings, "map_path", None)
+    monkeypatch.setattr(settings, "delta_time", 1 / settings.tick_rate)
+
+    def make(swarm: bool = False, seed: int = 0) -> main.Game:
+        settings.enemy_swarm = swarm
+        random.seed(seed)
+        game = main.Game(0)
+        game.world.player.weapons.clear()
+        return game
+
+    monkeypatch.setattr(settings, "enemy_swarm", settings.enemy_swarm)
+    return make
@@ -0,0 +1,11 @@
+import batch
+import settings
+
+def test_settings_overrides_reach_world_defaults():
+    params = {"enemies": 40, "enemy_type": "follower", "settings.particle_capacity": 64}
+    capped = batch.run_session(params, seed=0, ticks=30, delta_time=1 / settings.tick_rate)
+    default = batch.run_session({"enemies": 40, "enemy_type": "follower"}, seed=0, ticks=30, delta_time=1 / settings.tick_rate)
+
+    assert capped["peaks"]["particles"] <= 64
+    assert default["peaks"]["particles"] > 64
+    assert settings.particle_capacity != 64
@@ -0,0 +1,49 @@
+import pygame
+import settings
+import wall
+
+def test_sprites_register_with_their_layer(make_game):
+    world = make_game().world
+    e = world.spawn_enemy(world.player.pos.x + 100, world.player.pos.y, "follower")
+    actors = world.world_camera.layers["actors"]
+
+    assert e in actors
+    assert world.player in actors
+    assert all(w in world.world_camera.layers["static"] for w in world.wall_container)
+
+    e.kill()
+    assert e not in actors
+
+def test_static_chunks_survive_scrolling(make_game):
+    world = make_game().world
+    camera = world.world_camera
+    static = camera.layers["static"]
+
+    camera.camera_draw(world.player)
+    chunks = static.get_chunks()
+    assert chunks
+
+    world.player.rect.move_ip(37, 11)
+    camera.camera_draw(world.player)
+    assert static.get_chunks() is chunks
+
+    w = wall.Wall(4, 4, 1, 1)
+    static.add(w)
+    assert static.get_chunks() is not chunks
+
+def test_static_chunks_draw_like_sprites(make_game):
+    world = make_game().world
+    camera = world.world_camera
+    static = camera.layers["static"]
+    surface = camera.display_surface
+
+    view_rect = pygame.Rect(-13, -29, surface.get_width(), surface.get_height())
+    surface.fill(settings.color.black)
+    surface.blits(list(camera.get_visible(view_rect).values()))
+    chunked = pygame.image.tobytes(surface, "RGB")
+
+    surface.fill(settings.color.black)
+    for layer in camera.layers.values():
+        for sprite in layer.get_draw_order():
+            surface.blit(sprite.image, sprite.rect.move(-view_rect.x, -view_rect.y))
+    assert static and pygame.image.tobytes(surface, "RGB") == chunked
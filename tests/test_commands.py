@@ -0,0 +1,64 @@
+import pygame
+import commands
+
+class Recorder(pygame.sprite.Group):
+    def __init__(self, log: list, name: str) -> None:
+        self.log = log
+        self.name = name
+        pygame.sprite.Group.__init__(self)
+
+    def add(self, *sprites) -> None:
+        self.log.append(("add", self.name, len(sprites)))
+        pygame.sprite.Group.add(self, *sprites)
+
+    def remove(self, *sprites) -> None:
+        self.log.append(("remove", self.name, len(sprites)))
+        pygame.sprite.Group.remove(self, *sprites)
+
+def test_commands_wait_for_the_flush():
+    buffer = commands.CommandBuffer()
+    group = pygame.sprite.Group()
+    sprite = pygame.sprite.Sprite()
+
+    buffer.add(sprite, group)
+    assert sprite not in group
+
+    buffer.flush()
+    assert sprite in group
+    assert buffer.commands == []
+
+def test_flush_applies_commands_in_order_and_batches_runs():
+    log = []
+    a = Recorder(log, "a")
+    b = Recorder(log, "b")
+    log.clear()
+    buffer = commands.CommandBuffer()
+    sprites = [pygame.sprite.Sprite() for i in range(3)]
+
+    for sprite in sprites:
+        buffer.add(sprite, a)
+    buffer.move(sprites[0], a, b)
+    buffer.remove(sprites[1], a)
+    buffer.add(sprites[1], a)
+    buffer.flush()
+
+    assert log == [("add", "a", 3), ("remove", "a", 1), ("add", "b", 1), ("remove", "a", 1), ("add", "a", 1)]
+    assert set(a) == {sprites[1], sprites[2]}
+    assert set(b) == {sprites[0]}
+
+def test_kill_is_applied_once_after_earlier_adds():
+    buffer = commands.CommandBuffer()
+    group = pygame.sprite.Group()
+    sprite = pygame.sprite.Sprite()
+    kills = []
+    sprite.kill = lambda: (kills.append(sprite), pygame.sprite.Sprite.kill(sprite))
+
+    buffer.add(sprite, group)
+    buffer.kill(sprite)
+    buffer.kill(sprite)
+    assert buffer.is_killed(sprite)
+
+    buffer.flush()
+    assert kills == [sprite]
+    assert not sprite.alive()
+    assert not buffer.is_killed(sprite)
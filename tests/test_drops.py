@@ -0,0 +1,41 @@
+import drops
+import settings
+
+def test_coins_merge_across_a_cell_border(make_game):
+    world = make_game().world
+    size = settings.drop_stack_size
+    x = 20 * size
+    y = 20 * size + size / 2
+
+    first = world.spawn_drop(drops.CoinDrop, x - 0.5, y)
+    second = world.spawn_drop(drops.CoinDrop, x + 0.5, y)
+    world.commands.flush()
+
+    assert second is first
+    assert first.value == 2
+    assert len(world.ground_items) == 1
+
+def test_far_coins_keep_their_own_stacks(make_game):
+    world = make_game().world
+    size = settings.drop_stack_size
+    x = 20 * size
+
+    first = world.spawn_drop(drops.CoinDrop, x - size + 1, x)
+    second = world.spawn_drop(drops.CoinDrop, x + size - 1, x)
+    world.commands.flush()
+
+    assert second is not first
+    assert len(world.ground_items) == 2
+
+def test_neighbouring_coins_add_their_value_to_the_stack(make_game):
+    world = make_game().world
+    size = settings.drop_stack_size
+    x = 20 * size + size / 2
+
+    stack = world.spawn_drop(drops.CoinDrop, x, x)
+    for i in range(4):
+        world.spawn_drop(drops.CoinDrop, x + i, x + size - 1)
+    world.commands.flush()
+
+    assert stack.value == 5
+    assert sum(d.value for d in world.ground_items) == 5
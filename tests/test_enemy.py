@@ -0,0 +1,66 @@
+import pytest
+import settings
+
+def run_enemy(game, ticks: int):
+    world = game.world
+    start = world.player.pos + (300, 200)
+    e = world.spawn_enemy(start.x, start.y, "follower")
+    world.commands.flush()
+
+    for tick in range(ticks):
+        world.update()
+
+    return start, e
+
+def test_backends_integrate_enemies_once_per_tick(make_game):
+    ticks = 60
+    start, classic = run_enemy(make_game(swarm=False), ticks)
+    swarm_start, swarm = run_enemy(make_game(swarm=True), ticks)
+
+    assert start == swarm_start
+    assert classic.pos.distance_to(start) == pytest.approx(classic.speed * settings.delta_time * ticks)
+    assert classic.pos.distance_to(swarm.pos) < 1e-6
+
+def test_swarm_rects_match_views(make_game):
+    world = make_game(swarm=True).world
+    for i in range(50):
+        world.spawn_enemy(world.player.pos.x + i * 7.5 - 150, world.player.pos.y + i * 3.25 - 80, "follower" if i % 2 else "flyer follower")
+    world.commands.flush()
+
+    for tick in range(10):
+        world.update()
+
+    enemies = world.enemy_swarm
+    assert [tuple(rect) for rect in enemies.get_rects().tolist()] == [tuple(view.rect) for view in enemies.views]
+
+def test_enemy_dies_once(make_game):
+    world = make_game(swarm=False).world
+    engine = world.particle_engine
+    e = world.spawn_enemy(world.player.pos.x + 300, world.player.pos.y + 200, "follower")
+    world.commands.flush()
+    emitter_id = e.particle_system.emitter_id
+
+    e.health = 0
+    e.die()
+    world.update()
+
+    assert world.kills == 1
+    assert len(world.enemy_container) == 0
+    assert len(world.ground_items) == 1
+    assert engine.free_emitters.count(emitter_id) == 1
+    assert emitter_id not in engine.active_emitters
+
+@pytest.mark.parametrize("swarm", [False, True])
+def test_separation_radius_setting_applies(make_game, monkeypatch, swarm):
+    gaps = []
+    for radius in (1, 64):
+        monkeypatch.setattr(settings, "separation_radius", radius)
+        world = make_game(swarm=swarm).world
+        start = world.player.pos + (300, 200)
+        a = world.spawn_enemy(start.x, start.y, "follower")
+        b = world.spawn_enemy(start.x + 10, start.y, "follower")
+        world.commands.flush()
+        world.update()
+        gaps.append(b.pos.x - a.pos.x)
+
+    assert gaps[1] > gaps[0] + 1
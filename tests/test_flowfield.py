@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+import flowfield
+import wall
+
+def make_field(radius: int = 6) -> flowfield.FlowField:
+    grid = wall.WallGrid(50)
+    grid.add_tiles([(2, y) for y in range(-2, 3)], 50)
+    field = flowfield.FlowField(grid, radius)
+    field.update(25, 25)
+    return field
+
+def distance_at(field: flowfield.FlowField, cx: int, cy: int) -> float:
+    return field.distance[cx - field.origin[0], cy - field.origin[1]]
+
+def test_bfs_routes_around_walls():
+    field = make_field()
+
+    assert distance_at(field, 0, 0) == 0
+    assert distance_at(field, 1, 0) == 1
+    assert distance_at(field, 2, 0) == np.inf
+    assert distance_at(field, 4, 0) == 10
+
+def test_direction_leads_around_the_wall():
+    field = make_field()
+
+    dx, dy = field.get_direction(4 * 50 + 25, 25)
+    assert dx < 0 and dy != 0
+    assert dx * dx + dy * dy == pytest.approx(1)
+
+    assert field.get_direction(25, 3 * 50 + 25) is None
+    assert field.get_direction(40 * 50, 25) is None
+
+def test_get_directions_matches_get_direction():
+    field = make_field()
+    rng = np.random.default_rng(0)
+    pos = rng.uniform(-400, 400, (300, 2))
+
+    directions, routed = field.get_directions(pos)
+
+    for (x, y), direction, follow in zip(pos, directions, routed):
+        expected = field.get_direction(x, y)
+        assert follow == (expected is not None)
+        if follow:
+            assert tuple(direction) == pytest.approx(expected)
+
+def test_update_only_rebuilds_on_a_new_cell():
+    field = make_field()
+
+    field.update(30, 40)
+    assert field.recomputes == 1
+
+    field.update(75, 25)
+    assert field.recomputes == 2
+    assert distance_at(field, 1, 0) == 0
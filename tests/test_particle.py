@@ -0,0 +1,29 @@
+import types
+import settings
+import particle
+
+def test_release_twice_hands_out_different_ids():
+    engine = particle.ParticleEngine(64)
+    emitter_id = engine.register()
+
+    engine.release(emitter_id)
+    engine.release(emitter_id)
+
+    first = engine.register()
+    second = engine.register()
+    assert first != second
+    assert engine.free_emitters == []
+
+def test_emitters_share_a_full_buffer(monkeypatch):
+    engine = particle.ParticleEngine(200)
+    monkeypatch.setattr(settings, "world_reference", types.SimpleNamespace(particle_engine=engine))
+    systems = [particle.EnemyParticleSystem(0, 0) for i in range(10)]
+
+    for tick in range(60):
+        for system in systems:
+            system.update(0, 0)
+        engine.update()
+
+    assert engine.get_emitter_budget() == 20
+    assert engine.live_count <= engine.capacity
+    assert all(0 < system.get_particle_count() <= 20 for system in systems)
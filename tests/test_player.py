@@ -0,0 +1,15 @@
+import drops
+
+def test_coins_are_collected_once(make_game):
+    world = make_game(swarm=False).world
+    player = world.player
+    coin = drops.CoinDrop(player.pos.x, player.pos.y)
+    player.inventory.add(coin)
+
+    player.get_coins()
+    assert player.get_coins() == 1
+    assert coin.alive()
+
+    world.commands.flush()
+    assert not coin.alive()
+    assert player.get_coins() == 1
@@ -0,0 +1,70 @@
+import pygame
+import pool
+import enemy
+import projectile
+
+class Dummy(pool.Poolable, pygame.sprite.Sprite):
+    pool_args = (0,)
+
+    def __init__(self, value: int) -> None:
+        pygame.sprite.Sprite.__init__(self)
+        self.reset(value)
+
+    def reset(self, value: int) -> None:
+        self.value = value
+
+def test_acquire_reuses_released_entities():
+    entities = pool.EntityPool(Dummy)
+    group = pygame.sprite.Group()
+
+    first = entities.acquire(1)
+    group.add(first)
+    first.kill()
+    second = entities.acquire(2)
+
+    assert second is first
+    assert second.value == 2
+    assert (entities.hits, entities.misses) == (1, 1)
+
+def test_preallocated_entities_are_handed_out_first():
+    entities = pool.EntityPool(Dummy)
+    entities.preallocate(3, *Dummy.pool_args)
+    placeholders = list(entities.free)
+
+    acquired = [entities.acquire(i) for i in range(4)]
+
+    assert entities.preallocated == 3
+    assert set(acquired[:3]) == set(placeholders)
+    assert acquired[3] not in placeholders
+    assert (entities.hits, entities.misses) == (3, 1)
+
+def test_kill_releases_only_live_entities():
+    entities = pool.EntityPool(Dummy)
+    group = pygame.sprite.Group()
+    entity = entities.acquire(1)
+
+    entity.kill()
+    assert entities.free == []
+
+    group.add(entity)
+    entity.kill()
+    entity.kill()
+    assert entities.free == [entity]
+
+def test_unpooled_entities_are_not_released():
+    entity = Dummy(1)
+    group = pygame.sprite.Group(entity)
+
+    entity.kill()
+
+    assert not entity.alive()
+    assert entity.pool is None
+
+def test_world_preallocates_only_the_active_enemy_backend(make_game):
+    sprite_world = make_game(swarm=False).world
+    assert sprite_world.pools[enemy.FollowEnemy].preallocated > 0
+
+    swarm_world = make_game(swarm=True).world
+    assert enemy.FollowEnemy not in swarm_world.pools
+    assert enemy.FlyerEnemy not in swarm_world.pools
+    assert swarm_world.pools[projectile.Projectile].preallocated > 0
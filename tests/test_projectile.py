@@ -0,0 +1,46 @@
+import math
+import pygame
+import pytest
+import settings
+
+def fire(world, speed: float, max_range: float):
+    x, y = world.player.pos
+    p = world.projectile_pool.acquire(x, y, x + 1000, y, 5, speed, 1, pygame.Color(255, 255, 255), max_range)
+    world.commands.add(p, world.world_camera.get_layer(p), world.friendly_projectiles)
+    world.commands.flush()
+    return p
+
+def test_projectile_moves_speed_times_dt_per_tick(make_game):
+    world = make_game().world
+    p = fire(world, 150, 10000)
+    start = p.pos.x
+
+    for tick in range(1, 11):
+        world.update()
+        assert p.pos.x - start == pytest.approx(150 * settings.delta_time * tick)
+        assert p.travelled == pytest.approx(150 * settings.delta_time * tick)
+
+def test_projectile_expires_at_max_range(make_game):
+    world = make_game().world
+    p = fire(world, 150, 50)
+    ticks = math.ceil(50 / (150 * settings.delta_time))
+
+    for tick in range(ticks - 1):
+        world.update()
+    assert p.alive()
+
+    world.update()
+    assert not p.alive()
+
+def test_projectile_expires_at_ttl(make_game, monkeypatch):
+    monkeypatch.setattr(settings, "projectile_ttl", 0.26)
+    world = make_game().world
+    p = fire(world, 150, 10000)
+    ticks = math.ceil(0.26 / settings.delta_time)
+
+    for tick in range(ticks - 1):
+        world.update()
+    assert p.alive()
+
+    world.update()
+    assert not p.alive()
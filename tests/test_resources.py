@@ -0,0 +1,50 @@
+import hashlib
+import os
+import shutil
+import pygame
+import resources
+import settings
+
+def test_manager_follows_asset_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(resources, "manager", None)
+    first = resources.get_manager()
+    assert resources.get_manager() is first
+
+    monkeypatch.setattr(settings, "asset_cache_dir", str(tmp_path))
+    second = resources.get_manager()
+    assert second is not first
+    assert second.cache_dir == str(tmp_path)
+
+def test_cache_is_checked_by_mtime_and_size(monkeypatch, tmp_path):
+    image = tmp_path / "image.png"
+    shutil.copy("assets/drops/coin.png", image)
+    source = image.read_bytes()
+    cache_dir = str(tmp_path / "cache")
+
+    cold = resources.AssetManager(cache_dir=cache_dir)
+    expected = pygame.image.tobytes(cold.decode(str(image)), "RGBA")
+    assert cold.cache_misses == 1
+
+    hashed = []
+    sha1 = hashlib.sha1
+    monkeypatch.setattr(resources.hashlib, "sha1", lambda data=b"": hashed.append(data) or sha1(data))
+
+    warm = resources.AssetManager(cache_dir=cache_dir)
+    assert pygame.image.tobytes(warm.decode(str(image)), "RGBA") == expected
+    assert warm.cache_hits == 1
+    assert source not in hashed
+
+    os.utime(image, ns=(0, 10 ** 18))
+    touched = resources.AssetManager(cache_dir=cache_dir)
+    touched.decode(str(image))
+    assert touched.cache_hits == 1
+    assert hashed.count(source) == 1
+
+    touched.decode(str(image))
+    assert hashed.count(source) == 1
+
+    shutil.copy("assets/drops/health.png", image)
+    changed = resources.AssetManager(cache_dir=cache_dir)
+    surface = changed.decode(str(image))
+    assert changed.cache_misses == 1
+    assert pygame.image.tobytes(surface, "RGBA") == pygame.image.tobytes(pygame.image.load("assets/drops/health.png"), "RGBA")
@@ -0,0 +1,90 @@
+import pytest
+import drops
+import settings
+import snapshot
+import weapon
+
+def make_busy_world(make_game, swarm: bool):
+    world = make_game(swarm=swarm).world
+    gun = weapon.RangeMultishot()
+    gun.cooldown = gun.max_cooldown = 7
+    world.player.weapons.append(gun)
+    world.create_enemies(60, "follower")
+    world.create_enemies(60, "flyer follower")
+    world.commands.flush()
+    for tick in range(90):
+        world.update()
+    return world
+
+@pytest.mark.parametrize("swarm", [False, True])
+def test_capture_restore_round_trip(make_game, swarm):
+    world = make_busy_world(make_game, swarm)
+    data = snapshot.capture(world)
+    assert world.friendly_projectiles and world.ground_items and world.enemy_container
+
+    for tick in range(30):
+        world.update()
+    snapshot.restore(world, data)
+
+    assert snapshot.capture(world) == data
+
+@pytest.mark.parametrize("swarm", [False, True])
+def test_restored_world_replays_the_same_ticks(make_game, swarm):
+    world = make_busy_world(make_game, swarm)
+    data = snapshot.capture(world)
+
+    for tick in range(30):
+        world.update()
+    expected = snapshot.capture(world)
+
+    snapshot.restore(world, data)
+    for tick in range(30):
+        world.update()
+
+    assert snapshot.capture(world) == expected
+
+def test_restore_rejects_other_data(make_game):
+    world = make_game().world
+
+    with pytest.raises(ValueError):
+        snapshot.restore(world, b"XXXX" + snapshot.capture(world)[4:])
+
+def test_rewind_buffer_keeps_the_newest_snapshots():
+    buffer = snapshot.RewindBuffer(3)
+    assert buffer.get() is None
+
+    for tick in range(5):
+        buffer.push(bytes([tick]))
+
+    assert len(buffer) == 3
+    assert buffer.get() == bytes([4])
+    assert buffer.get(10) == bytes([2])
+    assert buffer.get_size() == 3
+
+    assert buffer.rewind(1) == bytes([3])
+    assert len(buffer) == 2
+    buffer.push(bytes([9]))
+    assert [buffer.get(back) for back in range(3)] == [bytes([9]), bytes([3]), bytes([2])]
+
+def test_restore_keeps_stacks_that_share_a_cell(make_game):
+    world = make_game().world
+    x = 20 * settings.drop_stack_size
+    for value, offset in ((3, 1), (4, 40)):
+        d = world.get_pool(drops.CoinDrop).acquire(x + offset, x + 1)
+        d.value = value
+        world.place_drop(d)
+    world.commands.flush()
+
+    snapshot.restore(world, snapshot.capture(world))
+
+    assert sorted(d.value for d in world.ground_items) == [3, 4]
+
+def test_rewinding_needs_the_swarm_backend(make_game, monkeypatch):
+    monkeypatch.setattr(settings, "rewind_frames", 8)
+
+    with pytest.raises(ValueError):
+        make_game(swarm=False)
+
+    world = make_game(swarm=True).world
+    world.update()
+    assert len(world.rewind_buffer) == 1
@@ -0,0 +1,65 @@
+import pygame
+import numpy as np
+import drops
+import spatial
+
+class Box(pygame.sprite.Sprite):
+    def __init__(self, x: int, y: int, width: int = 10, height: int = 10) -> None:
+        pygame.sprite.Sprite.__init__(self)
+        self.rect = pygame.Rect(x, y, width, height)
+
+def test_query_returns_sprites_in_overlapping_cells_once():
+    grid = spatial.SpatialHash(32)
+    wide = Box(20, 20, 40, 10)
+    near = Box(40, 0)
+    far = Box(200, 200)
+    for sprite in (wide, near, far):
+        grid.insert("boxes", sprite)
+
+    found = grid.query("boxes", pygame.Rect(33, 5, 4, 4))
+
+    assert found == [wide, near]
+    assert grid.query("missing", pygame.Rect(0, 0, 10, 10)) == []
+
+def test_collide_filters_candidates_and_counts_pairs():
+    grid = spatial.SpatialHash(64)
+    hit = Box(10, 10)
+    miss = Box(50, 50)
+    grid.rebuild("boxes", [hit, miss])
+
+    assert grid.collide("boxes", pygame.Rect(0, 0, 15, 15)) == [hit]
+    assert grid.pair_tests == 2
+
+    grid.begin_frame()
+    assert grid.last_pair_tests == 2
+    assert grid.pair_tests == 0
+
+def test_remove_drops_empty_cells():
+    grid = spatial.SpatialHash(32)
+    box = Box(30, 30)
+    grid.insert("boxes", box)
+    grid.remove("boxes", box)
+
+    assert grid.layers["boxes"] == {}
+
+def test_rebuild_rects_matches_rebuild():
+    rng = np.random.default_rng(0)
+    boxes = [Box(int(x), int(y), int(w), int(h)) for x, y, w, h in zip(rng.integers(-300, 300, 200), rng.integers(-300, 300, 200), rng.integers(1, 90, 200), rng.integers(1, 90, 200))]
+    rects = np.array([tuple(box.rect) for box in boxes])
+
+    expected = spatial.SpatialHash(48)
+    expected.rebuild("boxes", boxes)
+    actual = spatial.SpatialHash(48)
+    actual.rebuild_rects("boxes", boxes, rects)
+
+    assert actual.layers["boxes"] == expected.layers["boxes"]
+
+def test_drop_pass_counts_pair_tests(make_game):
+    world = make_game().world
+    world.spawn_drop(drops.HealthDrop, world.player.pos.x + 10, world.player.pos.y)
+    world.spawn_drop(drops.HealthDrop, world.player.pos.x + 5000, world.player.pos.y)
+    world.commands.flush()
+
+    world.update()
+
+    assert world.spatial_hash.pair_tests == 1
@@ -0,0 +1,71 @@
+import math
+import random
+import pygame
+import targeting
+
+class Target(pygame.sprite.Sprite):
+    def __init__(self, x: int, y: int) -> None:
+        pygame.sprite.Sprite.__init__(self)
+        self.rect = pygame.Rect(0, 0, 12, 12)
+        self.rect.center = (x, y)
+
+class CountingCells(dict):
+    gets = 0
+
+    def get(self, key, default=None):
+        self.gets += 1
+        return dict.get(self, key, default)
+
+def make_service(count: int = 400, seed: int = 0) -> targeting.TargetingService:
+    rng = random.Random(seed)
+    service = targeting.TargetingService(64)
+    service.begin_frame([Target(rng.randint(-1000, 1000), rng.randint(-1000, 1000)) for i in range(count)])
+    return service
+
+def brute_nearest(enemies, x: float, y: float, count: int, max_range: float) -> list:
+    found = [(math.dist(e.rect.center, (x, y)), e) for e in enemies]
+    found = [entry for entry in found if entry[0] < max_range]
+    return [e for distance, e in sorted(found, key=lambda entry: entry[0])[:count]]
+
+def test_nearest_matches_brute_force():
+    service = make_service()
+
+    for x, y, count, max_range in ((0, 0, 1, 5000), (300, -200, 5, 400), (-900, 900, 3, 150), (0, 0, 10, 1)):
+        expected = brute_nearest(service.enemies, x, y, count, max_range)
+        actual = service.nearest(x, y, count, max_range)
+        assert [math.dist(e.rect.center, (x, y)) for e in actual] == [math.dist(e.rect.center, (x, y)) for e in expected]
+
+def test_nearest_stops_at_the_ring_cutoff():
+    service = make_service(2000)
+    service.build()
+    service.cells = CountingCells(service.cells)
+
+    result = service.nearest(0, 0, 1, 5000)
+
+    assert result == brute_nearest(service.enemies, 0, 0, 1, 5000)
+    assert service.cells.gets < 50
+
+def test_queries_are_memoized_until_the_next_frame():
+    service = make_service()
+    rect = pygame.Rect(-100, -100, 200, 200)
+
+    first = service.overlap_rect(rect)
+    assert service.overlap_rect(pygame.Rect(rect)) is first
+    assert service.memo_hits == 1
+    assert set(first) == {e for e in service.enemies if rect.colliderect(e.rect)}
+
+    service.begin_frame(service.enemies[:10])
+    assert set(service.overlap_rect(rect)) == {e for e in service.enemies if rect.colliderect(e.rect)}
+    assert service.memo_hits == 1
+
+def test_overlap_arc_matches_brute_force():
+    service = make_service()
+
+    result = service.overlap_arc(0, 0, 500, 90, 60)
+
+    expected = []
+    for e in service.enemies:
+        dx, dy = e.rect.centerx, e.rect.centery
+        if dx * dx + dy * dy <= 500 * 500 and abs((math.degrees(math.atan2(dy, dx)) - 90 + 180) % 360 - 180) <= 30:
+            expected.append(e)
+    assert set(result) == set(expected) and expected
@@ -0,0 +1,28 @@
+import os
+import pytest
+import tilemap
+
+def write_map(tmp_path, tileset_source: str) -> str:
+    path = tmp_path / "map.tmx"
+    path.write_text(f"""<?xml version="1.0" encoding="UTF-8"?>
+<map orientation="orthogonal" width="3" height="2" tilewidth="64" tileheight="64">
+ <tileset firstgid="1" source="{tileset_source}"/>
+ <layer name="Walls" width="3" height="2">
+  <data encoding="csv">
+1,0,0,
+0,0,2
+</data>
+ </layer>
+</map>
+""")
+    return str(path)
+
+def test_external_tileset_is_loaded(tmp_path):
+    tile_map = tilemap.TiledMap(write_map(tmp_path, os.path.abspath("assets/tiled/tileset.tsx")))
+
+    assert tile_map.tilesets[0].image_path == os.path.abspath("assets/tilesheets/tileset.png")
+    assert sorted(tile_map.iter_layer_tiles("Walls")) == [(0, 0, 1), (2, 1, 2)]
+
+def test_missing_external_tileset_names_the_tsx(tmp_path):
+    with pytest.raises(ValueError, match="missing.tsx"):
+        tilemap.TiledMap(write_map(tmp_path, "missing.tsx"))
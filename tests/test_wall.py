@@ -0,0 +1,36 @@
+import pygame
+import numpy as np
+import wall
+
+def test_merge_tiles_covers_every_tile_once():
+    tiles = {(x, y) for x in range(4) for y in range(3)} | {(6, 0), (7, 0), (6, 1)}
+
+    merged = wall.merge_tiles(tiles)
+
+    assert (0, 0, 4, 3) in merged
+    covered = [(tx + i, ty + j) for tx, ty, width, height in merged for i in range(width) for j in range(height)]
+    assert sorted(covered) == sorted(tiles)
+    assert len(merged) == 3
+
+def test_resolve_pushes_out_along_the_shallow_axis():
+    grid = wall.WallGrid(50)
+    grid.add_rect(pygame.Rect(100, 100, 50, 50))
+
+    assert grid.resolve(pygame.Rect(90, 110, 20, 20)) == (-10, 0, True, False)
+    assert grid.resolve(pygame.Rect(110, 140, 20, 20)) == (0, 10, False, True)
+    assert grid.resolve(pygame.Rect(0, 0, 20, 20)) == (0, 0, False, False)
+
+def test_resolve_clears_adjoining_walls():
+    grid = wall.WallGrid(50)
+    grid.add_tiles([(2, 2), (3, 2)], 50)
+
+    dx, dy, blocked_x, blocked_y = grid.resolve(pygame.Rect(140, 90, 20, 20))
+    assert (dx, dy) == (0, -10) and blocked_y
+    assert not grid.is_rect_blocked(pygame.Rect(140 + dx, 90 + dy, 20, 20))
+
+def test_get_touching_matches_blocked_cells():
+    grid = wall.WallGrid(50)
+    grid.add_rect(pygame.Rect(100, 100, 50, 50))
+    rects = np.array([(0, 0, 20, 20), (90, 90, 20, 20), (140, 140, 80, 80), (160, 0, 10, 10)])
+
+    assert grid.get_touching(rects).tolist() == [False, True, True, False]
@@ -0,0 +1,489 @@
+import pygame
+import os
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+import settings
+import resources
+
+FLIPPED_HORIZONTALLY = 0x80000000
+FLIPPED_VERTICALLY = 0x40000000
+GID_MASK = 0x1FFFFFFF
+
+class Tileset():
+    """
+    A Tiled tileset (.tsx or embedded) whose image is loaded on first use.
+
+    Attributes:
+    - firstgid: The global id of the first tile in the tileset.
+    - tile_width: The width of a tile in pixels.
+    - tile_height: The height of a tile in pixels.
+    - columns: The number of tile columns in the tileset image.
+    - tile_count: The number of tiles in the tileset.
+    - image_path: The path to the tileset image.
+    - image: The loaded tileset image, or None until a tile is first requested.
+    - tiles: A dict caching tile surfaces by global id, including flip flags.
+
+    Methods:
+    - get_tile(gid: int) -> pygame.Surface: Returns the image of a tile.
+    """
+
+    def __init__(self, firstgid: int, element: ElementTree.Element, base_dir: str) -> None:
+        """
+        Initializes the Tileset object.
+
+        Parameters:
+        - firstgid: The global id of the first tile in the tileset.
+        - element: The <tileset> element holding the tileset data.
+        - base_dir: The directory relative paths in the element are resolved from.
+        """
+        self.firstgid = firstgid
+        self.tile_width = int(element.get("tilewidth"))
+        self.tile_height = int(element.get("tileheight"))
+        self.columns = int(element.get("columns"))
+        self.tile_count = int(element.get("tilecount"))
+
+        image = element.find("image")
+        self.image_path = os.path.normpath(os.path.join(base_dir, image.get("source")))
+        self.image = None
+
+        self.tiles = {}
+
+    def get_tile(self, gid: int) -> pygame.Surface:
+        """
+        Returns the image of a tile, applying its flip flags.
+
+        Parameters:
+        - gid: The global id of the tile, including flip flags.
+
+        Returns:
+        - The tile surface.
+        """
+        tile = self.tiles.get(gid)
+        if tile is not None:
+            return tile
+
+        if self.image is None:
+            self.image = resources.get_manager().load_surface(self.image_path)
+
+        local_id = (gid & GID_MASK) - self.firstgid
+        x = (local_id % self.columns) * self.tile_width
+        y = (local_id // self.columns) * self.tile_height
+        tile = self.image.subsurface((x, y, self.tile_width, self.tile_height))
+
+        if gid & (FLIPPED_HORIZONTALLY | FLIPPED_VERTICALLY):
+            tile = pygame.transform.flip(tile, bool(gid & FLIPPED_HORIZONTALLY), bool(gid & FLIPPED_VERTICALLY))
+
+        self.tiles[gid] = tile
+        return tile
+
+class TileChunk():
+    """
+    The metadata for one chunk of a Tiled map. Tile data is kept as raw CSV text
+    and only parsed when the chunk is built.
+
+    Attributes:
+    - x: The x-coordinate of the chunk's top left tile.
+    - y: The y-coordinate of the chunk's top left tile.
+    - width: The width of the chunk in tiles.
+    - height: The height of the chunk in tiles.
+    - layers: A dict mapping a layer index to the chunk's CSV text or gid list for that layer.
+    """
+
+    def __init__(self, x: int, y: int, width: int, height: int) -> None:
+        """
+        Initializes the TileChunk object.
+
+        Parameters:
+        - x: The x-coordinate of the chunk's top left tile.
+        - y: The y-coordinate of the chunk's top left tile.
+        - width: The width of the chunk in tiles.
+        - height: The height of the chunk in tiles.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.layers = {}
+
+class TiledMap():
+    """
+    An orthogonal Tiled map (.tmx) split into chunks.
+
+    Loading only reads chunk positions and keeps their CSV data as text. Tiles are
+    parsed and tileset images loaded when a chunk is built.
+
+    Attributes:
+    - path: The path of the map file.
+    - tile_width: The width of a map tile in pixels.
+    - tile_height: The height of a map tile in pixels.
+    - chunk_width: The width of a chunk in tiles.
+    - chunk_height: The height of a chunk in tiles.
+    - tilesets: A list of Tileset objects sorted by firstgid.
+    - layer_names: A list of the names of the visible tile layers, in draw order.
+    - chunks: A dict mapping a (chunk x, chunk y) key to its TileChunk.
+    - bounds: A pygame.Rect covering every chunk in pixels.
+
+    Methods:
+    - get_tile_image(gid: int) -> pygame.Surface: Returns the image of a tile.
+    - get_chunk_gids(chunk: TileChunk, layer: int) -> list: Returns a chunk's tile ids for a layer.
+    - get_chunk_rect(key: tuple) -> pygame.Rect: Returns a chunk's area in pixels.
+    - build_chunk_surface(key: tuple) -> pygame.Surface: Renders every layer of a chunk.
+    - iter_layer_tiles(layer_name: str): Yields the position and id of every tile in a layer.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initializes the TiledMap object.
+
+        Parameters:
+        - path: The path of the map file.
+        """
+        self.path = path
+        base_dir = os.path.dirname(path)
+
+        root = ElementTree.parse(path).getroot()
+        if root.get("orientation") != "orthogonal":
+            raise ValueError(f"{path}: only orthogonal maps are supported")
+
+        self.tile_width = int(root.get("tilewidth"))
+        self.tile_height = int(root.get("tileheight"))
+        self.chunk_width = settings.map_chunk_size
+        self.chunk_height = settings.map_chunk_size
+
+        self.tilesets = []
+        for element in root.findall("tileset"):
+            firstgid = int(element.get("firstgid"))
+            source = element.get("source")
+            if source is not None:
+                tileset_path = os.path.join(base_dir, source)
+                if not os.path.exists(tileset_path):
+                    raise ValueError(f"{path}: external tileset {tileset_path} does not exist")
+                self.tilesets.append(Tileset(firstgid, ElementTree.parse(tileset_path).getroot(), os.path.dirname(tileset_path)))
+            else:
+                self.tilesets.append(Tileset(firstgid, element, base_dir))
+        self.tilesets.sort(key=lambda tileset: tileset.firstgid)
+
+        self.layer_names = []
+        self.chunks = {}
+
+        for element in root.findall("layer"):
+            if element.get("visible") == "0":
+                continue
+
+            data = element.find("data")
+            if data.get("encoding") != "csv":
+                raise ValueError(f"{path}: layer {element.get('name')} must use CSV encoding")
+
+            layer = len(self.layer_names)
+            self.layer_names.append(element.get("name"))
+
+            chunk_elements = data.findall("chunk")
+            if chunk_elements:
+                for chunk_element in chunk_elements:
+                    self.add_chunk_data(layer, chunk_element)
+            else:
+                self.split_layer_data(layer, int(element.get("width")), int(element.get("height")), data.text)
+
+        self.bounds = self.get_bounds()
+
+    def add_chunk_data(self, layer: int, element: ElementTree.Element) -> None:
+        """
+        Stores the CSV text of an infinite map chunk for a layer.
+
+        Parameters:
+        - layer: The index of the layer the chunk belongs to.
+        - element: The <chunk> element.
+        """
+        x = int(element.get("x"))
+        y = int(element.get("y"))
+        width = int(element.get("width"))
+        height = int(element.get("height"))
+
+        if not self.chunks:
+            self.chunk_width = width
+            self.chunk_height = height
+
+        key = (x // self.chunk_width, y // self.chunk_height)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = TileChunk(x, y, width, height)
+
+        chunk.layers[layer] = element.text
+
+    def split_layer_data(self, layer: int, width: int, height: int, text: str) -> None:
+        """
+        Splits the tile data of a finite layer into chunks.
+
+        Parameters:
+        - layer: The index of the layer.
+        - width: The width of the layer in tiles.
+        - height: The height of the layer in tiles.
+        - text: The layer's CSV text.
+        """
+        gids = [int(value) for value in text.split(",")]
+
+        for chunk_y in range(0, height, self.chunk_height):
+            for chunk_x in range(0, width, self.chunk_width):
+                chunk_width = min(self.chunk_width, width - chunk_x)
+                chunk_height = min(self.chunk_height, height - chunk_y)
+
+                rows = [gids[(chunk_y + row) * width + chunk_x:(chunk_y + row) * width + chunk_x + chunk_width] for row in range(chunk_height)]
+                if not any(any(row) for row in rows):
+                    continue
+
+                key = (chunk_x // self.chunk_width, chunk_y // self.chunk_height)
+                chunk = self.chunks.get(key)
+                if chunk is None:
+                    chunk = self.chunks[key] = TileChunk(chunk_x, chunk_y, chunk_width, chunk_height)
+
+                chunk.layers[layer] = [gid for row in rows for gid in row]
+
+    def get_bounds(self) -> pygame.Rect:
+        """
+        Calculates the area covered by every chunk.
+
+        Returns:
+        - A pygame.Rect in pixels, empty if the map has no chunks.
+        """
+        rects = [self.get_chunk_rect(key) for key in self.chunks]
+        if not rects:
+            return pygame.Rect(0, 0, 0, 0)
+
+        return rects[0].unionall(rects[1:])
+
+    def get_tile_image(self, gid: int) -> pygame.Surface:
+        """
+        Returns the image of a tile.
+
+        Parameters:
+        - gid: The global id of the tile, including flip flags.
+
+        Returns:
+        - The tile surface.
+        """
+        tile_id = gid & GID_MASK
+        for tileset in reversed(self.tilesets):
+            if tile_id >= tileset.firstgid:
+                return tileset.get_tile(gid)
+
+        raise ValueError(f"{self.path}: no tileset holds tile {tile_id}")
+
+    def get_chunk_gids(self, chunk: TileChunk, layer: int) -> list:
+        """
+        Returns a chunk's tile ids for a layer, parsing its CSV text.
+
+        Parameters:
+        - chunk: The chunk to read.
+        - layer: The index of the layer.
+
+        Returns:
+        - A row-major list of global tile ids, empty if the chunk has no data for the layer.
+        """
+        data = chunk.layers.get(layer)
+        if data is None:
+            return []
+        if isinstance(data, list):
+            return data
+
+        return [int(value) for value in data.split(",")]
+
+    def get_chunk_rect(self, key: tuple) -> pygame.Rect:
+        """
+        Returns the area of a chunk in pixels.
+
+        Parameters:
+        - key: The (chunk x, chunk y) key of the chunk.
+
+        Returns:
+        - The chunk's pygame.Rect.
+        """
+        chunk_pixel_width = self.chunk_width * self.tile_width
+        chunk_pixel_height = self.chunk_height * self.tile_height
+
+        return pygame.Rect(key[0] * chunk_pixel_width, key[1] * chunk_pixel_height, chunk_pixel_width, chunk_pixel_height)
+
+    def build_chunk_surface(self, key: tuple) -> pygame.Surface:
+        """
+        Renders every layer of a chunk onto one surface.
+
+        Parameters:
+        - key: The (chunk x, chunk y) key of the chunk.
+
+        Returns:
+        - The chunk surface.
+        """
+        chunk = self.chunks[key]
+        rect = self.get_chunk_rect(key)
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA).convert_alpha()
+
+        origin_x = (chunk.x - key[0] * self.chunk_width) * self.tile_width
+        origin_y = (chunk.y - key[1] * self.chunk_height) * self.tile_height
+
+        for layer in range(len(self.layer_names)):
+            tiles = []
+            for index, gid in enumerate(self.get_chunk_gids(chunk, layer)):
+                if gid == 0:
+                    continue
+
+                image = self.get_tile_image(gid)
+                x = origin_x + (index % chunk.width) * self.tile_width
+                y = origin_y + (index // chunk.width + 1) * self.tile_height - image.get_height()
+                tiles.append((image, (x, y)))
+
+            surface.blits(tiles, False)
+
+        return surface
+
+    def iter_layer_tiles(self, layer_name: str):
+        """
+        Yields the position and id of every non-empty tile in a layer.
+
+        Parameters:
+        - layer_name: The name of the layer.
+
+        Yields:
+        - Tuples of (tile x, tile y, gid).
+        """
+        if layer_name not in self.layer_names:
+            return
+
+        layer = self.layer_names.index(layer_name)
+        for chunk in self.chunks.values():
+            for index, gid in enumerate(self.get_chunk_gids(chunk, layer)):
+                if gid != 0:
+                    yield chunk.x + index % chunk.width, chunk.y + index // chunk.width, gid
+
+class ChunkStreamer():
+    """
+    Builds chunk surfaces of a TiledMap as the camera nears them and keeps them in
+    a bounded least-recently-used cache.
+
+    Attributes:
+    - tile_map: The TiledMap being streamed.
+    - capacity: The maximum number of chunk surfaces kept in the cache.
+    - stream_margin: How far outside the view, in pixels, chunks are built ahead of time.
+    - evict_margin: How far outside the view, in pixels, chunks are kept before being dropped.
+    - builds_per_frame: How many off-screen chunks may be built ahead of time per frame.
+    - cache: An OrderedDict mapping a chunk key to its surface, least recently used first.
+    - built_count: The number of chunk surfaces built so far.
+    - evicted_count: The number of chunk surfaces dropped so far.
+
+    Methods:
+    - update(view_rect: pygame.Rect) -> None: Builds nearby chunks and evicts far ones.
+    - draw(surface: pygame.Surface, view_rect: pygame.Rect) -> None: Draws the visible chunks.
+    """
+
+    def __init__(self,
+                 tile_map: TiledMap,
+                 capacity: int = None,
+                 stream_margin: int = None,
+                 evict_margin: int = None,
+                 builds_per_frame: int = None
+                 ) -> None:
+        """
+        Initializes the ChunkStreamer object.
+
+        Parameters:
+        - tile_map: The TiledMap to stream.
+        - capacity: The maximum number of chunk surfaces kept in the cache.
+        - stream_margin: How far outside the view, in pixels, chunks are built ahead of time.
+        - evict_margin: How far outside the view, in pixels, chunks are kept before being dropped.
+        - builds_per_frame: How many off-screen chunks may be built ahead of time per frame.
+
+        Any of these left as None is read from the matching chunk_ setting.
+        """
+        self.tile_map = tile_map
+        self.capacity = settings.chunk_cache_size if capacity is None else capacity
+        self.stream_margin = settings.chunk_stream_margin if stream_margin is None else stream_margin
+        self.evict_margin = settings.chunk_evict_margin if evict_margin is None else evict_margin
+        self.builds_per_frame = settings.chunk_builds_per_frame if builds_per_frame is None else builds_per_frame
+
+        self.cache = OrderedDict()
+        self.built_count = 0
+        self.evicted_count = 0
+
+    def get_keys(self, rect: pygame.Rect) -> list:
+        """
+        Returns the keys of the map chunks that intersect a rect.
+
+        Parameters:
+        - rect: The area to look up, in pixels.
+
+        Returns:
+        - A list of chunk keys present in the map.
+        """
+        chunk_pixel_width = self.tile_map.chunk_width * self.tile_map.tile_width
+        chunk_pixel_height = self.tile_map.chunk_height * self.tile_map.tile_height
+        chunks = self.tile_map.chunks
+
+        keys = []
+        for key_y in range(rect.top // chunk_pixel_height, (rect.bottom - 1) // chunk_pixel_height + 1):
+            for key_x in range(rect.left // chunk_pixel_width, (rect.right - 1) // chunk_pixel_width + 1):
+                if (key_x, key_y) in chunks:
+                    keys.append((key_x, key_y))
+
+        return keys
+
+    def build(self, key: tuple) -> None:
+        """
+        Builds a chunk surface and adds it to the cache.
+
+        Parameters:
+        - key: The key of the chunk to build.
+        """
+        self.cache[key] = self.tile_map.build_chunk_surface(key)
+        self.built_count += 1
+
+    def update(self, view_rect: pygame.Rect) -> None:
+        """
+        Builds visible chunks immediately and nearby ones within the per-frame budget,
+        then drops chunks that are far away or beyond the cache capacity.
+
+        Parameters:
+        - view_rect: The world-space area visible on screen.
+        """
+        cache = self.cache
+        visible = self.get_keys(view_rect)
+        nearby = self.get_keys(view_rect.inflate(self.stream_margin * 2, self.stream_margin * 2))
+
+        for key in visible:
+            if key not in cache:
+                self.build(key)
+
+        budget = self.builds_per_frame
+        for key in nearby:
+            if key not in cache and budget > 0:
+                self.build(key)
+                budget -= 1
+
+        for key in nearby:
+            if key in cache:
+                cache.move_to_end(key)
+        for key in visible:
+            cache.move_to_end(key)
+
+        keep_rect = view_rect.inflate(self.evict_margin * 2, self.evict_margin * 2)
+        for key in [key for key in cache if not keep_rect.colliderect(self.tile_map.get_chunk_rect(key))]:
+            del cache[key]
+            self.evicted_count += 1
+
+        while len(cache) > max(self.capacity, len(visible)):
+            cache.popitem(last=False)
+            self.evicted_count += 1
+
+    def draw(self, surface: pygame.Surface, view_rect: pygame.Rect) -> None:
+        """
+        Draws the cached chunks that intersect the view.
+
+        Parameters:
+        - surface: The surface to draw to.
+        - view_rect: The world-space area visible on screen.
+        """
+        blits = []
+        for key in self.get_keys(view_rect):
+            chunk_surface = self.cache.get(key)
+            if chunk_surface is not None:
+                rect = self.tile_map.get_chunk_rect(key)
+                blits.append((chunk_surface, (rect.x - view_rect.x, rect.y - view_rect.y)))
+
+        surface.blits(blits, False)
@@ -1,7 +1,10 @@
 import pygame
+import numpy as np
 import settings
 
 class Wall(pygame.sprite.Sprite):
+    render_layer = "static"
+
     def __init__(self, x: int, y: int, width: int, height: int) -> None:
         """
         Initialize a Wall object.
@@ -22,3 +25,238 @@ class Wall(pygame.sprite.Sprite):
         self.image.fill(settings.color.white)
         self.rect = self.image.get_rect()
         self.rect.topleft = self.pos
+
+
+class WallGrid():
+    """
+    A static occupancy grid of every wall in the world.
+
+    Walls are compiled once at load. Wall tiles are merged into maximal rectangles,
+    and every rectangle is registered in each grid cell it covers, so a query only
+    looks at the few cells an entity overlaps no matter how many walls exist. The
+    grid is also meant for AI and spawning code that needs to know which cells are
+    blocked.
+
+    Attributes:
+        cell_size (int): The width and height of a grid cell in pixels.
+        rects (list): The merged wall rectangles in pixels.
+        cells (dict): A dict mapping a (cell x, cell y) key to the indices of the rects covering it.
+        keys (np.ndarray): The sorted packed keys of the blocked cells, or None until get_touching builds them.
+    """
+
+    def __init__(self, cell_size: int) -> None:
+        """
+        Initialize a WallGrid object.
+
+        Args:
+            cell_size (int): The width and height of a grid cell in pixels.
+        """
+        self.cell_size = cell_size
+        self.rects = []
+        self.cells = {}
+        self.keys = None
+
+    def cell_range(self, rect: pygame.Rect) -> tuple:
+        """
+        Calculate the range of cells a rect overlaps.
+
+        Args:
+            rect (pygame.Rect): The rect to look up.
+
+        Returns:
+            tuple: The (min x, min y, max x, max y) cell coordinates, inclusive.
+        """
+        size = self.cell_size
+        return (rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def get_cell(self, x: float, y: float) -> tuple:
+        """
+        Get the cell containing a world position.
+
+        Args:
+            x (float): The x-coordinate in pixels.
+            y (float): The y-coordinate in pixels.
+
+        Returns:
+            tuple: The (cell x, cell y) key.
+        """
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def add_rect(self, rect: pygame.Rect) -> None:
+        """
+        Add a wall rectangle to every cell it covers.
+
+        Args:
+            rect (pygame.Rect): The wall rectangle in pixels.
+        """
+        index = len(self.rects)
+        self.rects.append(pygame.Rect(rect))
+        self.keys = None
+
+        min_x, min_y, max_x, max_y = self.cell_range(rect)
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                self.cells.setdefault((cx, cy), []).append(index)
+
+    def add_tiles(self, tiles, tile_size: int) -> None:
+        """
+        Merge wall tiles into maximal rectangles and add them to the grid.
+
+        Args:
+            tiles: An iterable of (tile x, tile y) positions.
+            tile_size (int): The width and height of a tile in pixels.
+        """
+        for tx, ty, width, height in merge_tiles(tiles):
+            self.add_rect(pygame.Rect(tx * tile_size, ty * tile_size, width * tile_size, height * tile_size))
+
+    def is_blocked(self, cx: int, cy: int) -> bool:
+        """
+        Check whether any wall covers a cell.
+
+        Args:
+            cx (int): The x-coordinate of the cell.
+            cy (int): The y-coordinate of the cell.
+
+        Returns:
+            bool: True if the cell holds a wall.
+        """
+        return (cx, cy) in self.cells
+
+    def query(self, rect: pygame.Rect) -> list:
+        """
+        Get the wall rectangles that collide with a rect.
+
+        Args:
+            rect (pygame.Rect): The rect to test.
+
+        Returns:
+            list: The colliding wall rectangles.
+        """
+        cells = self.cells
+        found = {}
+
+        min_x, min_y, max_x, max_y = self.cell_range(rect)
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                indices = cells.get((cx, cy))
+                if indices is not None:
+                    for index in indices:
+                        found[index] = None
+
+        return [self.rects[index] for index in found if rect.colliderect(self.rects[index])]
+
+    def is_rect_blocked(self, rect: pygame.Rect) -> bool:
+        """
+        Check whether a rect collides with any wall.
+
+        Args:
+            rect (pygame.Rect): The rect to test.
+
+        Returns:
+            bool: True if the rect overlaps a wall.
+        """
+        return len(self.query(rect)) > 0
+
+    def get_touching(self, rects: np.ndarray) -> np.ndarray:
+        """
+        Find which of many rects overlap a blocked cell, as a broadphase for
+        resolve: a rect that touches no blocked cell cannot collide with a wall.
+
+        Args:
+            rects (np.ndarray): An (n, 4) int array of (left, top, width, height) rects.
+
+        Returns:
+            np.ndarray: A bool array, True for the rects that overlap a blocked cell.
+        """
+        touching = np.zeros(len(rects), dtype=bool)
+        if not self.cells or len(rects) == 0:
+            return touching
+
+        if self.keys is None:
+            self.keys = np.array(sorted(cx * 65536 + cy for cx, cy in self.cells), dtype=np.int64)
+
+        size = self.cell_size
+        min_x = rects[:, 0] // size
+        min_y = rects[:, 1] // size
+        max_x = (rects[:, 0] + rects[:, 2] - 1) // size
+        max_y = (rects[:, 1] + rects[:, 3] - 1) // size
+
+        # Clamping to the last cell visits every cell of the widest rect's span.
+        for dx in range(int((max_x - min_x).max()) + 1):
+            for dy in range(int((max_y - min_y).max()) + 1):
+                keys = np.minimum(min_x + dx, max_x) * 65536 + np.minimum(min_y + dy, max_y)
+                touching |= np.isin(keys, self.keys)
+
+        return touching
+
+    def resolve(self, rect: pygame.Rect) -> tuple:
+        """
+        Calculate how far a rect must move to stop overlapping every wall. Each
+        overlap is pushed out along the axis with the smallest penetration.
+
+        Args:
+            rect (pygame.Rect): The rect to resolve.
+
+        Returns:
+            tuple: The (dx, dy) push and whether the x and y axes were blocked.
+        """
+        moved = pygame.Rect(rect)
+        blocked_x = False
+        blocked_y = False
+
+        for wall in self.query(moved):
+            if not moved.colliderect(wall):
+                continue
+
+            push_left = wall.left - moved.right
+            push_right = wall.right - moved.left
+            push_up = wall.top - moved.bottom
+            push_down = wall.bottom - moved.top
+
+            push_x = push_left if -push_left < push_right else push_right
+            push_y = push_up if -push_up < push_down else push_down
+
+            if abs(push_x) < abs(push_y):
+                moved.x += push_x
+                blocked_x = True
+            else:
+                moved.y += push_y
+                blocked_y = True
+
+        return moved.x - rect.x, moved.y - rect.y, blocked_x, blocked_y
+
+
+def merge_tiles(tiles) -> list:
+    """
+    Merge tiles into maximal rectangles, scanning rows top to bottom. Each
+    rectangle grows right as far as it can, then down while the full row below is
+    free and unclaimed.
+
+    Args:
+        tiles: An iterable of (tile x, tile y) positions.
+
+    Returns:
+        list: (tile x, tile y, width, height) tuples covering every tile exactly once.
+    """
+    remaining = set(tiles)
+    merged = []
+
+    for tx, ty in sorted(remaining, key=lambda tile: (tile[1], tile[0])):
+        if (tx, ty) not in remaining:
+            continue
+
+        width = 1
+        while (tx + width, ty) in remaining:
+            width += 1
+
+        height = 1
+        while all((tx + i, ty + height) in remaining for i in range(width)):
+            height += 1
+
+        for i in range(width):
+            for j in range(height):
+                remaining.discard((tx + i, ty + j))
+
+        merged.append((tx, ty, width, height))
+
+    return merged
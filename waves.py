@@ -0,0 +1,184 @@
+import math
+import random
+from collections import deque
+import pygame
+import settings
+
+class WaveDirector():
+    """
+    Schedules enemy spawns over time and places them off-screen around the player.
+
+    A budget curve gives the spawn rate in enemies per second at each point in the
+    run; the budget it accumulates, plus any wave queued with queue_wave, goes into
+    a spawn queue that is drained at most spawns_per_tick enemies per tick, so even
+    a wave of thousands is spread over many frames. Each enemy is placed just outside
+    the view in a random direction, retrying positions that overlap a wall or fall
+    outside the world bounds.
+
+    Attributes:
+    - world: The World enemies are spawned into.
+    - curve: A list of (seconds, enemies per second) points, interpolated linearly.
+    - enemy_weights: A dict mapping an enemy type to its relative spawn weight.
+    - spawns_per_tick: The most enemies spawned in one tick.
+    - max_alive: Spawning pauses while this many enemies are alive.
+    - margin: The distance in pixels outside the view enemies are placed at.
+    - spread: The extra random distance added to the margin.
+    - attempts: The number of positions tried per enemy before deferring it.
+    - elapsed: The seconds since the director started.
+    - budget: The fractional spawns accumulated from the curve.
+    - queue: A deque of enemy types waiting to spawn.
+    - spawned_total: The number of enemies spawned so far.
+    - spawn_times: A deque of the times of recent spawns, used for the spawn rate.
+
+    Methods:
+    - get_rate(seconds: float) -> float: Returns the curve's spawn rate at a time.
+    - choose_type() -> str: Picks an enemy type by weight.
+    - queue_wave(count: int, etype: str) -> None: Queues a wave of enemies.
+    - find_position(view_rect: pygame.Rect) -> tuple: Finds a free spawn position outside the view.
+    - get_spawn_rate() -> float: Returns the number of enemies spawned during the last second.
+    - get_alive_count() -> int: Returns the number of live enemies.
+    - update(delta_time: float) -> None: Adds budget and spawns queued enemies.
+    """
+
+    def __init__(self, world, curve: list = None, enemy_weights: dict = None) -> None:
+        """
+        Initializes the WaveDirector object.
+
+        Parameters:
+        - world: The World enemies are spawned into.
+        - curve: A list of (seconds, enemies per second) points, interpolated linearly, settings.wave_curve by default.
+        - enemy_weights: A dict mapping an enemy type to its relative spawn weight, settings.wave_enemy_weights by default.
+        """
+        self.world = world
+        self.curve = settings.wave_curve if curve is None else curve
+        self.enemy_weights = settings.wave_enemy_weights if enemy_weights is None else enemy_weights
+
+        self.spawns_per_tick = settings.wave_spawns_per_tick
+        self.max_alive = settings.wave_max_alive
+        self.margin = settings.wave_spawn_margin
+        self.spread = settings.wave_spawn_spread
+        self.attempts = 8
+
+        self.elapsed = 0
+        self.budget = 0
+        self.queue = deque()
+
+        self.spawned_total = 0
+        self.spawn_times = deque()
+
+    def get_rate(self, seconds: float) -> float:
+        """
+        Returns the curve's spawn rate at a time, holding the last point's rate after the curve ends.
+
+        Parameters:
+        - seconds: The time since the director started.
+
+        Returns:
+        - The spawn rate in enemies per second.
+        """
+        if not self.curve:
+            return 0
+
+        if seconds <= self.curve[0][0]:
+            return self.curve[0][1]
+
+        for (start, start_rate), (end, end_rate) in zip(self.curve, self.curve[1:]):
+            if seconds < end:
+                return start_rate + (end_rate - start_rate) * (seconds - start) / (end - start)
+
+        return self.curve[-1][1]
+
+    def choose_type(self) -> str:
+        """
+        Picks an enemy type by weight.
+
+        Returns:
+        - The enemy type.
+        """
+        return random.choices(list(self.enemy_weights), weights=list(self.enemy_weights.values()))[0]
+
+    def queue_wave(self, count: int, etype: str = None) -> None:
+        """
+        Queues a wave of enemies to be spawned over the following ticks.
+
+        Parameters:
+        - count: The number of enemies.
+        - etype: The type of every enemy in the wave, or None to pick each by weight.
+        """
+        for i in range(count):
+            self.queue.append(etype if etype is not None else self.choose_type())
+
+    def find_position(self, view_rect: pygame.Rect) -> tuple:
+        """
+        Finds a spawn position outside the view that does not overlap a wall.
+
+        Parameters:
+        - view_rect: The world-space rectangle visible on screen.
+
+        Returns:
+        - The (x, y) position, or None if every attempt was blocked.
+        """
+        cx, cy = view_rect.center
+        radius = math.hypot(view_rect.width, view_rect.height) / 2 + self.margin
+        rect = pygame.Rect(0, 0, self.margin, self.margin)
+
+        for attempt in range(self.attempts):
+            angle = random.uniform(0, math.tau)
+            distance = radius + random.uniform(0, self.spread)
+            rect.center = (cx + math.cos(angle) * distance, cy + math.sin(angle) * distance)
+
+            if self.world.world_bounds.contains(rect) and not self.world.wall_grid.is_rect_blocked(rect):
+                return rect.center
+
+        return None
+
+    def get_spawn_rate(self) -> float:
+        """
+        Returns the number of enemies spawned during the last second.
+
+        Returns:
+        - The spawn rate in enemies per second.
+        """
+        return len(self.spawn_times)
+
+    def get_alive_count(self) -> int:
+        """
+        Returns the number of live enemies.
+
+        Returns:
+        - The alive count.
+        """
+        return len(self.world.enemy_container)
+
+    def update(self, delta_time: float) -> None:
+        """
+        Adds the curve's budget for this tick to the queue and spawns up to
+        spawns_per_tick queued enemies, pausing while max_alive enemies are alive.
+
+        Parameters:
+        - delta_time: The length of the tick in seconds.
+        """
+        self.budget += self.get_rate(self.elapsed) * delta_time
+        self.elapsed += delta_time
+
+        whole = int(self.budget)
+        if whole:
+            self.budget -= whole
+            self.queue_wave(whole)
+
+        while self.spawn_times and self.spawn_times[0] <= self.elapsed - 1:
+            self.spawn_times.popleft()
+
+        player = self.world.player
+        view_rect = pygame.Rect(0, 0, settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+        view_rect.center = (player.pos.x, player.pos.y)
+
+        room = self.max_alive - self.get_alive_count()
+        for spawn in range(min(self.spawns_per_tick, room, len(self.queue))):
+            position = self.find_position(view_rect)
+            if position is None:
+                break
+
+            self.world.spawn_enemy(position[0], position[1], self.queue.popleft())
+            self.spawned_total += 1
+            self.spawn_times.append(self.elapsed)
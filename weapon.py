@@ -1,6 +1,5 @@
 import pygame
 import settings
-import projectile
 
 class MeleeBase():
     """
@@ -48,9 +47,8 @@ class MeleeBase():
         Use the melee weapon to inflict damage on enemies within range.
         """
         self.damage_box = self.create_damage_box(self.direction)
-        for e in settings.world_reference.enemy_container:
-            if e.rect.colliderect(self.damage_box):
-                e.health -= self.damage
+        for e in settings.world_reference.targeting.overlap_rect(self.damage_box):
+            e.health -= self.damage
 
     def create_damage_box(self, direction: str) -> pygame.Rect:
         """
@@ -123,20 +121,13 @@ class RangeBase():
 
     def use(self) -> None:
         """
-        Use the ranged weapon to fire projectiles at enemies within range.
+        Use the ranged weapon to fire projectiles at the nearest enemies within range.
         """
-        shots = 0
-        targets = []
+        targets = settings.world_reference.targeting.nearest(self.parent.pos.x, self.parent.pos.y, self.multishot_count, self.range)
 
-        for e in settings.world_reference.enemy_container:
-            if settings.get_distance(self.parent.pos, e.pos) < self.range:
-                if e not in targets:
-                    if shots < self.multishot_count:
-                        p = projectile.Projectile(self.parent.pos.x, self.parent.pos.y, e.pos.x, e.pos.y, self.size, self.speed, self.damage, self.color)
-                        settings.world_reference.world_camera.add(p)
-                        settings.world_reference.friendly_projectiles.add(p)
-                        targets.append(e)
-                        shots += 1
+        for e in targets:
+            p = settings.world_reference.projectile_pool.acquire(self.parent.pos.x, self.parent.pos.y, e.pos.x, e.pos.y, self.size, self.speed, self.damage, self.color, self.range)
+            settings.world_reference.commands.add(p, settings.world_reference.world_camera.get_layer(p), settings.world_reference.friendly_projectiles)
     
 class MeleeKnife(MeleeBase):
     """
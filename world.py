@@ -1,4 +1,5 @@
 import pygame
+import numpy as np
 import camera
 import player
 import particle
@@ -6,8 +7,21 @@ import settings
 import enemy
 import random
 import weapon
-import images
+import resources
 import wall
+import spatial
+import swarm
+import projectile
+import debug
+import tilemap
+import flowfield
+import targeting
+import waves
+import pool
+import drops
+import commands
+import snapshot
+import separation
 
 class World():
     """
@@ -18,66 +32,141 @@ class World():
     - world_background: The background image of the game world.
     - world_camera: The camera used to track the player's movement.
     - player: The player character.
-    - particle_group: A group of particles in the game world.
+    - particle_engine: The engine that stores, updates and draws every particle in the game world.
     - enemy_container: A group of enemy characters in the game world.
     - friendly_projectiles: A group of projectiles fired by the player.
+    - pools: A dict mapping an entity class to the EntityPool its dead instances return to.
+    - projectile_pool: The pool that dead projectiles return to and new shots are drawn from.
     - ground_items: A group of items on the ground in the game world.
+    - commands: The CommandBuffer that group changes made during the update are queued in.
+    - kills: The number of enemies that have died.
+    - rewind_buffer: The RewindBuffer of the last settings.rewind_frames snapshots, or None when rewinding is off.
+      Rewinding records a snapshot every tick, which is only cheap enough on the swarm backend.
+    - drop_stacks: A dict mapping a (drop class, cell x, cell y) key to the stack of stackable drops started in that cell.
     - collidables: A group of objects that can be collided with.
     - wall_container: A group of walls in the game world.
     - walls: A list of wall coordinates in the game world.
+    - world_bounds: The rectangle projectiles are culled outside of.
+    - tile_map: The Tiled map drawn over the background, or None.
+    - chunk_streamer: The streamer that builds and caches the tile map's chunk surfaces, or None.
+    - spatial_hash: The uniform grid broadphase used by the moving collision passes.
+    - wall_grid: The static occupancy grid every wall is compiled into at load.
+    - targeting: The per-frame enemy index weapons query for targets.
+    - wave_director: The director that spawns enemies over time, following settings.wave_curve when settings.wave_director is set.
+    - enemy_types: A dict mapping an enemy type string to its enemy class.
+    - flow_field: The shared field ground enemies follow around walls toward the player.
+    - enemy_swarm: The NumPy enemy store when settings.enemy_swarm is enabled, otherwise None.
 
     Methods:
-    - __init__(background_path: str): Initializes the World object.
+    - __init__(background_path: str, enemy_count: int, enemy_type: str, map_path: str): Initializes the World object.
     - create_enemies(count: int, etype: str): Creates a specified number of enemies.
+    - spawn_enemy(x: float, y: float, etype: str): Spawns one enemy of a registered type.
+    - get_pool(entity_class: type): Returns the pool for an entity class.
     - friendly_projectile_collision(): Handles collision between friendly projectiles and enemies.
-    - enemy_collision(): Handles collision between enemies.
+    - enemy_collision(): Blends crowd separation into the velocities of sprite enemies.
+    - spawn_drop(drop_class: type, x: float, y: float): Drops an item, merging it into a nearby stack if it can.
+    - place_drop(d): Puts a drop on the ground without merging it.
+    - remove_drop(d): Takes an item off the ground.
+    - player_drop_collision(): Picks up ground items within the player's pickup radius.
+    - record_snapshot(): Stores a snapshot of the world in the rewind buffer.
+    - rewind(ticks: int): Restores the world to how it was a number of ticks ago.
     - player_wall_collisions(): Handles collision between the player and walls.
     - enemy_wall_collisions(): Handles collision between enemies and walls.
+    - resolve_wall_collision(entity): Pushes an entity out of the walls it overlaps.
     - create_walls(wall_array: list): Creates walls in the game world.
+    - rebuild_spatial_hash(): Rebuckets the moving layers of the spatial hash.
+    - follow_player(): Steers every following enemy toward the player.
+    - step_enemies(): Integrates every sprite enemy once.
+    - step_projectiles(): Moves every friendly projectile once.
     - draw(): Draws the game world.
     - update(): Updates the game world.
     """
 
-    def __init__(self, background_path: str) -> None:
+    enemy_types = {
+        "follower": enemy.FollowEnemy,
+        "flyer follower": enemy.FlyerEnemy
+    }
+
+    def __init__(self, background_path: str, enemy_count: int = 10, enemy_type: str = "flyer follower", map_path: str = None) -> None:
         """
         Initializes the World object.
 
         Parameters:
         - background_path (str): The file path of the background image.
+        - enemy_count (int): The number of enemies to create at startup.
+        - enemy_type (str): The type of enemies to create at startup.
+        - map_path (str): The manifest name or file path of a Tiled map to stream over the background, if any.
 
         Returns:
         - None
         """
         settings.world_reference = self
-        images.load_images()
 
         self.display_surface = pygame.display.get_surface()
-        self.world_background = pygame.image.load(background_path).convert_alpha()
+        self.world_background = resources.get_manager().load_surface(background_path)
+        self.world_bounds = self.world_background.get_rect().union(pygame.Rect(0, 0, settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+        self.world_bounds.inflate_ip(settings.world_bounds_margin * 2, settings.world_bounds_margin * 2)
         
         self.world_camera = camera.PlayerCenterCamera(self.world_background)
+
+        self.tile_map = None
+        self.chunk_streamer = None
+        if map_path is not None:
+            self.tile_map = tilemap.TiledMap(resources.get_manager().get_map_path(map_path))
+            self.chunk_streamer = tilemap.ChunkStreamer(self.tile_map)
+            self.world_camera.chunk_streamer = self.chunk_streamer
+            self.world_bounds.union_ip(self.tile_map.bounds.inflate(settings.world_bounds_margin * 2, settings.world_bounds_margin * 2))
         self.player = player.Player()
-        self.particle_group = pygame.sprite.Group()
+        self.particle_engine = particle.ParticleEngine()
         self.enemy_container = pygame.sprite.Group()
         self.friendly_projectiles = pygame.sprite.Group()
+        self.pools = {}
+        # The swarm backend never spawns sprite enemies, so their pools would stay unused.
+        pooled = [drops.HealthDrop, drops.CoinDrop, projectile.Projectile]
+        if not settings.enemy_swarm:
+            pooled = list(self.enemy_types.values()) + pooled
+        for entity_class in pooled:
+            self.get_pool(entity_class)
+        self.projectile_pool = self.get_pool(projectile.Projectile)
         self.ground_items = pygame.sprite.Group()
+        self.drop_stacks = {}
+        self.kills = 0
+        if settings.rewind_frames and not settings.enemy_swarm:
+            raise ValueError("settings.rewind_frames needs settings.enemy_swarm, sprite enemies are too slow to snapshot every tick")
+        self.rewind_buffer = snapshot.RewindBuffer(settings.rewind_frames) if settings.rewind_frames else None
+        self.commands = commands.CommandBuffer()
         self.collidables = pygame.sprite.Group()
         self.wall_container = pygame.sprite.Group()
+        self.spatial_hash = spatial.SpatialHash()
+        self.targeting = targeting.TargetingService()
+        self.enemy_swarm = swarm.EnemySwarm() if settings.enemy_swarm else None
+
+        if self.tile_map is not None:
+            self.wall_grid = wall.WallGrid(self.tile_map.tile_width)
+            wall_tiles = [(tx, ty) for tx, ty, gid in self.tile_map.iter_layer_tiles(settings.map_wall_layer)]
+            self.wall_grid.add_tiles(wall_tiles, self.tile_map.tile_width)
+        else:
+            self.wall_grid = wall.WallGrid(settings.wall_cell_size)
+        self.flow_field = flowfield.FlowField(self.wall_grid)
+        self.wave_director = waves.WaveDirector(self, settings.wave_curve if settings.wave_director else [])
 
         self.walls = [
             [0, 0, 1, 20]
         ]
 
-        self.world_camera.add(self.player)
+        self.world_camera.get_layer(self.player).add(self.player)
+        self.world_camera.particle_engine = self.particle_engine
         self.player.particle_system = particle.PlayerParticleSystem()
 
         self.player.weapons.append(weapon.RangeMultishot())
 
-        self.create_enemies(10, "flyer follower")
+        self.create_enemies(enemy_count, enemy_type)
         self.create_walls(self.walls)
+        self.flow_field.update(self.player.pos.x, self.player.pos.y)
 
     def create_enemies(self, count: int, etype: str) -> None:
         """
-        Creates a specified number of enemies.
+        Creates a specified number of enemies at random positions on the starting screen.
 
         Parameters:
         - count (int): The number of enemies to create.
@@ -86,18 +175,54 @@ class World():
         Returns:
         - None
         """
-        if etype == "follower":
-            for c in range(count):
-                c = enemy.FollowEnemy(random.randint(0, settings.SCREEN_WIDTH), random.randint(0, settings.SCREEN_HEIGHT))
-                c.particle_system = particle.EnemyParticleSystem(c.pos.x, c.pos.y)
-                self.world_camera.add(c)
-                self.enemy_container.add(c)
-        elif etype == "flyer follower":
-            for c in range(count):
-                c = enemy.FlyerEnemy(random.randint(0, settings.SCREEN_WIDTH), random.randint(0, settings.SCREEN_HEIGHT))
-                c.particle_system = particle.EnemyParticleSystem(c.pos.x, c.pos.y)
-                self.world_camera.add(c)
-                self.enemy_container.add(c)
+        for c in range(count):
+            x = random.randint(0, settings.SCREEN_WIDTH)
+            y = random.randint(0, settings.SCREEN_HEIGHT)
+            self.spawn_enemy(x, y, etype)
+
+    def spawn_enemy(self, x: float, y: float, etype: str):
+        """
+        Spawns one enemy of a registered type with its particle emitter.
+
+        Parameters:
+        - x (float): The x-coordinate of the enemy's position.
+        - y (float): The y-coordinate of the enemy's position.
+        - etype (str): A key of enemy_types.
+
+        Returns:
+        - The new enemy.
+        """
+        if self.enemy_swarm is not None:
+            c = self.enemy_swarm.spawn(x, y, etype)
+        else:
+            c = self.get_pool(self.enemy_types[etype]).acquire(x, y)
+
+        c.particle_system = particle.EnemyParticleSystem(c.pos.x, c.pos.y)
+        self.world_camera.get_layer(c).add(c)
+        self.enemy_container.add(c)
+
+        return c
+
+    def get_pool(self, entity_class: type) -> pool.EntityPool:
+        """
+        Returns the pool for an entity class, creating it and preallocating
+        settings.pool_capacities entries on first use.
+
+        Parameters:
+        - entity_class (type): The Poolable class.
+
+        Returns:
+        - The class's EntityPool.
+        """
+        entity_pool = self.pools.get(entity_class)
+
+        if entity_pool is None:
+            entity_pool = self.pools[entity_class] = pool.EntityPool(entity_class)
+            capacity = settings.pool_capacities.get(entity_class.__name__, 0)
+            if capacity and entity_class.pool_args is not None:
+                entity_pool.preallocate(capacity, *entity_class.pool_args)
+
+        return entity_pool
 
     def friendly_projectile_collision(self) -> None:
         """
@@ -106,27 +231,181 @@ class World():
         Returns:
         - None
         """
-        for e in self.enemy_container:
-            for p in self.friendly_projectiles:
-                if e.rect.colliderect(p.rect):
-                    e.health -= p.damage
-                    p.kill()
+        for p in self.friendly_projectiles:
+            if self.commands.is_killed(p):
+                continue
+            for e in self.spatial_hash.collide("enemies", p.rect):
+                e.health -= p.damage
+                self.commands.kill(p)
+                break
 
     def enemy_collision(self) -> None:
         """
-        Handles collision between enemies.
+        Keeps sprite enemies from piling up by blending a separation steering vector,
+        scaled by each enemy's speed and settings.separation_strength, into its
+        velocity before the enemy pass steps it. The swarm does the same inside
+        EnemySwarm.update.
 
         Returns:
         - None
         """
-        padding = 10
+        enemies = self.enemy_container.sprites()
+        if not enemies or not settings.separation_strength:
+            return
 
-        for e in self.enemy_container:
-            for e2 in self.enemy_container:
-                if e != e2:
-                    if e.rect.colliderect(e2.rect):
-                        e.pos.x += random.randint(-padding, padding)
-                        e.pos.y += random.randint(-padding, padding)
+        pos = np.array([(e.pos.x, e.pos.y) for e in enemies])
+        forces = separation.get_separation(pos, settings.separation_radius, settings.separation_neighbours)
+
+        for e, (fx, fy) in zip(enemies, forces.tolist()):
+            if fx or fy:
+                scale = e.speed * settings.separation_strength
+                e.vel.x += fx * scale
+                e.vel.y += fy * scale
+
+    def spawn_drop(self, drop_class: type, x: float, y: float):
+        """
+        Drops an item on the ground. A stackable drop is added to the stack in its
+        settings.drop_stack_size cell, or failing that to the nearest stack within
+        settings.drop_stack_size in a neighbouring cell, instead of creating a new sprite.
+
+        Parameters:
+        - drop_class (type): The drop class to spawn.
+        - x (float): The x-coordinate of the drop.
+        - y (float): The y-coordinate of the drop.
+
+        Returns:
+        - The new drop or the stack it was merged into.
+        """
+        d = self.get_pool(drop_class).acquire(x, y)
+
+        if drop_class.stackable:
+            size = settings.drop_stack_size
+            cx = int(x // size)
+            cy = int(y // size)
+            key = (drop_class, cx, cy)
+
+            stack = self.drop_stacks.get(key)
+            if stack is None:
+                nearest = size * size
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        other = self.drop_stacks.get((drop_class, cx + dx, cy + dy))
+                        if other is not None:
+                            distance = (other.pos.x - x) ** 2 + (other.pos.y - y) ** 2
+                            if distance <= nearest:
+                                stack = other
+                                nearest = distance
+
+            if stack is not None:
+                stack.value += d.value
+                d.pool.release(d)
+                return stack
+
+        self.place_drop(d)
+
+        return d
+
+    def place_drop(self, d) -> None:
+        """
+        Puts a drop on the ground as it is, without merging it into a stack. A
+        stackable drop becomes the stack of its cell if the cell has none yet.
+
+        Parameters:
+        - d: The drop, acquired from its pool.
+
+        Returns:
+        - None
+        """
+        if d.stackable:
+            d.stack_key = (type(d), int(d.pos.x // settings.drop_stack_size), int(d.pos.y // settings.drop_stack_size))
+            self.drop_stacks.setdefault(d.stack_key, d)
+
+        self.commands.add(d, self.ground_items, self.world_camera.get_layer(d))
+        self.spatial_hash.insert("drops", d)
+
+    def remove_drop(self, d) -> None:
+        """
+        Takes an item off the ground.
+
+        Parameters:
+        - d: The drop to remove.
+
+        Returns:
+        - None
+        """
+        self.commands.remove(d, self.ground_items, self.world_camera.get_layer(d))
+        self.spatial_hash.remove("drops", d)
+
+        if d.stackable and self.drop_stacks.get(d.stack_key) is d:
+            del self.drop_stacks[d.stack_key]
+
+    def player_drop_collision(self) -> None:
+        """
+        Picks up every ground item within settings.pickup_radius of the player,
+        using one spatial query around the player.
+
+        Returns:
+        - None
+        """
+        radius = settings.pickup_radius
+        px, py = self.player.rect.center
+        player_rect = self.player.rect
+
+        for d in self.spatial_hash.query("drops", player_rect.inflate(radius * 2, radius * 2)):
+            dx = d.rect.centerx - px
+            dy = d.rect.centery - py
+            if dx * dx + dy * dy <= radius * radius or d.rect.colliderect(player_rect):
+                d.pickup()
+
+    def record_snapshot(self) -> None:
+        """
+        Stores a snapshot of the world in the rewind buffer.
+
+        Returns:
+        - None
+        """
+        self.rewind_buffer.push(snapshot.capture(self))
+
+    def rewind(self, ticks: int) -> None:
+        """
+        Restores the world to how it was a number of ticks ago, or to the oldest
+        snapshot in the rewind buffer if it does not go back that far.
+
+        Parameters:
+        - ticks (int): The number of ticks to go back.
+
+        Returns:
+        - None
+        """
+        if self.rewind_buffer is None:
+            return
+
+        data = self.rewind_buffer.rewind(ticks)
+        if data is not None:
+            snapshot.restore(self, data)
+
+    def resolve_wall_collision(self, entity) -> None:
+        """
+        Pushes an entity out of every wall it overlaps and stops its velocity on the blocked axes.
+
+        Parameters:
+        - entity: The player or enemy to resolve.
+
+        Returns:
+        - None
+        """
+        dx, dy, blocked_x, blocked_y = self.wall_grid.resolve(entity.rect)
+
+        if blocked_x or blocked_y:
+            vel = entity.vel
+            if blocked_x:
+                vel.x = 0
+            if blocked_y:
+                vel.y = 0
+            entity.vel = vel
+
+            entity.pos = entity.pos + pygame.math.Vector2(dx, dy)
+            entity.rect.move_ip(dx, dy)
 
     def player_wall_collisions(self) -> None:
         """
@@ -135,48 +414,28 @@ class World():
         Returns:
         - None
         """
-        collision_tollerance = 15
-
-        for c in self.collidables:
-            if self.player.rect.colliderect(c.rect):
-                if abs(self.player.rect.left - c.rect.right) < collision_tollerance:
-                    self.player.vel.x = 0
-                    self.player.pos.x = c.rect.right + self.player.rect.width / 2
-                if abs(self.player.rect.right - c.rect.left) < collision_tollerance:
-                    self.player.vel.x = 0
-                    self.player.pos.x = c.rect.left - self.player.rect.width / 2
-                if abs(self.player.rect.top - c.rect.bottom) < collision_tollerance:
-                    self.player.vel.y = 0
-                    self.player.pos.y = c.rect.bottom + self.player.rect.height / 2
-                if abs(self.player.rect.bottom - c.rect.top) < collision_tollerance:
-                    self.player.vel.y = 0
-                    self.player.pos.y = c.rect.top - self.player.rect.height / 2
+        self.resolve_wall_collision(self.player)
 
     def enemy_wall_collisions(self) -> None:
         """
-        Handles collision between enemies and walls.
+        Handles collision between enemies and walls. Swarm enemies are tested
+        against the wall grid as arrays first, so only those touching a blocked
+        cell are resolved one by one.
 
         Returns:
         - None
         """
-        collision_tollerance = 15
+        if self.enemy_swarm is not None:
+            enemies = self.enemy_swarm
+            ground = enemies.etype[:enemies.count] == swarm.SwarmFollowEnemy.swarm_type
+            touching = self.wall_grid.get_touching(enemies.get_rects())
+            for index in np.flatnonzero(ground & touching).tolist():
+                self.resolve_wall_collision(enemies.views[index])
+            return
 
         for e in self.enemy_container:
             if "flyer" not in e.tag:
-                for c in self.collidables:
-                    if e.rect.colliderect(c.rect):
-                        if abs(e.rect.left - c.rect.right) < collision_tollerance:
-                            e.vel.x = 0
-                            e.pos.x = c.rect.right + e.rect.width / 2
-                        if abs(e.rect.right - c.rect.left) < collision_tollerance:
-                            e.vel.x = 0
-                            e.pos.x = c.rect.left - e.rect.width / 2
-                        if abs(e.rect.top - c.rect.bottom) < collision_tollerance:
-                            e.vel.y = 0
-                            e.pos.y = c.rect.bottom + e.rect.height / 2
-                        if abs(e.rect.bottom - c.rect.top) < collision_tollerance:
-                            e.vel.y = 0
-                            e.pos.y = c.rect.top - e.rect.height / 2
+                self.resolve_wall_collision(e)
 
     def create_walls(self, wall_array: list) -> None:
         """
@@ -190,9 +449,10 @@ class World():
         """
         for point_array in range(len(wall_array)):
             w = wall.Wall(wall_array[point_array][0], wall_array[point_array][1], wall_array[point_array][2], wall_array[point_array][3])
-            self.world_camera.add(w)
+            self.world_camera.get_layer(w).add(w)
             self.collidables.add(w)
             self.wall_container.add(w)
+            self.wall_grid.add_rect(w.rect)
 
     def draw(self) -> None:
         """
@@ -203,24 +463,86 @@ class World():
         """
         self.world_camera.camera_draw(self.player)
 
-    def update(self) -> None:
+    def rebuild_spatial_hash(self) -> None:
         """
-        Updates the game world.
+        Starts a new frame in the spatial hash and rebuckets the moving layers.
+        Drops never move, so their layer is kept up to date by spawn_drop and remove_drop.
+        Swarm enemies are bucketed straight from the swarm arrays.
 
         Returns:
         - None
         """
-        self.world_camera.update()
-        self.particle_group.update()
-        self.enemy_container.update()
-        self.friendly_projectiles.update()
-        self.ground_items.update()
+        self.spatial_hash.begin_frame()
+        if self.enemy_swarm is not None:
+            self.spatial_hash.rebuild_rects("enemies", self.enemy_swarm.views, self.enemy_swarm.get_rects())
+        else:
+            self.spatial_hash.rebuild("enemies", self.enemy_container)
 
-        self.friendly_projectile_collision()
-        self.enemy_collision()
-        self.player_wall_collisions()
-        self.enemy_wall_collisions()
+    def follow_player(self) -> None:
+        """
+        Steers every following enemy toward the player.
 
+        Returns:
+        - None
+        """
         for e in self.enemy_container:
             if "follower" in e.tag:
-                e.follow_player()
\ No newline at end of file
+                e.follow_player()
+
+    def step_enemies(self) -> None:
+        """
+        Integrates every sprite enemy once, so they move once per tick like the swarm.
+
+        Returns:
+        - None
+        """
+        for e in self.enemy_container:
+            e.step()
+
+    def step_projectiles(self) -> None:
+        """
+        Moves every friendly projectile once.
+
+        Returns:
+        - None
+        """
+        for p in self.friendly_projectiles:
+            p.step()
+
+    def update(self) -> None:
+        """
+        Updates the game world. Each phase is timed by the debug profiler while it is enabled.
+
+        Spawns, kills and group changes made by entities are queued in the command
+        buffer and applied at two points: after the update phase, so the collision
+        passes see this frame's spawns and deaths, and after the collision phase.
+
+        Returns:
+        - None
+        """
+        profile = debug.profiler.run
+
+        self.targeting.begin_frame(self.enemy_container)
+        profile("wave director", self.wave_director.update, settings.delta_time)
+        profile("player update", self.player.update)
+        profile("flow field", self.flow_field.update, self.player.pos.x, self.player.pos.y)
+        if self.enemy_swarm is not None:
+            profile("enemy update", self.enemy_swarm.update, self.player, self.flow_field)
+        else:
+            profile("follow player", self.follow_player)
+            profile("enemy collision", self.enemy_collision)
+            profile("enemy update", self.step_enemies)
+        profile("projectile update", self.step_projectiles)
+        profile("particle update", self.particle_engine.update)
+        profile("update flush", self.commands.flush)
+
+        profile("spatial rebuild", self.rebuild_spatial_hash)
+
+        profile("projectile collision", self.friendly_projectile_collision)
+        profile("drop collision", self.player_drop_collision)
+        profile("player wall collision", self.player_wall_collisions)
+        profile("enemy wall collision", self.enemy_wall_collisions)
+        profile("collision flush", self.commands.flush)
+
+        if self.rewind_buffer is not None:
+            profile("snapshot", self.record_snapshot)
\ No newline at end of file